@@ -0,0 +1,67 @@
+"""add fechamentos mensais
+
+Revision ID: 0a8e5b3c7d62
+Revises: f6c2d8a4b915
+Create Date: 2026-10-19 14:52:09.417380
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a8e5b3c7d62'
+down_revision: Union[str, None] = 'f6c2d8a4b915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Criar tabela de fechamentos mensais
+    op.create_table(
+        'fechamentos_mensais',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('comunidade_id', sa.Integer(), nullable=False),
+        sa.Column('mes', sa.Integer(), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=True),
+        sa.Column('fechado_em', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['comunidade_id'], ['comunidades.id'], ondelete='RESTRICT'),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('comunidade_id', 'mes', name='uq_fechamentos_mensais_comunidade_mes')
+    )
+    op.create_index(op.f('ix_fechamentos_mensais_id'), 'fechamentos_mensais', ['id'], unique=False)
+    op.create_index(op.f('ix_fechamentos_mensais_comunidade_id'), 'fechamentos_mensais', ['comunidade_id'], unique=False)
+    op.create_index(op.f('ix_fechamentos_mensais_mes'), 'fechamentos_mensais', ['mes'], unique=False)
+
+    # Criar tabela de totais congelados (reaproveita o enum de tipos existente)
+    op.create_table(
+        'fechamento_totais',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fechamento_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'tipo',
+            postgresql.ENUM('DIZIMO', 'OFERTA', name='tipocontribuicaoenum', create_type=False),
+            nullable=False
+        ),
+        sa.Column('forma_pagamento', sa.String(length=100), nullable=True),
+        sa.Column('total', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['fechamento_id'], ['fechamentos_mensais.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_fechamento_totais_id'), 'fechamento_totais', ['id'], unique=False)
+    op.create_index(op.f('ix_fechamento_totais_fechamento_id'), 'fechamento_totais', ['fechamento_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_fechamento_totais_fechamento_id'), table_name='fechamento_totais')
+    op.drop_index(op.f('ix_fechamento_totais_id'), table_name='fechamento_totais')
+    op.drop_table('fechamento_totais')
+    op.drop_index(op.f('ix_fechamentos_mensais_mes'), table_name='fechamentos_mensais')
+    op.drop_index(op.f('ix_fechamentos_mensais_comunidade_id'), table_name='fechamentos_mensais')
+    op.drop_index(op.f('ix_fechamentos_mensais_id'), table_name='fechamentos_mensais')
+    op.drop_table('fechamentos_mensais')
@@ -0,0 +1,51 @@
+"""add aniversario_mmdd
+
+Revision ID: 4f2c8a91d3b7
+Revises: 73a19a31178f
+Create Date: 2026-10-19 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2c8a91d3b7'
+down_revision: Union[str, None] = '73a19a31178f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Chave mês/dia do aniversário (MMDD), mantida pela aplicação a cada escrita
+    op.add_column('dizimistas', sa.Column('aniversario_mmdd', sa.SmallInteger(), nullable=True))
+
+    # Preencher registros existentes
+    op.execute(
+        """
+        UPDATE dizimistas
+        SET aniversario_mmdd = EXTRACT(MONTH FROM data_nascimento) * 100 + EXTRACT(DAY FROM data_nascimento)
+        WHERE data_nascimento IS NOT NULL
+        """
+    )
+
+    op.create_index(
+        'ix_dizimistas_ativo_aniversario_mmdd',
+        'dizimistas',
+        ['ativo', 'aniversario_mmdd'],
+        unique=False
+    )
+    op.create_index(
+        'ix_dizimistas_comunidade_ativo_aniversario_mmdd',
+        'dizimistas',
+        ['comunidade_id', 'ativo', 'aniversario_mmdd'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dizimistas_comunidade_ativo_aniversario_mmdd', table_name='dizimistas')
+    op.drop_index('ix_dizimistas_ativo_aniversario_mmdd', table_name='dizimistas')
+    op.drop_column('dizimistas', 'aniversario_mmdd')
@@ -0,0 +1,47 @@
+"""add chaves idempotencia
+
+Revision ID: 5d8a3f1e6c20
+Revises: b2e6d9c4a017
+Create Date: 2026-10-19 17:31:12.884120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8a3f1e6c20'
+down_revision: Union[str, None] = 'b2e6d9c4a017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Criar tabela de respostas guardadas por Idempotency-Key
+    op.create_table(
+        'chaves_idempotencia',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('chave', sa.String(length=255), nullable=False),
+        sa.Column('metodo', sa.String(length=10), nullable=False),
+        sa.Column('rota', sa.String(length=255), nullable=False),
+        sa.Column('hash_requisicao', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('cabecalhos', sa.JSON(), nullable=True),
+        sa.Column('corpo', sa.LargeBinary(), nullable=True),
+        sa.Column('criado_em', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('expira_em', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('usuario_id', 'chave', name='uq_chaves_idempotencia_usuario_chave')
+    )
+    op.create_index(op.f('ix_chaves_idempotencia_id'), 'chaves_idempotencia', ['id'], unique=False)
+    op.create_index(op.f('ix_chaves_idempotencia_expira_em'), 'chaves_idempotencia', ['expira_em'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_chaves_idempotencia_expira_em'), table_name='chaves_idempotencia')
+    op.drop_index(op.f('ix_chaves_idempotencia_id'), table_name='chaves_idempotencia')
+    op.drop_table('chaves_idempotencia')
@@ -0,0 +1,32 @@
+"""add contribuicoes historico index
+
+Revision ID: 9b7e1c5d2a04
+Revises: 4f2c8a91d3b7
+Create Date: 2026-10-19 10:02:17.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b7e1c5d2a04'
+down_revision: Union[str, None] = '4f2c8a91d3b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Histórico de contribuições de um dizimista paginado por (data, id)
+    op.create_index(
+        'ix_contribuicoes_dizimista_data_id',
+        'contribuicoes',
+        ['dizimista_id', 'data_contribuicao', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contribuicoes_dizimista_data_id', table_name='contribuicoes')
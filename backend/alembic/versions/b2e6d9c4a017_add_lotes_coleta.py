@@ -0,0 +1,62 @@
+"""add lotes coleta
+
+Revision ID: b2e6d9c4a017
+Revises: 0a8e5b3c7d62
+Create Date: 2026-10-19 16:08:41.203517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e6d9c4a017'
+down_revision: Union[str, None] = '0a8e5b3c7d62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Criar tabela de lotes de coleta
+    op.create_table(
+        'lotes_coleta',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('comunidade_id', sa.Integer(), nullable=False),
+        sa.Column('data_coleta', sa.Date(), nullable=False),
+        sa.Column('descricao', sa.String(length=255), nullable=True),
+        sa.Column('usuario_id', sa.Integer(), nullable=True),
+        sa.Column('total', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+        sa.Column('quantidade', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('criado_em', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('encerrado_em', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['comunidade_id'], ['comunidades.id'], ondelete='RESTRICT'),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_lotes_coleta_id'), 'lotes_coleta', ['id'], unique=False)
+    op.create_index(op.f('ix_lotes_coleta_comunidade_id'), 'lotes_coleta', ['comunidade_id'], unique=False)
+    op.create_index(op.f('ix_lotes_coleta_data_coleta'), 'lotes_coleta', ['data_coleta'], unique=False)
+
+    # Vincular contribuições ao lote, com o id gerado no cliente único por lote
+    op.add_column('contribuicoes', sa.Column('lote_id', sa.Integer(), nullable=True))
+    op.add_column('contribuicoes', sa.Column('client_id', sa.String(length=64), nullable=True))
+    op.create_foreign_key(
+        'fk_contribuicoes_lote_id', 'contribuicoes', 'lotes_coleta',
+        ['lote_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(op.f('ix_contribuicoes_lote_id'), 'contribuicoes', ['lote_id'], unique=False)
+    op.create_unique_constraint('uq_contribuicoes_lote_client', 'contribuicoes', ['lote_id', 'client_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_contribuicoes_lote_client', 'contribuicoes', type_='unique')
+    op.drop_index(op.f('ix_contribuicoes_lote_id'), table_name='contribuicoes')
+    op.drop_constraint('fk_contribuicoes_lote_id', 'contribuicoes', type_='foreignkey')
+    op.drop_column('contribuicoes', 'client_id')
+    op.drop_column('contribuicoes', 'lote_id')
+    op.drop_index(op.f('ix_lotes_coleta_data_coleta'), table_name='lotes_coleta')
+    op.drop_index(op.f('ix_lotes_coleta_comunidade_id'), table_name='lotes_coleta')
+    op.drop_index(op.f('ix_lotes_coleta_id'), table_name='lotes_coleta')
+    op.drop_table('lotes_coleta')
@@ -0,0 +1,34 @@
+"""add contribuicoes ranking index
+
+Revision ID: c81d4e6f0b29
+Revises: 9b7e1c5d2a04
+Create Date: 2026-10-19 10:41:53.207164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d4e6f0b29'
+down_revision: Union[str, None] = '9b7e1c5d2a04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ranking de dizimistas por comunidade e período; valor incluído para
+    # permitir index-only scans no PostgreSQL
+    op.create_index(
+        'ix_contribuicoes_comunidade_data_dizimista',
+        'contribuicoes',
+        ['comunidade_id', 'data_contribuicao', 'dizimista_id'],
+        unique=False,
+        postgresql_include=['valor']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contribuicoes_comunidade_data_dizimista', table_name='contribuicoes')
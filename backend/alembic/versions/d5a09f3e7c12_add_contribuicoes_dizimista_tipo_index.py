@@ -0,0 +1,32 @@
+"""add contribuicoes dizimista tipo index
+
+Revision ID: d5a09f3e7c12
+Revises: c81d4e6f0b29
+Create Date: 2026-10-19 11:15:06.884321
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a09f3e7c12'
+down_revision: Union[str, None] = 'c81d4e6f0b29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Último dízimo de cada dizimista (busca de dizimistas sem dízimo recente)
+    op.create_index(
+        'ix_contribuicoes_dizimista_tipo_data',
+        'contribuicoes',
+        ['dizimista_id', 'tipo', 'data_contribuicao'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contribuicoes_dizimista_tipo_data', table_name='contribuicoes')
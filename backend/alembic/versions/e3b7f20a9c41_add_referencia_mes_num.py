@@ -0,0 +1,43 @@
+"""add referencia_mes_num
+
+Revision ID: e3b7f20a9c41
+Revises: d5a09f3e7c12
+Create Date: 2026-10-19 12:02:37.510942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b7f20a9c41'
+down_revision: Union[str, None] = 'd5a09f3e7c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Mês de referência como inteiro YYYYMM, mantido pela aplicação a cada escrita
+    op.add_column('contribuicoes', sa.Column('referencia_mes_num', sa.Integer(), nullable=True))
+
+    # Preencher registros existentes
+    op.execute(
+        """
+        UPDATE contribuicoes
+        SET referencia_mes_num = CAST(SUBSTRING(referencia_mes, 1, 4) AS INTEGER) * 100
+                               + CAST(SUBSTRING(referencia_mes, 6, 2) AS INTEGER)
+        WHERE referencia_mes IS NOT NULL
+        """
+    )
+
+    # O índice inteiro substitui o índice sobre o texto
+    op.create_index(op.f('ix_contribuicoes_referencia_mes_num'), 'contribuicoes', ['referencia_mes_num'], unique=False)
+    op.drop_index(op.f('ix_contribuicoes_referencia_mes'), table_name='contribuicoes')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_contribuicoes_referencia_mes'), 'contribuicoes', ['referencia_mes'], unique=False)
+    op.drop_index(op.f('ix_contribuicoes_referencia_mes_num'), table_name='contribuicoes')
+    op.drop_column('contribuicoes', 'referencia_mes_num')
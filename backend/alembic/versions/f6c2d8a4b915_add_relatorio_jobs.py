@@ -0,0 +1,51 @@
+"""add relatorio_jobs
+
+Revision ID: f6c2d8a4b915
+Revises: e3b7f20a9c41
+Create Date: 2026-10-19 13:40:18.227603
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c2d8a4b915'
+down_revision: Union[str, None] = 'e3b7f20a9c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Criar tabela de jobs de relatórios
+    op.create_table(
+        'relatorio_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('tipo', sa.String(length=50), nullable=False),
+        sa.Column('parametros', sa.JSON(), nullable=False),
+        sa.Column('status', sa.Enum('PENDENTE', 'EXECUTANDO', 'CONCLUIDO', 'ERRO', name='statusjobenum'), nullable=False),
+        sa.Column('etapa', sa.Enum('FILA', 'CONSULTA', 'GRAVACAO', 'FINALIZADO', name='etapajobenum'), nullable=False),
+        sa.Column('resultado', sa.JSON(), nullable=True),
+        sa.Column('erro', sa.Text(), nullable=True),
+        sa.Column('executor', sa.String(length=100), nullable=True),
+        sa.Column('criado_em', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('iniciado_em', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('concluido_em', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expira_em', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('atualizado_em', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_relatorio_jobs_usuario_id'), 'relatorio_jobs', ['usuario_id'], unique=False)
+    op.create_index(op.f('ix_relatorio_jobs_expira_em'), 'relatorio_jobs', ['expira_em'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_relatorio_jobs_expira_em'), table_name='relatorio_jobs')
+    op.drop_index(op.f('ix_relatorio_jobs_usuario_id'), table_name='relatorio_jobs')
+    op.drop_table('relatorio_jobs')
+    sa.Enum(name='statusjobenum').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='etapajobenum').drop(op.get_bind(), checkfirst=True)
@@ -25,6 +25,31 @@ class Settings(BaseSettings):
     APP_VERSION: str = "0.1.0"
     DEBUG: bool = True
 
+    # Cache de relatórios
+    REPORT_CACHE_ENABLED: bool = True
+    REPORT_CACHE_MAX_ENTRIES: int = 512
+    REPORT_CACHE_TTL_SECONDS: int = 300
+    REPORT_CACHE_SOFT_TTL_SECONDS: int = 30
+    REPORT_CACHE_REFRESH_WORKERS: int = 2
+
+    # Jobs de relatórios
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOB_TTL_SECONDS: int = 3600
+    REPORT_JOB_HEARTBEAT_SECONDS: int = 15
+
+    # Motor de análise em memória (NumPy)
+    ANALYTICS_ENGINE_ENABLED: bool = False
+    ANALYTICS_ENGINE_TTL_SECONDS: int = 600
+
+    # Extração Parquet para relatórios fora do banco
+    PARQUET_DIR: str = "data/parquet"
+
+    # Exportações XLSX: acima deste tamanho o arquivo vai para disco
+    EXPORT_SPOOL_MAX_BYTES: int = 8 * 1024 * 1024
+
+    # Idempotency-Key: por quanto tempo as respostas ficam guardadas
+    IDEMPOTENCY_TTL_HOURS: int = 24
+
     @field_validator('SECRET_KEY')
     @classmethod
     def validate_secret_key(cls, v: str) -> str:
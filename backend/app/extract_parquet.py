@@ -0,0 +1,33 @@
+"""
+Script de extração Parquet das contribuições.
+Regrava apenas os meses alterados desde a última execução (idempotente);
+pode ser agendado (cron) contra o banco principal ou uma réplica.
+
+Uso:
+    python -m app.extract_parquet
+    python -m app.extract_parquet --diretorio /var/lib/ecclesia/parquet
+"""
+import argparse
+import time
+
+from app.database import SessionLocal
+from app.services import parquet_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--diretorio", help="Diretório da extração (padrão: PARQUET_DIR)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    with SessionLocal() as db:
+        resultado = parquet_store.extrair(db, args.diretorio)
+    print(
+        f"✓ Extração concluída em {time.perf_counter() - inicio:.1f}s: "
+        f"{resultado['meses_regravados']} meses regravados ({resultado['linhas']} linhas), "
+        f"{resultado['meses_removidos']} removidos, {resultado['meses_inalterados']} inalterados"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Idempotency-Key nos endpoints de criação.
+
+A dependency ``idempotencia`` é declarada nos endpoints de criação: com o
+cabeçalho Idempotency-Key, ela reserva a chave (ou responde o reenvio com a
+resposta guardada) antes de o endpoint executar. O middleware
+``guardar_resposta_idempotente`` guarda a resposta das requisições que
+reservaram uma chave. A lógica de banco fica no idempotency_service.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Depends, Header, Request, Response
+from sqlalchemy.orm import Session
+from starlette.datastructures import UploadFile
+
+from app.auth.dependencies import get_current_active_user
+from app.database import get_db
+from app.models.usuario import Usuario
+from app.services import idempotency_service
+from app.services.idempotency_service import RespostaRepetida
+
+# Bloco lido de arquivos enviados ao calcular o hash da requisição
+BLOCO_HASH = 64 * 1024
+
+
+async def _hash_requisicao(request: Request) -> str:
+    """SHA-256 do corpo da requisição (JSON ou formulário já lido)."""
+    digest = hashlib.sha256()
+    try:
+        digest.update(await request.body())
+    except RuntimeError:
+        # Formulários multipart já foram consumidos pelo FastAPI; o hash é
+        # feito sobre os campos e o conteúdo dos arquivos
+        formulario = await request.form()
+        for nome, valor in formulario.multi_items():
+            digest.update(nome.encode())
+            if isinstance(valor, UploadFile):
+                digest.update((valor.filename or "").encode())
+                await valor.seek(0)
+                while bloco := await valor.read(BLOCO_HASH):
+                    digest.update(bloco)
+                await valor.seek(0)
+            else:
+                digest.update(valor.encode())
+    return digest.hexdigest()
+
+
+async def idempotencia(
+    request: Request,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=255,
+        description="Chave única da requisição; reenvios com a mesma chave recebem a resposta original"
+    ),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+) -> None:
+    """
+    Reserva a Idempotency-Key da requisição, se informada.
+
+    Args:
+        request: Requisição
+        idempotency_key: Valor do cabeçalho Idempotency-Key
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado (as chaves são por usuário)
+
+    Raises:
+        RespostaRepetida: Se a chave já tiver uma resposta guardada
+        HTTPException: Se a chave estiver em andamento ou em uso por outra requisição
+    """
+    if idempotency_key is None:
+        return
+    registro_id = idempotency_service.iniciar(
+        db,
+        current_user.id,
+        idempotency_key,
+        request.method,
+        request.url.path,
+        await _hash_requisicao(request)
+    )
+    request.state.idempotencia = (registro_id, db.get_bind())
+
+
+async def guardar_resposta_idempotente(request: Request, call_next) -> Response:
+    """
+    Middleware que guarda a resposta das requisições com chave reservada.
+
+    Respostas 5xx (ou exceções) desfazem a reserva em vez de serem guardadas.
+    """
+    try:
+        response = await call_next(request)
+    except Exception:
+        reserva = getattr(request.state, "idempotencia", None)
+        if reserva is not None:
+            idempotency_service.liberar(reserva[1], reserva[0])
+        raise
+
+    reserva = getattr(request.state, "idempotencia", None)
+    if reserva is None:
+        return response
+
+    registro_id, bind = reserva
+    corpo = b"".join([parte async for parte in response.body_iterator])
+    if response.status_code >= 500:
+        idempotency_service.liberar(bind, registro_id)
+    else:
+        idempotency_service.registrar_resposta(
+            bind,
+            registro_id,
+            response.status_code,
+            [[nome.decode("latin-1"), valor.decode("latin-1")] for nome, valor in response.raw_headers],
+            corpo
+        )
+    return _resposta(corpo, response.status_code, response.raw_headers)
+
+
+def _resposta(corpo: bytes, status_code: int, raw_headers: list) -> Response:
+    """Resposta com os cabeçalhos exatos informados (repetidos inclusive)."""
+    resposta = Response(content=corpo, status_code=status_code)
+    resposta.raw_headers = list(raw_headers)
+    return resposta
+
+
+async def resposta_repetida_handler(request: Request, exc: RespostaRepetida) -> Response:
+    """Responde um reenvio com a resposta guardada da requisição original."""
+    return _resposta(
+        exc.corpo,
+        exc.status_code,
+        [(nome.encode("latin-1"), valor.encode("latin-1")) for nome, valor in exc.cabecalhos]
+        + [(b"idempotent-replayed", b"true")]
+    )
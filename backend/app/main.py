@@ -2,6 +2,8 @@
 Aplicação principal FastAPI.
 Entry point da API com configuração de CORS, routers e middleware.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -9,6 +11,22 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
+from app.database import SessionLocal
+from app.idempotency import guardar_resposta_idempotente, resposta_repetida_handler
+from app.services import report_job_service
+from app.services.idempotency_service import RespostaRepetida
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Inicialização da API: jobs de relatório cujo processo parou de enviar
+    batimentos são marcados como erro.
+    """
+    with SessionLocal() as db:
+        report_job_service.recuperar_jobs_interrompidos(db)
+    yield
+
 
 # Criar instância do FastAPI
 app = FastAPI(
@@ -16,7 +34,8 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url="/docs",
     redoc_url="/redoc",
-    description="Sistema de gerenciamento de dízimo e membros da igreja"
+    description="Sistema de gerenciamento de dízimo e membros da igreja",
+    lifespan=lifespan
 )
 
 # Configurar CORS com origens específicas do ambiente
@@ -34,6 +53,10 @@ limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Idempotency-Key: respostas guardadas para reenvios de criação
+app.middleware("http")(guardar_resposta_idempotente)
+app.add_exception_handler(RespostaRepetida, resposta_repetida_handler)
+
 
 @app.get("/health", tags=["Health"])
 async def health_check():
@@ -60,7 +83,7 @@ async def root():
 
 
 # Importar routers
-from app.routers import auth, paroquia, comunidade, dizimista, contribuicao, reports
+from app.routers import auth, paroquia, comunidade, dizimista, contribuicao, fechamento, lote_coleta, reports
 
 # Registrar routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Autenticação"])
@@ -68,4 +91,6 @@ app.include_router(paroquia.router, prefix="/api/paroquias", tags=["Paróquias"]
 app.include_router(comunidade.router, prefix="/api/comunidades", tags=["Comunidades"])
 app.include_router(dizimista.router, prefix="/api/dizimistas", tags=["Dizimistas"])
 app.include_router(contribuicao.router, prefix="/api/contribuicoes", tags=["Contribuições"])
+app.include_router(fechamento.router, prefix="/api/fechamentos", tags=["Fechamentos"])
+app.include_router(lote_coleta.router, prefix="/api/lotes-coleta", tags=["Lotes de Coleta"])
 app.include_router(reports.router, prefix="/api/reports", tags=["Relatórios"])
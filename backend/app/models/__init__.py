@@ -8,6 +8,10 @@ from app.models.paroquia import Paroquia
 from app.models.comunidade import Comunidade
 from app.models.dizimista import Dizimista
 from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
+from app.models.relatorio_job import RelatorioJob, StatusJobEnum
+from app.models.fechamento import FechamentoMensal, FechamentoTotal
+from app.models.lote_coleta import LoteColeta
+from app.models.idempotencia import ChaveIdempotencia
 
 __all__ = [
     "Base",
@@ -18,4 +22,10 @@ __all__ = [
     "Dizimista",
     "Contribuicao",
     "TipoContribuicaoEnum",
+    "RelatorioJob",
+    "StatusJobEnum",
+    "FechamentoMensal",
+    "FechamentoTotal",
+    "LoteColeta",
+    "ChaveIdempotencia",
 ]
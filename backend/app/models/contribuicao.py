@@ -3,8 +3,8 @@ Modelo de Contribuição.
 Representa uma contribuição (dízimo ou oferta) de um dizimista ou comunidade.
 """
 from enum import Enum
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Numeric, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Numeric, Text, Index, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -16,9 +16,28 @@ class TipoContribuicaoEnum(str, Enum):
     OFERTA = "OFERTA"
 
 
+def referencia_para_num(referencia: str) -> int:
+    """Converte um mês de referência YYYY-MM na chave inteira YYYYMM."""
+    return int(referencia[:4]) * 100 + int(referencia[5:7])
+
+
 class Contribuicao(Base):
     """Modelo de Contribuição."""
     __tablename__ = "contribuicoes"
+    __table_args__ = (
+        # Histórico de um dizimista paginado por (data, id)
+        Index("ix_contribuicoes_dizimista_data_id", "dizimista_id", "data_contribuicao", "id"),
+        # Último dízimo de cada dizimista (busca de dizimistas sem dízimo recente)
+        Index("ix_contribuicoes_dizimista_tipo_data", "dizimista_id", "tipo", "data_contribuicao"),
+        # Ranking de dizimistas por comunidade e período (index-only no PostgreSQL)
+        Index(
+            "ix_contribuicoes_comunidade_data_dizimista",
+            "comunidade_id", "data_contribuicao", "dizimista_id",
+            postgresql_include=["valor"]
+        ),
+        # Deduplicação das inclusões em lote de coleta pelo id gerado no cliente
+        UniqueConstraint("lote_id", "client_id", name="uq_contribuicoes_lote_client"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     dizimista_id = Column(Integer, ForeignKey("dizimistas.id", ondelete="SET NULL"), nullable=True, index=True)
@@ -27,8 +46,11 @@ class Contribuicao(Base):
     valor = Column(Numeric(precision=10, scale=2), nullable=False)
     data_contribuicao = Column(Date, nullable=False, index=True)
     forma_pagamento = Column(String(100), nullable=True)  # Ex: Dinheiro, PIX, Cartão, etc.
-    referencia_mes = Column(String(7), nullable=True, index=True)  # Format: YYYY-MM
+    referencia_mes = Column(String(7), nullable=True)  # Format: YYYY-MM
+    referencia_mes_num = Column(Integer, nullable=True, index=True)  # YYYYMM, para buscas por faixa
     observacoes = Column(Text, nullable=True)
+    lote_id = Column(Integer, ForeignKey("lotes_coleta.id", ondelete="SET NULL"), nullable=True, index=True)
+    client_id = Column(String(64), nullable=True)  # Id gerado no cliente, único no lote
 
     # Timestamps
     criado_em = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -37,6 +59,13 @@ class Contribuicao(Base):
     # Relacionamentos
     dizimista = relationship("Dizimista", back_populates="contribuicoes")
     comunidade = relationship("Comunidade", back_populates="contribuicoes")
+    lote = relationship("LoteColeta", back_populates="contribuicoes")
+
+    @validates("referencia_mes")
+    def _sync_referencia_mes_num(self, key, value):
+        """Mantém referencia_mes_num em sincronia com referencia_mes."""
+        self.referencia_mes_num = referencia_para_num(value) if value is not None else None
+        return value
 
     def __repr__(self):
         return f"<Contribuicao(id={self.id}, tipo={self.tipo}, valor={self.valor}, data={self.data_contribuicao})>"
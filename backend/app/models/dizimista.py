@@ -2,8 +2,8 @@
 Modelo de Dizimista.
 Representa um dizimista (membro contribuinte) de uma comunidade.
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Date, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, ForeignKey, Boolean, Date, Text, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -12,6 +12,11 @@ from app.database import Base
 class Dizimista(Base):
     """Modelo de Dizimista."""
     __tablename__ = "dizimistas"
+    __table_args__ = (
+        # Buscas de aniversariantes por faixa de mês/dia
+        Index("ix_dizimistas_ativo_aniversario_mmdd", "ativo", "aniversario_mmdd"),
+        Index("ix_dizimistas_comunidade_ativo_aniversario_mmdd", "comunidade_id", "ativo", "aniversario_mmdd"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     comunidade_id = Column(Integer, ForeignKey("comunidades.id", ondelete="RESTRICT"), nullable=False, index=True)
@@ -20,6 +25,7 @@ class Dizimista(Base):
     telefone = Column(String(20), nullable=True, index=True)
     email = Column(String(255), nullable=True, index=True)
     data_nascimento = Column(Date, nullable=True, index=True)
+    aniversario_mmdd = Column(SmallInteger, nullable=True)  # Mês * 100 + dia, derivado de data_nascimento
     endereco = Column(Text, nullable=True)
     ativo = Column(Boolean, nullable=False, default=True, index=True)
     observacoes = Column(Text, nullable=True)
@@ -32,5 +38,11 @@ class Dizimista(Base):
     comunidade = relationship("Comunidade", back_populates="dizimistas")
     contribuicoes = relationship("Contribuicao", back_populates="dizimista")
 
+    @validates("data_nascimento")
+    def _sync_aniversario_mmdd(self, key, value):
+        """Mantém aniversario_mmdd em sincronia com data_nascimento."""
+        self.aniversario_mmdd = value.month * 100 + value.day if value is not None else None
+        return value
+
     def __repr__(self):
         return f"<Dizimista(id={self.id}, nome={self.nome}, ativo={self.ativo})>"
@@ -0,0 +1,50 @@
+"""
+Modelo de Fechamento Mensal.
+Representa o fechamento de um mês de uma comunidade e os totais congelados.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.database import Base
+from app.models.contribuicao import TipoContribuicaoEnum
+
+
+class FechamentoMensal(Base):
+    """Modelo de Fechamento Mensal."""
+    __tablename__ = "fechamentos_mensais"
+    __table_args__ = (
+        UniqueConstraint("comunidade_id", "mes", name="uq_fechamentos_mensais_comunidade_mes"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    comunidade_id = Column(Integer, ForeignKey("comunidades.id", ondelete="RESTRICT"), nullable=False, index=True)
+    mes = Column(Integer, nullable=False, index=True)  # YYYYMM
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="SET NULL"), nullable=True)
+
+    # Timestamps
+    fechado_em = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Relacionamentos
+    totais = relationship("FechamentoTotal", back_populates="fechamento", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<FechamentoMensal(id={self.id}, comunidade_id={self.comunidade_id}, mes={self.mes})>"
+
+
+class FechamentoTotal(Base):
+    """Totais congelados de um fechamento por tipo e forma de pagamento."""
+    __tablename__ = "fechamento_totais"
+
+    id = Column(Integer, primary_key=True, index=True)
+    fechamento_id = Column(Integer, ForeignKey("fechamentos_mensais.id", ondelete="CASCADE"), nullable=False, index=True)
+    tipo = Column(SQLEnum(TipoContribuicaoEnum), nullable=False)
+    forma_pagamento = Column(String(100), nullable=True)
+    total = Column(Numeric(precision=12, scale=2), nullable=False)
+    quantidade = Column(Integer, nullable=False)
+
+    # Relacionamentos
+    fechamento = relationship("FechamentoMensal", back_populates="totais")
+
+    def __repr__(self):
+        return f"<FechamentoTotal(fechamento_id={self.fechamento_id}, tipo={self.tipo}, total={self.total})>"
@@ -0,0 +1,45 @@
+"""
+Modelo de Chave de Idempotência.
+Guarda a resposta de uma requisição de criação para repeti-la em reenvios.
+"""
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ChaveIdempotencia(Base):
+    """Modelo de Chave de Idempotência."""
+    __tablename__ = "chaves_idempotencia"
+    __table_args__ = (
+        # Reenvio respondido com uma única busca no índice
+        UniqueConstraint("usuario_id", "chave", name="uq_chaves_idempotencia_usuario_chave"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=False)
+    chave = Column(String(255), nullable=False)
+    metodo = Column(String(10), nullable=False)
+    rota = Column(String(255), nullable=False)
+    hash_requisicao = Column(String(64), nullable=False)  # SHA-256 do corpo
+
+    # Resposta guardada; status_code nulo enquanto a requisição está em andamento
+    status_code = Column(Integer, nullable=True)
+    cabecalhos = Column(JSON, nullable=True)  # [[nome, valor], ...], na ordem e com repetições
+    corpo = Column(LargeBinary, nullable=True)
+
+    # Timestamps
+    criado_em = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expira_em = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ChaveIdempotencia(usuario_id={self.usuario_id}, chave={self.chave}, status={self.status_code})>"
@@ -0,0 +1,34 @@
+"""
+Modelo de Lote de Coleta.
+Agrupa as contribuições recolhidas numa celebração de uma comunidade.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Numeric
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class LoteColeta(Base):
+    """Modelo de Lote de Coleta."""
+    __tablename__ = "lotes_coleta"
+
+    id = Column(Integer, primary_key=True, index=True)
+    comunidade_id = Column(Integer, ForeignKey("comunidades.id", ondelete="RESTRICT"), nullable=False, index=True)
+    data_coleta = Column(Date, nullable=False, index=True)
+    descricao = Column(String(255), nullable=True)  # Ex: Missa das 10h
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="SET NULL"), nullable=True)
+
+    # Totais mantidos a cada inclusão, alteração ou remoção de contribuição
+    total = Column(Numeric(precision=12, scale=2), nullable=False, default=0, server_default="0")
+    quantidade = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Timestamps
+    criado_em = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    encerrado_em = Column(DateTime(timezone=True), nullable=True)
+
+    # Relacionamentos
+    contribuicoes = relationship("Contribuicao", back_populates="lote")
+
+    def __repr__(self):
+        return f"<LoteColeta(id={self.id}, comunidade_id={self.comunidade_id}, data={self.data_coleta})>"
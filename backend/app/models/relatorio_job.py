@@ -0,0 +1,50 @@
+"""
+Modelo de Job de Relatório.
+Representa a execução assíncrona de um relatório e seu resultado.
+"""
+from enum import Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Enum as SQLEnum
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class StatusJobEnum(str, Enum):
+    """Enum para situações de um job de relatório."""
+    PENDENTE = "PENDENTE"
+    EXECUTANDO = "EXECUTANDO"
+    CONCLUIDO = "CONCLUIDO"
+    ERRO = "ERRO"
+
+
+class EtapaJobEnum(str, Enum):
+    """Enum para etapas da execução de um job de relatório."""
+    FILA = "FILA"  # aguardando uma thread do pool
+    CONSULTA = "CONSULTA"  # relatório em execução no banco
+    GRAVACAO = "GRAVACAO"  # resultado sendo convertido e gravado
+    FINALIZADO = "FINALIZADO"
+
+
+class RelatorioJob(Base):
+    """Modelo de Job de Relatório."""
+    __tablename__ = "relatorio_jobs"
+
+    id = Column(String(36), primary_key=True)  # UUID
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=False, index=True)
+    tipo = Column(String(50), nullable=False)
+    parametros = Column(JSON, nullable=False)
+    status = Column(SQLEnum(StatusJobEnum), nullable=False, default=StatusJobEnum.PENDENTE)
+    etapa = Column(SQLEnum(EtapaJobEnum), nullable=False, default=EtapaJobEnum.FILA)
+    resultado = Column(JSON, nullable=True)
+    erro = Column(Text, nullable=True)
+    executor = Column(String(100), nullable=True)  # host:pid:sufixo do processo que executa o job
+
+    # Timestamps
+    criado_em = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    iniciado_em = Column(DateTime(timezone=True), nullable=True)
+    concluido_em = Column(DateTime(timezone=True), nullable=True)
+    expira_em = Column(DateTime(timezone=True), nullable=True, index=True)
+    atualizado_em = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # batimento do executor
+
+    def __repr__(self):
+        return f"<RelatorioJob(id={self.id}, tipo={self.tipo}, status={self.status})>"
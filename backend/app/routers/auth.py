@@ -17,6 +17,7 @@ from app.services.auth_service import authenticate_user, create_user
 from app.auth.dependencies import get_current_active_user, require_admin
 from app.auth.utils import create_access_token
 from app.config import settings
+from app.idempotency import idempotencia
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -63,7 +64,12 @@ async def login(request: Request, login_data: Login, db: Session = Depends(get_d
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.post("/register", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UsuarioResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotencia)]
+)
 @limiter.limit("10/minute")
 async def register(
     request: Request,
@@ -11,6 +11,7 @@ from app.schemas.comunidade import ComunidadeCreate, ComunidadeUpdate, Comunidad
 from app.models.usuario import Usuario
 from app.services import comunidade_service
 from app.auth.dependencies import get_current_active_user, require_admin
+from app.idempotency import idempotencia
 
 router = APIRouter()
 
@@ -36,7 +37,12 @@ async def list_comunidades(
     return comunidades
 
 
-@router.post("", response_model=ComunidadeResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=ComunidadeResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotencia)]
+)
 async def create_comunidade(
     comunidade_data: ComunidadeCreate,
     db: Session = Depends(get_db),
@@ -5,17 +5,27 @@ Endpoints CRUD para gerenciamento de contribuições.
 from datetime import date
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.database import get_db
-from app.schemas.contribuicao import ContribuicaoCreate, ContribuicaoUpdate, ContribuicaoResponse
+from app.schemas.contribuicao import (
+    ContribuicaoCreate,
+    ContribuicaoUpdate,
+    ContribuicaoResponse,
+    ContribuicaoBatchCreate,
+    ContribuicaoBatchResponse,
+    REFERENCIA_MES_PATTERN,
+)
 from app.schemas.pagination import PaginatedResponse
 from app.models.usuario import Usuario
 from app.models.contribuicao import TipoContribuicaoEnum
 from app.services import contribuicao_service
+from app.services.xlsx_export import gerar_xlsx, resposta_xlsx
 from app.auth.dependencies import get_current_active_user
+from app.idempotency import idempotencia
 import math
 
 router = APIRouter()
@@ -33,6 +43,8 @@ async def list_contribuicoes(
     tipo: Optional[TipoContribuicaoEnum] = Query(None, description="Filtrar por tipo"),
     data_inicio: Optional[date] = Query(None, description="Data de início do período"),
     data_fim: Optional[date] = Query(None, description="Data de fim do período"),
+    referencia_inicio: Optional[str] = Query(None, pattern=REFERENCIA_MES_PATTERN, description="Mês de referência inicial (YYYY-MM)"),
+    referencia_fim: Optional[str] = Query(None, pattern=REFERENCIA_MES_PATTERN, description="Mês de referência final (YYYY-MM)"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_active_user)
 ):
@@ -49,6 +61,8 @@ async def list_contribuicoes(
         tipo: Tipo de contribuição para filtrar
         data_inicio: Data de início do período
         data_fim: Data de fim do período
+        referencia_inicio: Mês de referência inicial (YYYY-MM)
+        referencia_fim: Mês de referência final (YYYY-MM)
         db: Sessão do banco de dados
         current_user: Usuário autenticado
 
@@ -63,7 +77,9 @@ async def list_contribuicoes(
         comunidade_id=comunidade_id,
         tipo=tipo,
         data_inicio=data_inicio,
-        data_fim=data_fim
+        data_fim=data_fim,
+        referencia_inicio=referencia_inicio,
+        referencia_fim=referencia_fim
     )
 
     total_pages = math.ceil(total / page_size) if total > 0 else 0
@@ -77,7 +93,113 @@ async def list_contribuicoes(
     }
 
 
-@router.post("", response_model=ContribuicaoResponse, status_code=status.HTTP_201_CREATED)
+@router.get("/export.csv")
+@limiter.limit("10/minute")
+async def export_contribuicoes_csv(
+    request: Request,
+    dizimista_id: Optional[int] = Query(None, description="Filtrar por ID do dizimista"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    tipo: Optional[TipoContribuicaoEnum] = Query(None, description="Filtrar por tipo"),
+    data_inicio: Optional[date] = Query(None, description="Data de início do período"),
+    data_fim: Optional[date] = Query(None, description="Data de fim do período"),
+    referencia_inicio: Optional[str] = Query(None, pattern=REFERENCIA_MES_PATTERN, description="Mês de referência inicial (YYYY-MM)"),
+    referencia_fim: Optional[str] = Query(None, pattern=REFERENCIA_MES_PATTERN, description="Mês de referência final (YYYY-MM)"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Exporta contribuições em CSV, com os mesmos filtros da listagem.
+    O arquivo é transmitido em blocos à medida que as linhas são lidas.
+    Rate limit: 10 requisições por minuto por IP.
+
+    Args:
+        request: Request object para rate limiting
+        dizimista_id: ID do dizimista para filtrar
+        comunidade_id: ID da comunidade para filtrar
+        tipo: Tipo de contribuição para filtrar
+        data_inicio: Data de início do período
+        data_fim: Data de fim do período
+        referencia_inicio: Mês de referência inicial (YYYY-MM)
+        referencia_fim: Mês de referência final (YYYY-MM)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Arquivo CSV (text/csv) transmitido em blocos
+    """
+    conteudo = contribuicao_service.exportar_csv(
+        db.get_bind(),
+        dizimista_id=dizimista_id,
+        comunidade_id=comunidade_id,
+        tipo=tipo,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        referencia_inicio=referencia_inicio,
+        referencia_fim=referencia_fim
+    )
+    return StreamingResponse(
+        conteudo,
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="contribuicoes.csv"'}
+    )
+
+
+@router.get("/export.xlsx")
+@limiter.limit("10/minute")
+def export_contribuicoes_xlsx(
+    request: Request,
+    dizimista_id: Optional[int] = Query(None, description="Filtrar por ID do dizimista"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    tipo: Optional[TipoContribuicaoEnum] = Query(None, description="Filtrar por tipo"),
+    data_inicio: Optional[date] = Query(None, description="Data de início do período"),
+    data_fim: Optional[date] = Query(None, description="Data de fim do período"),
+    referencia_inicio: Optional[str] = Query(None, pattern=REFERENCIA_MES_PATTERN, description="Mês de referência inicial (YYYY-MM)"),
+    referencia_fim: Optional[str] = Query(None, pattern=REFERENCIA_MES_PATTERN, description="Mês de referência final (YYYY-MM)"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Exporta contribuições em XLSX, com os mesmos filtros da listagem.
+    Rate limit: 10 requisições por minuto por IP.
+
+    Args:
+        request: Request object para rate limiting
+        dizimista_id: ID do dizimista para filtrar
+        comunidade_id: ID da comunidade para filtrar
+        tipo: Tipo de contribuição para filtrar
+        data_inicio: Data de início do período
+        data_fim: Data de fim do período
+        referencia_inicio: Mês de referência inicial (YYYY-MM)
+        referencia_fim: Mês de referência final (YYYY-MM)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Planilha XLSX
+    """
+    arquivo, linhas, tamanho = gerar_xlsx(
+        "Contribuições",
+        contribuicao_service.COLUNAS_EXPORTACAO,
+        contribuicao_service.linhas_exportacao(
+            db,
+            dizimista_id=dizimista_id,
+            comunidade_id=comunidade_id,
+            tipo=tipo,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            referencia_inicio=referencia_inicio,
+            referencia_fim=referencia_fim
+        )
+    )
+    return resposta_xlsx(arquivo, linhas, tamanho, "contribuicoes.xlsx")
+
+
+@router.post(
+    "",
+    response_model=ContribuicaoResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotencia)]
+)
 async def create_contribuicao(
     contribuicao_data: ContribuicaoCreate,
     db: Session = Depends(get_db),
@@ -98,6 +220,36 @@ async def create_contribuicao(
     return contribuicao
 
 
+@router.post(
+    "/batch",
+    response_model=ContribuicaoBatchResponse,
+    dependencies=[Depends(idempotencia)]
+)
+@limiter.limit("30/minute")
+def create_contribuicoes_batch(
+    request: Request,
+    lote: ContribuicaoBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Cria várias contribuições numa única transação.
+
+    Itens inválidos (dados, comunidade ou dizimista inexistente, mês
+    fechado) são devolvidos como erros; os demais são criados.
+
+    Args:
+        request: Requisição (usada pelo rate limit)
+        lote: Itens no formato de ContribuicaoCreate
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Contribuições criadas e erros por item
+    """
+    return contribuicao_service.create_contribuicoes_lote(db, lote.itens)
+
+
 @router.get("/{contribuicao_id}", response_model=ContribuicaoResponse)
 async def get_contribuicao(
     contribuicao_id: int,
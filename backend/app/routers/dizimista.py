@@ -3,18 +3,20 @@ Router de Dizimistas.
 Endpoints CRUD para gerenciamento de dizimistas.
 """
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.database import get_db
-from app.schemas.dizimista import DizimistaCreate, DizimistaUpdate, DizimistaResponse
+from app.schemas.dizimista import DizimistaCreate, DizimistaUpdate, DizimistaResponse, DizimistaImportResponse
 from app.schemas.pagination import PaginatedResponse
 from app.models.usuario import Usuario
-from app.services import dizimista_service
+from app.services import dizimista_service, dizimista_import_service
+from app.services.xlsx_export import gerar_xlsx, resposta_xlsx
 from app.auth.dependencies import get_current_active_user
+from app.idempotency import idempotencia
 import math
 
 router = APIRouter()
@@ -70,7 +72,45 @@ async def list_dizimistas(
     }
 
 
-@router.post("", response_model=DizimistaResponse, status_code=status.HTTP_201_CREATED)
+@router.get("/export.xlsx")
+@limiter.limit("10/minute")
+def export_dizimistas_xlsx(
+    request: Request,
+    search: Optional[str] = Query(None, description="Buscar por nome, telefone ou email"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    ativo: Optional[bool] = Query(None, description="Filtrar por status ativo"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Exporta dizimistas em XLSX, com os mesmos filtros da listagem.
+    Rate limit: 10 requisições por minuto por IP.
+
+    Args:
+        request: Request object para rate limiting
+        search: Termo de busca
+        comunidade_id: ID da comunidade para filtrar
+        ativo: Status ativo para filtrar
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Planilha XLSX
+    """
+    arquivo, linhas, tamanho = gerar_xlsx(
+        "Dizimistas",
+        dizimista_service.COLUNAS_EXPORTACAO,
+        dizimista_service.linhas_exportacao(db, search=search, comunidade_id=comunidade_id, ativo=ativo)
+    )
+    return resposta_xlsx(arquivo, linhas, tamanho, "dizimistas.xlsx")
+
+
+@router.post(
+    "",
+    response_model=DizimistaResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotencia)]
+)
 async def create_dizimista(
     dizimista_data: DizimistaCreate,
     db: Session = Depends(get_db),
@@ -101,6 +141,38 @@ async def create_dizimista(
         )
 
 
+@router.post(
+    "/import",
+    response_model=DizimistaImportResponse,
+    dependencies=[Depends(idempotencia)]
+)
+@limiter.limit("5/minute")
+def import_dizimistas(
+    request: Request,
+    arquivo: UploadFile = File(..., description="CSV com cabeçalho (UTF-8)"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Importa dizimistas em massa a partir de um CSV.
+    Linhas inválidas não impedem a importação das demais.
+    Rate limit: 5 requisições por minuto por IP.
+
+    Args:
+        request: Request object para rate limiting
+        arquivo: CSV com as colunas de DizimistaCreate
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Quantidade importada e erros por linha
+
+    Raises:
+        HTTPException: Se o arquivo não for um CSV válido
+    """
+    return dizimista_import_service.importar_csv(db, arquivo.file)
+
+
 @router.get("/{dizimista_id}", response_model=DizimistaResponse)
 async def get_dizimista(
     dizimista_id: int,
@@ -0,0 +1,91 @@
+"""
+Router de Fechamentos.
+Endpoints para fechar e reabrir meses de uma comunidade.
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.fechamento import FechamentoCreate, FechamentoResponse
+from app.models.usuario import Usuario
+from app.services import fechamento_service
+from app.auth.dependencies import get_current_active_user, require_admin
+from app.idempotency import idempotencia
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[FechamentoResponse])
+async def list_fechamentos(
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Lista meses fechados, do mais recente ao mais antigo.
+
+    Args:
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Lista de fechamentos com seus totais
+    """
+    return fechamento_service.get_fechamentos(db, comunidade_id)
+
+
+@router.post(
+    "",
+    response_model=FechamentoResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotencia)]
+)
+async def create_fechamento(
+    fechamento_data: FechamentoCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_admin)
+):
+    """
+    Fecha um mês de uma comunidade (apenas administradores).
+
+    Após o fechamento, contribuições daquele mês não podem ser criadas,
+    alteradas ou removidas até que o mês seja reaberto.
+
+    Args:
+        fechamento_data: Comunidade e mês
+        db: Sessão do banco de dados
+        current_user: Usuário administrador
+
+    Returns:
+        Fechamento criado
+
+    Raises:
+        HTTPException: Se o mês não puder ser fechado
+    """
+    return fechamento_service.fechar_mes(db, fechamento_data, current_user)
+
+
+@router.delete("/{fechamento_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_fechamento(
+    fechamento_id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_admin)
+):
+    """
+    Reabre um mês fechado (apenas administradores).
+
+    Args:
+        fechamento_id: ID do fechamento
+        db: Sessão do banco de dados
+        current_user: Usuário administrador
+
+    Raises:
+        HTTPException: Se o fechamento não for encontrado
+    """
+    if not fechamento_service.reabrir_mes(db, fechamento_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Fechamento não encontrado"
+        )
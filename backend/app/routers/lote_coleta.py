@@ -0,0 +1,169 @@
+"""
+Router de Lotes de Coleta.
+Endpoints para lançar as contribuições de uma celebração em lotes.
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy.orm import Session
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.database import get_db
+from app.schemas.lote_coleta import (
+    LoteColetaCreate,
+    LoteColetaResponse,
+    LoteColetaItensCreate,
+    LoteColetaItensResponse,
+)
+from app.models.lote_coleta import LoteColeta
+from app.models.usuario import Usuario
+from app.services import lote_coleta_service
+from app.auth.dependencies import get_current_active_user
+from app.idempotency import idempotencia
+
+router = APIRouter()
+limiter = Limiter(key_func=get_remote_address)
+
+
+def _obter_lote(db: Session, lote_id: int) -> LoteColeta:
+    """Obtém um lote de coleta ou responde 404."""
+    lote = lote_coleta_service.get_lote(db, lote_id)
+    if not lote:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lote de coleta não encontrado"
+        )
+    return lote
+
+
+@router.get("", response_model=List[LoteColetaResponse])
+async def list_lotes(
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    abertos: bool = Query(False, description="Apenas lotes não encerrados"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Lista lotes de coleta, da coleta mais recente à mais antiga.
+
+    Args:
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        abertos: Se True, apenas lotes não encerrados
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Lista de lotes com seus totais
+    """
+    return lote_coleta_service.get_lotes(db, comunidade_id, abertos)
+
+
+@router.post(
+    "",
+    response_model=LoteColetaResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotencia)]
+)
+async def create_lote(
+    lote_data: LoteColetaCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Abre um lote de coleta.
+
+    Args:
+        lote_data: Comunidade, data e descrição
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Lote criado
+
+    Raises:
+        HTTPException: Se a comunidade não existir
+    """
+    return lote_coleta_service.create_lote(db, lote_data, current_user)
+
+
+@router.get("/{lote_id}", response_model=LoteColetaResponse)
+async def get_lote(
+    lote_id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Obtém um lote de coleta por ID.
+
+    Args:
+        lote_id: ID do lote
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Lote encontrado
+
+    Raises:
+        HTTPException: Se o lote não for encontrado
+    """
+    return _obter_lote(db, lote_id)
+
+
+@router.post(
+    "/{lote_id}/itens",
+    response_model=LoteColetaItensResponse,
+    dependencies=[Depends(idempotencia)]
+)
+@limiter.limit("60/minute")
+def add_itens(
+    request: Request,
+    lote_id: int,
+    itens_data: LoteColetaItensCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Inclui contribuições num lote de coleta aberto.
+
+    Pode ser reenviado sem risco: itens cujo client_id já está no lote são
+    ignorados e contados como duplicados.
+
+    Args:
+        request: Requisição (usada pelo rate limit)
+        lote_id: ID do lote
+        itens_data: Itens no formato de LoteColetaItemCreate
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Contagens, erros por item e o lote com os totais atualizados
+
+    Raises:
+        HTTPException: Se o lote não for encontrado ou estiver encerrado
+    """
+    lote = _obter_lote(db, lote_id)
+    return lote_coleta_service.incluir_itens(db, lote, itens_data.itens)
+
+
+@router.post("/{lote_id}/encerrar", response_model=LoteColetaResponse)
+async def encerrar_lote(
+    lote_id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Encerra um lote de coleta, conferindo seus totais.
+
+    Args:
+        lote_id: ID do lote
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Lote encerrado
+
+    Raises:
+        HTTPException: Se o lote não for encontrado
+    """
+    lote = _obter_lote(db, lote_id)
+    return lote_coleta_service.encerrar_lote(db, lote)
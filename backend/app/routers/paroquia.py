@@ -11,6 +11,7 @@ from app.schemas.paroquia import ParoquiaCreate, ParoquiaUpdate, ParoquiaRespons
 from app.models.usuario import Usuario
 from app.services import paroquia_service
 from app.auth.dependencies import get_current_active_user, require_admin
+from app.idempotency import idempotencia
 
 router = APIRouter()
 
@@ -34,7 +35,12 @@ async def list_paroquias(
     return paroquias
 
 
-@router.post("", response_model=ParoquiaResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=ParoquiaResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotencia)]
+)
 async def create_paroquia(
     paroquia_data: ParoquiaCreate,
     db: Session = Depends(get_db),
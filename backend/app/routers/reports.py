@@ -12,19 +12,59 @@ from app.schemas.reports import (
     AniversarianteResponse,
     TotalPeriodoResponse,
     TotalTipoListResponse,
+    TotalComunidadeListResponse,
+    SerieMensalListResponse,
+    RankingListResponse,
+    ComparativoResponse,
+    DistribuicaoListResponse,
+    AnaliseResponse,
+    DizimistaSemDizimoListResponse,
+    AdimplenciaResponse,
     HistoricoContribuicaoResponse,
+    DashboardResponse,
+    CacheMetricasResponse,
+    ExportacaoMetricasResponse,
 )
+from app.schemas.report_job import RelatorioJobCreate, RelatorioJobResponse, RelatorioJobResultadoResponse
 from app.models.usuario import Usuario
-from app.services import report_service
-from app.auth.dependencies import get_current_active_user
+from app.models.contribuicao import TipoContribuicaoEnum
+from app.services import report_service, report_job_service
+from app.services.report_cache import report_cache
+from app.services.xlsx_export import gerar_xlsx, resposta_xlsx, metricas_exportacao
+from app.auth.dependencies import get_current_active_user, require_admin
+from app.idempotency import idempotencia
 
 router = APIRouter()
 
 
+def _validar_janela_aniversariantes(
+    periodo: str, data_inicio: Optional[date], data_fim: Optional[date]
+) -> None:
+    """Valida a janela de datas do período 'intervalo' de aniversariantes."""
+    if periodo == "intervalo":
+        if data_inicio is None or data_fim is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Período 'intervalo' exige data_inicio e data_fim"
+            )
+        if data_inicio > data_fim:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Data de início deve ser anterior à data de fim"
+            )
+
+
+# Os relatórios agregados são definidos como funções síncronas para que o
+# FastAPI os execute no threadpool: requisições simultâneas rodam em
+# paralelo e as idênticas são agrupadas pelo cache de relatórios.
+
+
 @router.get("/aniversariantes", response_model=List[AniversarianteResponse])
-async def get_aniversariantes(
-    periodo: Literal["hoje", "7dias", "mes"] = Query(..., description="Período de aniversário"),
+def get_aniversariantes(
+    periodo: Literal["hoje", "7dias", "mes", "intervalo"] = Query(..., description="Período de aniversário"),
     comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    data_inicio: Optional[date] = Query(None, description="Início da janela (período 'intervalo')"),
+    data_fim: Optional[date] = Query(None, description="Fim da janela (período 'intervalo')"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_active_user)
 ):
@@ -32,23 +72,80 @@ async def get_aniversariantes(
     Obtém lista de aniversariantes.
 
     Args:
-        periodo: Período de aniversário ('hoje', '7dias', 'mes')
+        periodo: Período de aniversário ('hoje', '7dias', 'mes', 'intervalo')
         comunidade_id: ID da comunidade para filtrar (opcional)
+        data_inicio: Início da janela, obrigatório para 'intervalo'
+        data_fim: Fim da janela, obrigatório para 'intervalo'
         db: Sessão do banco de dados
         current_user: Usuário autenticado
 
     Returns:
         Lista de aniversariantes
+
+    Raises:
+        HTTPException: Se a janela do período 'intervalo' for inválida
     """
-    aniversariantes = report_service.get_aniversariantes(db, periodo, comunidade_id)
+    _validar_janela_aniversariantes(periodo, data_inicio, data_fim)
+    aniversariantes = report_service.get_aniversariantes(
+        db, periodo, comunidade_id, data_inicio, data_fim
+    )
     return aniversariantes
 
 
+# Colunas da exportação de aniversariantes, na ordem do arquivo
+COLUNAS_ANIVERSARIANTES = ["id", "nome", "data_nascimento", "telefone", "email", "comunidade_id", "comunidade"]
+
+
+@router.get("/aniversariantes/export.xlsx")
+def export_aniversariantes_xlsx(
+    periodo: Literal["hoje", "7dias", "mes", "intervalo"] = Query(..., description="Período de aniversário"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    data_inicio: Optional[date] = Query(None, description="Início da janela (período 'intervalo')"),
+    data_fim: Optional[date] = Query(None, description="Fim da janela (período 'intervalo')"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Exporta a lista de aniversariantes em XLSX.
+
+    Args:
+        periodo: Período de aniversário ('hoje', '7dias', 'mes', 'intervalo')
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        data_inicio: Início da janela, obrigatório para 'intervalo'
+        data_fim: Fim da janela, obrigatório para 'intervalo'
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Planilha XLSX
+
+    Raises:
+        HTTPException: Se a janela do período 'intervalo' for inválida
+    """
+    _validar_janela_aniversariantes(periodo, data_inicio, data_fim)
+    aniversariantes = report_service.get_aniversariantes(
+        db, periodo, comunidade_id, data_inicio, data_fim
+    )
+    arquivo, linhas, tamanho = gerar_xlsx(
+        "Aniversariantes",
+        COLUNAS_ANIVERSARIANTES,
+        (
+            (a["id"], a["nome"], a["data_nascimento"], a["telefone"], a["email"], a["comunidade_id"], a["comunidade_nome"])
+            for a in aniversariantes
+        )
+    )
+    return resposta_xlsx(arquivo, linhas, tamanho, f"aniversariantes-{periodo}.xlsx")
+
+
 @router.get("/total-periodo", response_model=TotalPeriodoResponse)
-async def get_total_periodo(
+def get_total_periodo(
     start_date: date = Query(..., description="Data de início do período"),
     end_date: date = Query(..., description="Data de fim do período"),
     comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    fonte: Literal["banco", "parquet"] = Query(
+        "banco", description="Fonte dos dados: banco ou extração Parquet (última extração)"
+    ),
+    stale_ok: bool = Query(False, description="Aceitar resultado em cache defasado, atualizado em segundo plano"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_active_user)
 ):
@@ -59,6 +156,8 @@ async def get_total_periodo(
         start_date: Data de início
         end_date: Data de fim
         comunidade_id: ID da comunidade para filtrar (opcional)
+        fonte: "banco" ou "parquet"
+        stale_ok: Se aceita resultado defasado (ex.: dashboard)
         db: Sessão do banco de dados
         current_user: Usuário autenticado
 
@@ -74,15 +173,21 @@ async def get_total_periodo(
             detail="Data de início deve ser anterior à data de fim"
         )
 
-    result = report_service.get_total_by_period(db, start_date, end_date, comunidade_id)
+    result = report_service.get_total_by_period(
+        db, start_date, end_date, comunidade_id, fonte, stale_ok=stale_ok
+    )
     return result
 
 
 @router.get("/total-tipo", response_model=TotalTipoListResponse)
-async def get_total_tipo(
+def get_total_tipo(
     start_date: date = Query(..., description="Data de início do período"),
     end_date: date = Query(..., description="Data de fim do período"),
     comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    fonte: Literal["banco", "parquet"] = Query(
+        "banco", description="Fonte dos dados: banco ou extração Parquet (última extração)"
+    ),
+    stale_ok: bool = Query(False, description="Aceitar resultado em cache defasado, atualizado em segundo plano"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_active_user)
 ):
@@ -93,6 +198,8 @@ async def get_total_tipo(
         start_date: Data de início
         end_date: Data de fim
         comunidade_id: ID da comunidade para filtrar (opcional)
+        fonte: "banco" ou "parquet"
+        stale_ok: Se aceita resultado defasado (ex.: dashboard)
         db: Sessão do banco de dados
         current_user: Usuário autenticado
 
@@ -108,13 +215,327 @@ async def get_total_tipo(
             detail="Data de início deve ser anterior à data de fim"
         )
 
-    result = report_service.get_total_by_tipo(db, start_date, end_date, comunidade_id)
+    result = report_service.get_total_by_tipo(
+        db, start_date, end_date, comunidade_id, fonte, stale_ok=stale_ok
+    )
+    return result
+
+
+@router.get("/total-comunidade", response_model=TotalComunidadeListResponse)
+def get_total_comunidade(
+    start_date: date = Query(..., description="Data de início do período"),
+    end_date: date = Query(..., description="Data de fim do período"),
+    paroquia_id: Optional[int] = Query(None, description="Filtrar por ID da paróquia"),
+    fonte: Literal["banco", "parquet"] = Query(
+        "banco", description="Fonte dos dados: banco ou extração Parquet (última extração)"
+    ),
+    stale_ok: bool = Query(False, description="Aceitar resultado em cache defasado, atualizado em segundo plano"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Obtém totais de contribuições por comunidade e tipo, com subtotais e total geral.
+
+    Args:
+        start_date: Data de início
+        end_date: Data de fim
+        paroquia_id: ID da paróquia para filtrar (opcional)
+        fonte: "banco" ou "parquet"
+        stale_ok: Se aceita resultado defasado (ex.: dashboard)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Totais por comunidade × tipo, subtotais e total geral
+
+    Raises:
+        HTTPException: Se as datas forem inválidas
+    """
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Data de início deve ser anterior à data de fim"
+        )
+
+    result = report_service.get_total_by_comunidade(
+        db, start_date, end_date, paroquia_id, fonte, stale_ok=stale_ok
+    )
+    return result
+
+
+@router.get("/serie-mensal", response_model=SerieMensalListResponse)
+def get_serie_mensal(
+    start_date: date = Query(..., description="Data de início do período"),
+    end_date: date = Query(..., description="Data de fim do período"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    por_comunidade: bool = Query(False, description="Gerar uma série por comunidade"),
+    fonte: Literal["banco", "parquet"] = Query(
+        "banco", description="Fonte dos dados: banco ou extração Parquet (última extração)"
+    ),
+    stale_ok: bool = Query(False, description="Aceitar resultado em cache defasado, atualizado em segundo plano"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Obtém a série mensal de contribuições por tipo, sem lacunas.
+
+    Args:
+        start_date: Data de início
+        end_date: Data de fim
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        por_comunidade: Se True, gera uma série por comunidade e tipo
+        fonte: "banco" ou "parquet"
+        stale_ok: Se aceita resultado defasado (ex.: dashboard)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Séries mensais por tipo (e comunidade)
+
+    Raises:
+        HTTPException: Se as datas forem inválidas ou o período for longo demais
+    """
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Data de início deve ser anterior à data de fim"
+        )
+
+    meses = (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+    if meses > report_service.SERIE_MENSAL_MAX_MESES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Período deve ter no máximo {report_service.SERIE_MENSAL_MAX_MESES} meses"
+        )
+
+    result = report_service.get_serie_mensal(
+        db, start_date, end_date, comunidade_id, por_comunidade, fonte, stale_ok=stale_ok
+    )
     return result
 
 
+@router.get("/ranking", response_model=RankingListResponse)
+def get_ranking(
+    start_date: date = Query(..., description="Data de início do período"),
+    end_date: date = Query(..., description="Data de fim do período"),
+    limite: int = Query(10, ge=1, le=100, description="Quantidade de dizimistas por comunidade"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    tipo: Optional[TipoContribuicaoEnum] = Query(None, description="Filtrar por tipo"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Obtém os dizimistas que mais contribuíram no período, por comunidade.
+
+    Args:
+        start_date: Data de início
+        end_date: Data de fim
+        limite: Quantidade de dizimistas por comunidade
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        tipo: Tipo de contribuição para filtrar (opcional)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Ranking de dizimistas de cada comunidade
+
+    Raises:
+        HTTPException: Se as datas forem inválidas
+    """
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Data de início deve ser anterior à data de fim"
+        )
+
+    return report_service.get_ranking_dizimistas(db, start_date, end_date, limite, comunidade_id, tipo)
+
+
+@router.get("/comparativo", response_model=ComparativoResponse)
+def get_comparativo(
+    periodo: Literal["mes", "ano"] = Query("mes", description="Período comparado"),
+    comparacao: Literal["periodo_anterior", "ano_anterior"] = Query(
+        "periodo_anterior", description="Comparar com o período anterior ou com o mesmo período do ano anterior"
+    ),
+    data_referencia: Optional[date] = Query(None, description="Data contida no período atual (padrão: hoje)"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    por_comunidade: bool = Query(False, description="Gerar uma linha por comunidade e tipo"),
+    stale_ok: bool = Query(False, description="Aceitar resultado em cache defasado, atualizado em segundo plano"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Compara os totais do mês (ou ano) atual com o período de comparação.
+
+    Args:
+        periodo: "mes" ou "ano"
+        comparacao: "periodo_anterior" ou "ano_anterior"
+        data_referencia: Data contida no período atual (padrão: hoje)
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        por_comunidade: Se True, gera uma linha por comunidade e tipo
+        stale_ok: Se aceita resultado defasado (ex.: dashboard)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Totais das duas janelas com diferença e variação percentual
+    """
+    return report_service.get_comparativo(
+        db, periodo, comparacao, data_referencia, comunidade_id, por_comunidade, stale_ok=stale_ok
+    )
+
+
+@router.get("/distribuicao", response_model=DistribuicaoListResponse)
+def get_distribuicao(
+    start_date: date = Query(..., description="Data de início do período"),
+    end_date: date = Query(..., description="Data de fim do período"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    por_comunidade: bool = Query(False, description="Gerar uma distribuição por comunidade e tipo"),
+    faixas: int = Query(10, ge=1, le=100, description="Quantidade de faixas do histograma"),
+    stale_ok: bool = Query(False, description="Aceitar resultado em cache defasado, atualizado em segundo plano"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Obtém percentis e histograma dos valores de contribuição por tipo.
+
+    Args:
+        start_date: Data de início
+        end_date: Data de fim
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        por_comunidade: Se True, gera uma distribuição por comunidade e tipo
+        faixas: Quantidade de faixas do histograma
+        stale_ok: Se aceita resultado defasado (ex.: dashboard)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Distribuição de valores de cada grupo
+
+    Raises:
+        HTTPException: Se as datas forem inválidas
+    """
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Data de início deve ser anterior à data de fim"
+        )
+
+    return report_service.get_distribuicao_valores(
+        db, start_date, end_date, comunidade_id, por_comunidade, faixas, stale_ok=stale_ok
+    )
+
+
+@router.get("/analise", response_model=AnaliseResponse)
+def get_analise(
+    paroquia_id: int = Query(..., description="ID da paróquia"),
+    start_date: date = Query(..., description="Data de início do período"),
+    end_date: date = Query(..., description="Data de fim do período"),
+    agrupar_por: List[Literal["tipo", "comunidade", "forma_pagamento", "mes"]] = Query(
+        [], description="Campos de agrupamento (repita o parâmetro para vários)"
+    ),
+    tipo: Optional[TipoContribuicaoEnum] = Query(None, description="Filtrar por tipo"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    forma_pagamento: Optional[str] = Query(None, description="Filtrar por forma de pagamento"),
+    motor: Optional[Literal["sql", "numpy"]] = Query(
+        None, description="Força o motor de agregação (padrão: configuração do servidor)"
+    ),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Soma contribuições de uma paróquia com filtros e agrupamentos livres.
+
+    Args:
+        paroquia_id: ID da paróquia
+        start_date: Data de início
+        end_date: Data de fim
+        agrupar_por: Campos de agrupamento
+        tipo: Tipo de contribuição para filtrar (opcional)
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        forma_pagamento: Forma de pagamento para filtrar (opcional)
+        motor: Motor de agregação, "sql" ou "numpy" (opcional)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Grupos com total e quantidade
+
+    Raises:
+        HTTPException: Se as datas forem inválidas
+    """
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Data de início deve ser anterior à data de fim"
+        )
+
+    # Campos repetidos não mudam o agrupamento
+    agrupar_por = list(dict.fromkeys(agrupar_por))
+    return report_service.get_analise(
+        db, paroquia_id, start_date, end_date, agrupar_por, tipo, comunidade_id, forma_pagamento,
+        motor=motor
+    )
+
+
+@router.get("/dizimistas-sem-dizimo", response_model=DizimistaSemDizimoListResponse)
+def get_dizimistas_sem_dizimo(
+    meses: int = Query(3, ge=1, le=36, description="Quantidade de meses sem dízimo"),
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    limit: int = Query(100, ge=1, le=500, description="Quantidade máxima de dizimistas na página"),
+    cursor: Optional[int] = Query(None, description="Cursor da próxima página (proximo_cursor)"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Lista dizimistas ativos sem dízimo nos últimos meses, para acompanhamento pastoral.
+
+    Args:
+        meses: Quantidade de meses sem dízimo
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        limit: Quantidade máxima de dizimistas na página
+        cursor: Cursor da próxima página
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Página de dizimistas sem dízimo recente
+    """
+    return report_service.get_dizimistas_sem_dizimo(db, meses, comunidade_id, limit, cursor)
+
+
+@router.get("/adimplencia", response_model=AdimplenciaResponse)
+def get_adimplencia(
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    meses: int = Query(12, ge=1, le=24, description="Quantidade de meses da grade"),
+    limit: int = Query(200, ge=1, le=1000, description="Quantidade máxima de dizimistas na página"),
+    cursor: Optional[int] = Query(None, description="Cursor da próxima página (proximo_cursor)"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Obtém a grade de dízimos pagos por mês de referência de cada dizimista.
+
+    Args:
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        meses: Quantidade de meses da grade, terminando no mês atual
+        limit: Quantidade máxima de dizimistas na página
+        cursor: Cursor da próxima página
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Meses da grade e página de dizimistas com bitmap de meses pagos
+    """
+    return report_service.get_adimplencia(db, comunidade_id, meses, limit, cursor)
+
+
 @router.get("/dizimista/{dizimista_id}/historico", response_model=HistoricoContribuicaoResponse)
 async def get_dizimista_historico(
     dizimista_id: int,
+    limit: int = Query(50, ge=1, le=200, description="Quantidade máxima de contribuições na página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (proximo_cursor)"),
+    por_ano: bool = Query(False, description="Incluir subtotais por ano"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_active_user)
 ):
@@ -123,19 +544,154 @@ async def get_dizimista_historico(
 
     Args:
         dizimista_id: ID do dizimista
+        limit: Quantidade máxima de contribuições na página
+        cursor: Cursor da próxima página
+        por_ano: Se True, inclui subtotais por ano
         db: Sessão do banco de dados
         current_user: Usuário autenticado
 
     Returns:
-        Histórico de contribuições
+        Totais e página do histórico de contribuições
 
     Raises:
-        HTTPException: Se o dizimista não for encontrado
+        HTTPException: Se o cursor for inválido ou o dizimista não for encontrado
     """
-    result = report_service.get_dizimista_history(db, dizimista_id)
+    try:
+        result = report_service.get_dizimista_history(db, dizimista_id, limit, cursor, por_ano)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        ) from exc
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Dizimista não encontrado"
         )
     return result
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+def get_dashboard(
+    comunidade_id: Optional[int] = Query(None, description="Filtrar por ID da comunidade"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Obtém todos os indicadores do dashboard em uma única requisição.
+
+    Args:
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Contagens, totais do mês e aniversariantes do dia
+    """
+    return report_service.get_dashboard(db, comunidade_id)
+
+
+@router.get("/cache/metricas", response_model=CacheMetricasResponse)
+async def get_cache_metricas(
+    current_user: Usuario = Depends(require_admin)
+):
+    """
+    Obtém métricas do cache de relatórios (apenas administradores).
+
+    Args:
+        current_user: Usuário administrador autenticado
+
+    Returns:
+        Métricas do cache de relatórios
+    """
+    return report_cache.stats()
+
+
+@router.get("/exportacoes/metricas", response_model=ExportacaoMetricasResponse)
+async def get_exportacao_metricas(
+    current_user: Usuario = Depends(require_admin)
+):
+    """
+    Obtém métricas das exportações XLSX (apenas administradores).
+
+    Args:
+        current_user: Usuário administrador autenticado
+
+    Returns:
+        Quantidade de planilhas, linhas, bytes e planilhas gravadas em disco
+    """
+    return metricas_exportacao.stats()
+
+
+@router.post(
+    "/jobs",
+    response_model=RelatorioJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(idempotencia)]
+)
+async def create_report_job(
+    job_data: RelatorioJobCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Submete um relatório para execução em segundo plano.
+
+    Args:
+        job_data: Relatório e parâmetros (os mesmos do endpoint síncrono)
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Job criado; acompanhe em GET /jobs/{id}
+
+    Raises:
+        HTTPException: Se os parâmetros forem inválidos
+    """
+    return report_job_service.create_job(db, job_data, current_user)
+
+
+@router.get("/jobs/{job_id}", response_model=RelatorioJobResponse)
+async def get_report_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Obtém a situação de um job de relatório.
+
+    Args:
+        job_id: ID do job
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Situação do job
+
+    Raises:
+        HTTPException: Se o job não for encontrado
+    """
+    return report_job_service.get_job(db, job_id, current_user)
+
+
+@router.get("/jobs/{job_id}/resultado", response_model=RelatorioJobResultadoResponse)
+async def get_report_job_resultado(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_active_user)
+):
+    """
+    Obtém o resultado de um job de relatório concluído.
+
+    Args:
+        job_id: ID do job
+        db: Sessão do banco de dados
+        current_user: Usuário autenticado
+
+    Returns:
+        Resultado do relatório
+
+    Raises:
+        HTTPException: Se o job não for encontrado, tiver falhado ou não estiver concluído
+    """
+    return report_job_service.get_job_resultado(db, job_id, current_user)
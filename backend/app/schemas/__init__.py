@@ -28,19 +28,65 @@ from app.schemas.dizimista import (
     DizimistaCreate,
     DizimistaUpdate,
     DizimistaResponse,
+    DizimistaImportErroResponse,
+    DizimistaImportResponse,
 )
 from app.schemas.contribuicao import (
     ContribuicaoBase,
     ContribuicaoCreate,
     ContribuicaoUpdate,
     ContribuicaoResponse,
+    ContribuicaoBatchCreate,
+    ContribuicaoBatchErroResponse,
+    ContribuicaoBatchResponse,
 )
 from app.schemas.reports import (
     AniversarianteResponse,
     TotalPeriodoResponse,
     TotalTipoResponse,
     TotalTipoListResponse,
+    TotalComunidadeResponse,
+    TotalComunidadeListResponse,
+    SerieMensalPontoResponse,
+    SerieMensalResponse,
+    SerieMensalListResponse,
+    RankingDizimistaResponse,
+    RankingComunidadeResponse,
+    RankingListResponse,
+    DizimistaSemDizimoResponse,
+    DizimistaSemDizimoListResponse,
+    AdimplenciaDizimistaResponse,
+    AdimplenciaResponse,
+    ComparativoLinhaResponse,
+    ComparativoResponse,
+    FaixaHistogramaResponse,
+    DistribuicaoResponse,
+    DistribuicaoListResponse,
+    AnaliseGrupoResponse,
+    AnaliseResponse,
+    SubtotalAnoResponse,
     HistoricoContribuicaoResponse,
+    DashboardResponse,
+    CacheMetricasResponse,
+    ExportacaoMetricasResponse,
+)
+from app.schemas.fechamento import (
+    FechamentoCreate,
+    FechamentoTotalResponse,
+    FechamentoResponse,
+)
+from app.schemas.lote_coleta import (
+    LoteColetaCreate,
+    LoteColetaResponse,
+    LoteColetaItemCreate,
+    LoteColetaItensCreate,
+    LoteColetaItemErroResponse,
+    LoteColetaItensResponse,
+)
+from app.schemas.report_job import (
+    RelatorioJobCreate,
+    RelatorioJobResponse,
+    RelatorioJobResultadoResponse,
 )
 
 __all__ = [
@@ -65,13 +111,53 @@ __all__ = [
     "DizimistaCreate",
     "DizimistaUpdate",
     "DizimistaResponse",
+    "DizimistaImportErroResponse",
+    "DizimistaImportResponse",
     "ContribuicaoBase",
     "ContribuicaoCreate",
     "ContribuicaoUpdate",
     "ContribuicaoResponse",
+    "ContribuicaoBatchCreate",
+    "ContribuicaoBatchErroResponse",
+    "ContribuicaoBatchResponse",
     "AniversarianteResponse",
     "TotalPeriodoResponse",
     "TotalTipoResponse",
     "TotalTipoListResponse",
+    "TotalComunidadeResponse",
+    "TotalComunidadeListResponse",
+    "SerieMensalPontoResponse",
+    "SerieMensalResponse",
+    "SerieMensalListResponse",
+    "RankingDizimistaResponse",
+    "RankingComunidadeResponse",
+    "RankingListResponse",
+    "DizimistaSemDizimoResponse",
+    "DizimistaSemDizimoListResponse",
+    "AdimplenciaDizimistaResponse",
+    "AdimplenciaResponse",
+    "ComparativoLinhaResponse",
+    "ComparativoResponse",
+    "FaixaHistogramaResponse",
+    "DistribuicaoResponse",
+    "DistribuicaoListResponse",
+    "AnaliseGrupoResponse",
+    "AnaliseResponse",
+    "SubtotalAnoResponse",
     "HistoricoContribuicaoResponse",
+    "DashboardResponse",
+    "CacheMetricasResponse",
+    "ExportacaoMetricasResponse",
+    "FechamentoCreate",
+    "FechamentoTotalResponse",
+    "FechamentoResponse",
+    "LoteColetaCreate",
+    "LoteColetaResponse",
+    "LoteColetaItemCreate",
+    "LoteColetaItensCreate",
+    "LoteColetaItemErroResponse",
+    "LoteColetaItensResponse",
+    "RelatorioJobCreate",
+    "RelatorioJobResponse",
+    "RelatorioJobResultadoResponse",
 ]
@@ -3,11 +3,17 @@ Schemas para Contribuição.
 """
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Optional
+from typing import Any, List, Optional
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 from app.models.contribuicao import TipoContribuicaoEnum
 
+# Formato de mês de referência aceito em filtros (YYYY-MM)
+REFERENCIA_MES_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+# Itens aceitos por requisição de criação em lote
+MAX_ITENS_LOTE = 1000
+
 
 class ContribuicaoBase(BaseModel):
     """Schema base de Contribuição."""
@@ -75,7 +81,36 @@ class ContribuicaoUpdate(BaseModel):
 class ContribuicaoResponse(ContribuicaoBase):
     """Schema de resposta de Contribuição."""
     id: int
+    lote_id: Optional[int] = Field(None, description="ID do lote de coleta, se houver")
+    client_id: Optional[str] = Field(None, description="Id gerado no cliente ao incluir no lote")
     criado_em: datetime
     atualizado_em: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ContribuicaoBatchCreate(BaseModel):
+    """Schema para criação de Contribuições em lote."""
+    # Os itens são validados um a um pelo serviço, para que um item inválido
+    # seja devolvido como erro em vez de recusar a requisição inteira
+    itens: List[Any] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_ITENS_LOTE,
+        description="Contribuições no formato de ContribuicaoCreate"
+    )
+
+
+class ContribuicaoBatchErroResponse(BaseModel):
+    """Schema de um erro da criação em lote."""
+    indice: int = Field(..., description="Posição do item na lista (a partir de 0)")
+    campo: Optional[str] = Field(None, description="Campo com erro")
+    mensagem: str = Field(..., description="Descrição do erro")
+
+
+class ContribuicaoBatchResponse(BaseModel):
+    """Schema de resposta da criação em lote."""
+    total_itens: int = Field(..., description="Itens recebidos")
+    criados: int = Field(..., description="Contribuições criadas")
+    contribuicoes: List[ContribuicaoResponse] = Field(..., description="Contribuições criadas, na ordem dos itens")
+    erros: List[ContribuicaoBatchErroResponse] = Field(..., description="Erros por item")
@@ -44,3 +44,18 @@ class DizimistaResponse(DizimistaBase):
     atualizado_em: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DizimistaImportErroResponse(BaseModel):
+    """Schema de um erro da importação de dizimistas."""
+    linha: int = Field(..., description="Linha do CSV (o cabeçalho é a linha 1)")
+    campo: Optional[str] = Field(None, description="Campo com erro")
+    mensagem: str = Field(..., description="Descrição do erro")
+
+
+class DizimistaImportResponse(BaseModel):
+    """Schema de resposta da importação de dizimistas."""
+    total_linhas: int = Field(..., description="Linhas de dados lidas do CSV")
+    importados: int = Field(..., description="Dizimistas cadastrados")
+    total_erros: int = Field(..., description="Quantidade de erros encontrados")
+    erros: list[DizimistaImportErroResponse] = Field(..., description="Erros por linha (limitados aos primeiros)")
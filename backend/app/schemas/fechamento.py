@@ -0,0 +1,58 @@
+"""
+Schemas para Fechamento Mensal.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, computed_field, field_validator
+
+from app.models.contribuicao import TipoContribuicaoEnum
+from app.schemas.contribuicao import REFERENCIA_MES_PATTERN
+
+
+class FechamentoCreate(BaseModel):
+    """Schema para fechamento de um mês de uma comunidade."""
+    comunidade_id: int = Field(..., description="ID da comunidade")
+    mes: str = Field(..., pattern=REFERENCIA_MES_PATTERN, description="Mês a fechar (YYYY-MM)")
+
+
+class FechamentoTotalResponse(BaseModel):
+    """Schema de resposta de um total congelado do fechamento."""
+    tipo: TipoContribuicaoEnum
+    forma_pagamento: Optional[str] = None
+    total: Decimal
+    quantidade: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FechamentoResponse(BaseModel):
+    """Schema de resposta de Fechamento Mensal."""
+    id: int
+    comunidade_id: int
+    mes: str = Field(..., description="Mês fechado (YYYY-MM)")
+    usuario_id: Optional[int] = None
+    fechado_em: datetime
+    totais: list[FechamentoTotalResponse] = Field(..., description="Totais por tipo e forma de pagamento")
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("mes", mode="before")
+    @classmethod
+    def format_mes(cls, v):
+        """Converte a chave YYYYMM no formato YYYY-MM."""
+        if isinstance(v, int):
+            return f"{v // 100:04d}-{v % 100:02d}"
+        return v
+
+    @computed_field
+    @property
+    def total(self) -> Decimal:
+        """Total do mês."""
+        return sum((t.total for t in self.totais), Decimal("0.00"))
+
+    @computed_field
+    @property
+    def quantidade(self) -> int:
+        """Quantidade de contribuições do mês."""
+        return sum(t.quantidade for t in self.totais)
@@ -0,0 +1,72 @@
+"""
+Schemas para Lote de Coleta.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+from app.schemas.contribuicao import ContribuicaoCreate
+
+# Itens aceitos por requisição de inclusão no lote
+MAX_ITENS_COLETA = 5000
+
+
+class LoteColetaCreate(BaseModel):
+    """Schema para abertura de Lote de Coleta."""
+    comunidade_id: int = Field(..., description="ID da comunidade")
+    data_coleta: date = Field(..., description="Data da celebração")
+    descricao: Optional[str] = Field(None, max_length=255, description="Descrição (ex: Missa das 10h)")
+
+
+class LoteColetaResponse(BaseModel):
+    """Schema de resposta de Lote de Coleta."""
+    id: int
+    comunidade_id: int
+    data_coleta: date
+    descricao: Optional[str] = None
+    usuario_id: Optional[int] = None
+    total: Decimal = Field(..., description="Soma das contribuições do lote")
+    quantidade: int = Field(..., description="Quantidade de contribuições do lote")
+    criado_em: datetime
+    encerrado_em: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LoteColetaItemCreate(ContribuicaoCreate):
+    """
+    Schema de um item do lote de coleta.
+
+    A comunidade é sempre a do lote e a data, se omitida, é a da coleta.
+    """
+    client_id: str = Field(..., min_length=1, max_length=64, description="Id gerado no cliente, único no lote")
+
+
+class LoteColetaItensCreate(BaseModel):
+    """Schema para inclusão de itens no lote de coleta."""
+    # Os itens são validados um a um pelo serviço, para que um item inválido
+    # seja devolvido como erro em vez de recusar a requisição inteira
+    itens: List[Any] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_ITENS_COLETA,
+        description="Itens no formato de LoteColetaItemCreate"
+    )
+
+
+class LoteColetaItemErroResponse(BaseModel):
+    """Schema de um erro da inclusão de itens no lote."""
+    indice: int = Field(..., description="Posição do item na lista (a partir de 0)")
+    client_id: Optional[str] = Field(None, description="Id do item no cliente, se informado")
+    campo: Optional[str] = Field(None, description="Campo com erro")
+    mensagem: str = Field(..., description="Descrição do erro")
+
+
+class LoteColetaItensResponse(BaseModel):
+    """Schema de resposta da inclusão de itens no lote."""
+    recebidos: int = Field(..., description="Itens recebidos")
+    criados: int = Field(..., description="Contribuições criadas")
+    duplicados: int = Field(..., description="Itens ignorados por já estarem no lote")
+    erros: List[LoteColetaItemErroResponse] = Field(..., description="Erros por item")
+    lote: LoteColetaResponse = Field(..., description="Lote com os totais atualizados")
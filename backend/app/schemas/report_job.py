@@ -0,0 +1,107 @@
+"""
+Schemas para Jobs de Relatórios.
+"""
+from datetime import datetime, date
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+
+from app.models.contribuicao import TipoContribuicaoEnum
+from app.models.relatorio_job import EtapaJobEnum, StatusJobEnum
+
+
+class PeriodoJobParams(BaseModel):
+    """Parâmetros de relatórios por período."""
+    start_date: date = Field(..., description="Data de início do período")
+    end_date: date = Field(..., description="Data de fim do período")
+
+    @model_validator(mode="after")
+    def validate_periodo(self):
+        """Valida que a data de início não é posterior à data de fim."""
+        if self.start_date > self.end_date:
+            raise ValueError("Data de início deve ser anterior à data de fim")
+        return self
+
+
+class TotalJobParams(PeriodoJobParams):
+    """Parâmetros dos relatórios total-periodo e total-tipo."""
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade para filtrar")
+    fonte: Literal["banco", "parquet"] = Field("banco", description="Fonte dos dados")
+
+
+class TotalComunidadeJobParams(PeriodoJobParams):
+    """Parâmetros do relatório total-comunidade."""
+    paroquia_id: Optional[int] = Field(None, description="ID da paróquia para filtrar")
+    fonte: Literal["banco", "parquet"] = Field("banco", description="Fonte dos dados")
+
+
+class SerieMensalJobParams(PeriodoJobParams):
+    """Parâmetros do relatório serie-mensal."""
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade para filtrar")
+    por_comunidade: bool = Field(False, description="Gerar uma série por comunidade")
+    fonte: Literal["banco", "parquet"] = Field("banco", description="Fonte dos dados")
+
+
+class RankingJobParams(PeriodoJobParams):
+    """Parâmetros do relatório ranking."""
+    limite: int = Field(10, ge=1, le=100, description="Quantidade de dizimistas por comunidade")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade para filtrar")
+    tipo: Optional[TipoContribuicaoEnum] = Field(None, description="Tipo de contribuição para filtrar")
+
+
+class ComparativoJobParams(BaseModel):
+    """Parâmetros do relatório comparativo."""
+    periodo: Literal["mes", "ano"] = Field("mes", description="Período comparado")
+    comparacao: Literal["periodo_anterior", "ano_anterior"] = Field("periodo_anterior", description="Janela de comparação")
+    data_referencia: Optional[date] = Field(None, description="Data contida no período atual")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade para filtrar")
+    por_comunidade: bool = Field(False, description="Gerar uma linha por comunidade e tipo")
+
+
+class DistribuicaoJobParams(PeriodoJobParams):
+    """Parâmetros do relatório distribuicao."""
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade para filtrar")
+    por_comunidade: bool = Field(False, description="Gerar uma distribuição por comunidade e tipo")
+    faixas: int = Field(10, ge=1, le=100, description="Quantidade de faixas do histograma")
+
+
+TipoJobRelatorio = Literal[
+    "total-periodo",
+    "total-tipo",
+    "total-comunidade",
+    "serie-mensal",
+    "ranking",
+    "comparativo",
+    "distribuicao",
+]
+
+
+class RelatorioJobCreate(BaseModel):
+    """Schema para submissão de um job de relatório."""
+    tipo: TipoJobRelatorio = Field(..., description="Relatório a executar")
+    parametros: dict[str, Any] = Field(default_factory=dict, description="Parâmetros do relatório")
+
+
+class RelatorioJobResponse(BaseModel):
+    """Schema de resposta com a situação de um job de relatório."""
+    id: str
+    tipo: str
+    parametros: dict[str, Any]
+    status: StatusJobEnum
+    etapa: EtapaJobEnum = Field(..., description="Etapa da execução (FILA, CONSULTA, GRAVACAO, FINALIZADO)")
+    erro: Optional[str] = None
+    criado_em: datetime
+    iniciado_em: Optional[datetime] = None
+    concluido_em: Optional[datetime] = None
+    expira_em: Optional[datetime] = Field(None, description="Quando o job e seu resultado serão descartados")
+    atualizado_em: datetime = Field(..., description="Último batimento do processo que executa o job")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RelatorioJobResultadoResponse(BaseModel):
+    """Schema de resposta com o resultado de um job concluído."""
+    id: str
+    tipo: str
+    resultado: Any = Field(..., description="Resultado no mesmo formato do endpoint síncrono")
+
+    model_config = ConfigDict(from_attributes=True)
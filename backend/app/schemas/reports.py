@@ -7,6 +7,7 @@ from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 from app.models.contribuicao import TipoContribuicaoEnum
+from app.schemas.contribuicao import ContribuicaoResponse
 
 
 class AniversarianteResponse(BaseModel):
@@ -46,12 +47,230 @@ class TotalTipoListResponse(BaseModel):
     totais: list[TotalTipoResponse] = Field(..., description="Lista de totais por tipo")
 
 
+class TotalComunidadeResponse(BaseModel):
+    """Schema de resposta para os totais de uma comunidade."""
+    comunidade_id: int = Field(..., description="ID da comunidade")
+    comunidade_nome: str = Field(..., description="Nome da comunidade")
+    total: Decimal = Field(..., description="Total da comunidade no período")
+    quantidade: int = Field(..., description="Quantidade de contribuições da comunidade")
+    totais: list[TotalTipoResponse] = Field(..., description="Totais da comunidade por tipo")
+
+
+class TotalComunidadeListResponse(BaseModel):
+    """Schema de resposta para totais por comunidade, com subtotais e total geral."""
+    data_inicio: date = Field(..., description="Data de início do período")
+    data_fim: date = Field(..., description="Data de fim do período")
+    paroquia_id: Optional[int] = Field(None, description="ID da paróquia filtrada (se aplicável)")
+    total: Decimal = Field(..., description="Total geral no período")
+    quantidade: int = Field(..., description="Quantidade total de contribuições")
+    totais: list[TotalTipoResponse] = Field(..., description="Subtotais por tipo")
+    comunidades: list[TotalComunidadeResponse] = Field(..., description="Totais por comunidade")
+
+
+class SerieMensalPontoResponse(BaseModel):
+    """Schema de resposta para um ponto (mês) da série mensal."""
+    mes: str = Field(..., description="Mês de referência (YYYY-MM)")
+    total: Decimal = Field(..., description="Total de contribuições no mês")
+    quantidade: int = Field(..., description="Quantidade de contribuições no mês")
+
+
+class SerieMensalResponse(BaseModel):
+    """Schema de resposta para a série mensal de um tipo (e comunidade)."""
+    tipo: TipoContribuicaoEnum = Field(..., description="Tipo da contribuição")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade da série (se aplicável)")
+    pontos: list[SerieMensalPontoResponse] = Field(..., description="Pontos mensais, sem lacunas")
+
+
+class SerieMensalListResponse(BaseModel):
+    """Schema de resposta para as séries mensais de contribuições."""
+    data_inicio: date = Field(..., description="Data de início do período")
+    data_fim: date = Field(..., description="Data de fim do período")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade filtrada (se aplicável)")
+    series: list[SerieMensalResponse] = Field(..., description="Séries mensais por tipo")
+
+
+class RankingDizimistaResponse(BaseModel):
+    """Schema de resposta para uma posição do ranking de dizimistas."""
+    posicao: int = Field(..., description="Posição do dizimista na comunidade")
+    dizimista_id: int = Field(..., description="ID do dizimista")
+    dizimista_nome: str = Field(..., description="Nome do dizimista")
+    total: Decimal = Field(..., description="Total contribuído no período")
+    quantidade: int = Field(..., description="Quantidade de contribuições no período")
+
+
+class RankingComunidadeResponse(BaseModel):
+    """Schema de resposta para o ranking de uma comunidade."""
+    comunidade_id: int = Field(..., description="ID da comunidade")
+    comunidade_nome: str = Field(..., description="Nome da comunidade")
+    dizimistas: list[RankingDizimistaResponse] = Field(..., description="Dizimistas em ordem de total")
+
+
+class RankingListResponse(BaseModel):
+    """Schema de resposta para o ranking de dizimistas por comunidade."""
+    data_inicio: date = Field(..., description="Data de início do período")
+    data_fim: date = Field(..., description="Data de fim do período")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade filtrada (se aplicável)")
+    tipo: Optional[TipoContribuicaoEnum] = Field(None, description="Tipo filtrado (se aplicável)")
+    limite: int = Field(..., description="Quantidade de dizimistas por comunidade")
+    comunidades: list[RankingComunidadeResponse] = Field(..., description="Ranking de cada comunidade")
+
+
+class DizimistaSemDizimoResponse(BaseModel):
+    """Schema de resposta para um dizimista sem dízimo recente."""
+    id: int
+    nome: str
+    telefone: Optional[str] = None
+    email: Optional[str] = None
+    comunidade_id: int
+    comunidade_nome: str
+    ultimo_dizimo: Optional[date] = Field(None, description="Data do último dízimo (None se nunca contribuiu)")
+
+
+class DizimistaSemDizimoListResponse(BaseModel):
+    """Schema de resposta para a lista de dizimistas sem dízimo recente."""
+    meses: int = Field(..., description="Quantidade de meses sem dízimo")
+    desde: date = Field(..., description="Data de corte: nenhum dízimo a partir desta data")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade filtrada (se aplicável)")
+    dizimistas: list[DizimistaSemDizimoResponse] = Field(..., description="Página de dizimistas")
+    proximo_cursor: Optional[int] = Field(None, description="Cursor da próxima página (None se for a última)")
+
+
+class AdimplenciaDizimistaResponse(BaseModel):
+    """Schema de resposta para a linha de um dizimista na grade de adimplência."""
+    id: int
+    nome: str
+    bitmap: int = Field(..., description="Bit i ligado se o dízimo de meses[i] foi pago")
+    meses_pagos: int = Field(..., description="Quantidade de meses pagos na grade")
+
+
+class AdimplenciaResponse(BaseModel):
+    """Schema de resposta para a grade dizimista × mês de referência."""
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade filtrada (se aplicável)")
+    meses: list[str] = Field(..., description="Meses de referência da grade (YYYY-MM), do mais antigo ao atual")
+    dizimistas: list[AdimplenciaDizimistaResponse] = Field(..., description="Página de dizimistas")
+    proximo_cursor: Optional[int] = Field(None, description="Cursor da próxima página (None se for a última)")
+
+
+class ComparativoLinhaResponse(BaseModel):
+    """Schema de resposta para uma linha do comparativo entre períodos."""
+    tipo: Optional[TipoContribuicaoEnum] = Field(None, description="Tipo da contribuição (None na linha consolidada)")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade (quando agrupado por comunidade)")
+    total_atual: Decimal = Field(..., description="Total no período atual")
+    total_anterior: Decimal = Field(..., description="Total no período de comparação")
+    quantidade_atual: int = Field(..., description="Quantidade de contribuições no período atual")
+    quantidade_anterior: int = Field(..., description="Quantidade de contribuições no período de comparação")
+    diferenca: Decimal = Field(..., description="Total atual menos total anterior")
+    variacao_percentual: Optional[Decimal] = Field(None, description="Variação em % (None se o total anterior for zero)")
+
+
+class ComparativoResponse(BaseModel):
+    """Schema de resposta para o comparativo entre períodos."""
+    periodo: str = Field(..., description="Período comparado ('mes' ou 'ano')")
+    comparacao: str = Field(..., description="Janela de comparação ('periodo_anterior' ou 'ano_anterior')")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade filtrada (se aplicável)")
+    atual_inicio: date = Field(..., description="Início do período atual")
+    atual_fim: date = Field(..., description="Fim do período atual")
+    anterior_inicio: date = Field(..., description="Início do período de comparação")
+    anterior_fim: date = Field(..., description="Fim do período de comparação")
+    itens: list[ComparativoLinhaResponse] = Field(..., description="Linhas por tipo (e comunidade)")
+    consolidado: ComparativoLinhaResponse = Field(..., description="Linha com a soma de todos os itens")
+
+
+class FaixaHistogramaResponse(BaseModel):
+    """Schema de resposta para uma faixa do histograma de valores."""
+    inicio: Decimal = Field(..., description="Valor inicial da faixa")
+    fim: Decimal = Field(..., description="Valor final da faixa")
+    quantidade: int = Field(..., description="Quantidade de contribuições na faixa")
+
+
+class DistribuicaoResponse(BaseModel):
+    """Schema de resposta para a distribuição de valores de um grupo."""
+    tipo: TipoContribuicaoEnum = Field(..., description="Tipo da contribuição")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade (quando agrupado por comunidade)")
+    quantidade: int = Field(..., description="Quantidade de contribuições")
+    minimo: Decimal = Field(..., description="Menor valor")
+    maximo: Decimal = Field(..., description="Maior valor")
+    media: Decimal = Field(..., description="Valor médio")
+    p25: Decimal = Field(..., description="Percentil 25")
+    p50: Decimal = Field(..., description="Mediana")
+    p90: Decimal = Field(..., description="Percentil 90")
+    histograma: list[FaixaHistogramaResponse] = Field(..., description="Faixas de mesma largura entre mínimo e máximo")
+
+
+class DistribuicaoListResponse(BaseModel):
+    """Schema de resposta para a distribuição de valores de contribuição."""
+    data_inicio: date = Field(..., description="Data de início do período")
+    data_fim: date = Field(..., description="Data de fim do período")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade filtrada (se aplicável)")
+    faixas: int = Field(..., description="Quantidade de faixas dos histogramas")
+    distribuicoes: list[DistribuicaoResponse] = Field(..., description="Distribuição por tipo (e comunidade)")
+
+
+class AnaliseGrupoResponse(BaseModel):
+    """Schema de resposta para um grupo da análise livre."""
+    tipo: Optional[TipoContribuicaoEnum] = Field(None, description="Tipo (se agrupado por tipo)")
+    comunidade_id: Optional[int] = Field(None, description="ID da comunidade (se agrupado por comunidade)")
+    forma_pagamento: Optional[str] = Field(None, description="Forma de pagamento (se agrupado por forma)")
+    mes: Optional[str] = Field(None, description="Mês YYYY-MM (se agrupado por mês)")
+    total: Decimal = Field(..., description="Total do grupo")
+    quantidade: int = Field(..., description="Quantidade de contribuições do grupo")
+
+
+class AnaliseResponse(BaseModel):
+    """Schema de resposta para a análise livre de contribuições."""
+    paroquia_id: int = Field(..., description="ID da paróquia")
+    data_inicio: date = Field(..., description="Data de início do período")
+    data_fim: date = Field(..., description="Data de fim do período")
+    agrupar_por: list[str] = Field(..., description="Campos de agrupamento")
+    motor: str = Field(..., description="Motor usado ('sql' ou 'numpy')")
+    grupos: list[AnaliseGrupoResponse] = Field(..., description="Grupos com total e quantidade")
+
+
+class SubtotalAnoResponse(BaseModel):
+    """Schema de resposta para o subtotal anual do histórico de um dizimista."""
+    ano: int = Field(..., description="Ano das contribuições")
+    total: Decimal = Field(..., description="Total contribuído no ano")
+    quantidade: int = Field(..., description="Quantidade de contribuições no ano")
+
+
 class HistoricoContribuicaoResponse(BaseModel):
     """Schema de resposta para histórico de contribuições de um dizimista."""
     dizimista_id: int
     dizimista_nome: str
     total_geral: Decimal
     quantidade_total: int
-    contribuicoes: list = Field(..., description="Lista de contribuições do dizimista")
+    contribuicoes: list[ContribuicaoResponse] = Field(..., description="Página de contribuições do dizimista, da mais recente para a mais antiga")
+    proximo_cursor: Optional[str] = Field(None, description="Cursor da próxima página (None se for a última)")
+    subtotais_ano: Optional[list[SubtotalAnoResponse]] = Field(None, description="Subtotais por ano (se solicitado)")
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DashboardResponse(BaseModel):
+    """Schema de resposta para os indicadores do dashboard."""
+    dizimistas_ativos: int = Field(..., description="Quantidade de dizimistas ativos")
+    total_contribuicoes: int = Field(..., description="Quantidade de contribuições registradas")
+    total_mes: TotalPeriodoResponse = Field(..., description="Total de contribuições do mês atual")
+    totais_tipo_mes: TotalTipoListResponse = Field(..., description="Totais por tipo do mês atual")
+    aniversariantes_hoje: list[AniversarianteResponse] = Field(..., description="Aniversariantes do dia")
+
+
+class ExportacaoMetricasResponse(BaseModel):
+    """Schema de resposta para as métricas das exportações XLSX."""
+    exportacoes: int = Field(..., description="Planilhas geradas")
+    linhas: int = Field(..., description="Linhas exportadas")
+    bytes: int = Field(..., description="Bytes gerados")
+    maior_arquivo_bytes: int = Field(..., description="Tamanho da maior planilha gerada")
+    em_disco: int = Field(..., description="Planilhas que passaram da memória para disco")
+
+
+class CacheMetricasResponse(BaseModel):
+    """Schema de resposta para as métricas do cache de relatórios."""
+    entradas: int = Field(..., description="Resultados guardados no cache")
+    acertos: int = Field(..., description="Requisições atendidas pelo cache")
+    acertos_defasados: int = Field(..., description="Requisições atendidas com resultado defasado")
+    falhas: int = Field(..., description="Requisições não encontradas no cache")
+    calculos: int = Field(..., description="Relatórios efetivamente calculados")
+    atualizacoes_segundo_plano: int = Field(..., description="Recálculos disparados em segundo plano")
+    agrupadas: int = Field(..., description="Requisições que aguardaram um cálculo idêntico em andamento")
+    em_andamento: int = Field(..., description="Cálculos em andamento")
@@ -0,0 +1,347 @@
+"""
+Motor de Análise em Memória.
+Responde agregações ad hoc de contribuições com arrays colunares NumPy.
+
+As contribuições de cada paróquia são carregadas uma vez em colunas
+compactas (ids int32, valores em centavos int64, dias como ordinal int32 e
+códigos de categoria para tipo e forma de pagamento). A cada consulta,
+apenas as contribuições com id maior que o último carregado são
+acrescentadas. Criações que fazem commit com id abaixo do último carregado,
+alterações e remoções feitas pelo contribuicao_service invalidam as
+colunas; as feitas por fora (outros processos, scripts) são absorvidas pela
+recarga completa após o TTL.
+
+Filtros e agrupamentos são feitos de forma vetorizada, sem consultar o
+banco além da sincronização incremental.
+"""
+import copy
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.comunidade import Comunidade
+from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
+
+# Códigos de tipo nas colunas (posição no enum)
+TIPOS = list(TipoContribuicaoEnum)
+
+# Campos de agrupamento aceitos e a coluna correspondente
+CAMPOS_AGRUPAMENTO = {
+    "tipo": "tipo",
+    "comunidade": "comunidade_id",
+    "forma_pagamento": "forma",
+    "mes": "mes",
+}
+
+# Linhas lidas do cursor por lote ao carregar as colunas
+LOTE_CARGA = 10000
+
+# Colunas NumPy de _ColunasParoquia
+COLUNAS = ("id", "comunidade_id", "tipo", "forma", "dia", "mes", "centavos")
+
+
+class _ColunasParoquia:
+    """
+    Contribuições de uma paróquia em colunas NumPy.
+
+    Depois de publicado no motor, um objeto não é mais alterado: novas
+    contribuições são acrescentadas a uma cópia, que substitui o original.
+    Consultas em andamento continuam usando as colunas que já tinham.
+    """
+
+    def __init__(self):
+        self.id = np.empty(0, dtype=np.int32)
+        self.comunidade_id = np.empty(0, dtype=np.int32)
+        self.tipo = np.empty(0, dtype=np.int8)
+        self.forma = np.empty(0, dtype=np.int16)
+        self.dia = np.empty(0, dtype=np.int32)
+        self.mes = np.empty(0, dtype=np.int32)
+        self.centavos = np.empty(0, dtype=np.int64)
+        self.formas: list = []
+        self.forma_codigo: dict = {}
+        self.max_id = 0
+        self.carregado_em = time.monotonic()
+
+    def _codigo_forma(self, forma: Optional[str]) -> int:
+        """Obtém (ou cria) o código de uma forma de pagamento."""
+        codigo = self.forma_codigo.get(forma)
+        if codigo is None:
+            codigo = len(self.formas)
+            self.formas.append(forma)
+            self.forma_codigo[forma] = codigo
+        return codigo
+
+    def _converter(self, linhas: list) -> dict:
+        """
+        Converte um lote de contribuições em arrays das colunas.
+
+        Args:
+            linhas: Tuplas (id, comunidade_id, tipo, forma_pagamento,
+                data_contribuicao, valor), em ordem de id
+        """
+        quantidade = len(linhas)
+        datas = [linha[4] for linha in linhas]
+        return {
+            "id": np.fromiter((linha[0] for linha in linhas), dtype=np.int32, count=quantidade),
+            "comunidade_id": np.fromiter((linha[1] for linha in linhas), dtype=np.int32, count=quantidade),
+            "tipo": np.fromiter((TIPOS.index(linha[2]) for linha in linhas), dtype=np.int8, count=quantidade),
+            "forma": np.fromiter((self._codigo_forma(linha[3]) for linha in linhas), dtype=np.int16, count=quantidade),
+            "dia": np.fromiter((d.toordinal() for d in datas), dtype=np.int32, count=quantidade),
+            "mes": np.fromiter((d.year * 100 + d.month for d in datas), dtype=np.int32, count=quantidade),
+            "centavos": np.fromiter((int(round(linha[5] * 100)) for linha in linhas), dtype=np.int64, count=quantidade),
+        }
+
+    def acrescentar(self, lotes: list) -> None:
+        """
+        Acrescenta contribuições às colunas, com uma única concatenação.
+
+        Só deve ser chamado em objetos ainda não publicados no motor.
+
+        Args:
+            lotes: Listas de tuplas (id, comunidade_id, tipo,
+                forma_pagamento, data_contribuicao, valor), em ordem de id
+        """
+        partes = [self._converter(linhas) for linhas in lotes if linhas]
+        if not partes:
+            return
+        for nome in COLUNAS:
+            setattr(self, nome, np.concatenate([getattr(self, nome)] + [parte[nome] for parte in partes]))
+        self.max_id = int(self.id[-1])
+
+    def sucessor(self) -> "_ColunasParoquia":
+        """Cópia que pode receber novas contribuições sem alterar esta."""
+        colunas = copy.copy(self)
+        colunas.formas = list(self.formas)
+        colunas.forma_codigo = dict(self.forma_codigo)
+        return colunas
+
+    def nbytes(self) -> int:
+        """Memória ocupada pelas colunas, em bytes."""
+        return sum(getattr(self, nome).nbytes for nome in COLUNAS)
+
+
+class AnalyticsEngine:
+    """Cache colunar de contribuições por paróquia com agregação vetorizada."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        # Protege apenas os dicionários; nunca é mantido durante consultas ao banco
+        self._lock = threading.Lock()
+        self._paroquias: dict = {}
+        self._geracoes: dict = {}
+        self._geracao_global = 0
+
+    def invalidar(self, paroquia_id: Optional[int] = None) -> None:
+        """
+        Descarta as colunas carregadas; a próxima consulta recarrega.
+
+        Args:
+            paroquia_id: Paróquia a descartar (padrão: todas)
+        """
+        with self._lock:
+            if paroquia_id is None:
+                self._paroquias.clear()
+                self._geracao_global += 1
+            else:
+                self._paroquias.pop(paroquia_id, None)
+                self._geracoes[paroquia_id] = self._geracoes.get(paroquia_id, 0) + 1
+
+    def registrar_criacao(self, db: Session, comunidade_ids: Iterable[int], menor_id: int) -> None:
+        """
+        Avisa o motor de contribuições criadas (após o commit).
+
+        A sincronização incremental só busca ids maiores que o último
+        carregado. Uma transação que recebeu um id menor mas fez commit
+        depois que ids maiores já foram carregados ficaria de fora; nesse
+        caso as colunas da paróquia são descartadas.
+
+        Args:
+            db: Sessão do banco de dados
+            comunidade_ids: Comunidades das contribuições criadas
+            menor_id: Menor id entre as contribuições criadas
+        """
+        with self._lock:
+            if not self._paroquias:
+                return
+        paroquias = {
+            paroquia_id for (paroquia_id,) in
+            db.query(Comunidade.paroquia_id).filter(Comunidade.id.in_(set(comunidade_ids)))
+        }
+        with self._lock:
+            for paroquia_id in paroquias:
+                colunas = self._paroquias.get(paroquia_id)
+                if colunas is not None and menor_id <= colunas.max_id:
+                    self._paroquias.pop(paroquia_id)
+                    self._geracoes[paroquia_id] = self._geracoes.get(paroquia_id, 0) + 1
+
+    def _sincronizar(self, db: Session, paroquia_id: int) -> _ColunasParoquia:
+        """
+        Carrega ou atualiza as colunas de uma paróquia.
+
+        A leitura do banco é feita fora do lock, numa cópia das colunas; o
+        lock é tomado só para trocar a cópia pela versão publicada. Se a
+        paróquia foi invalidada durante a leitura, a cópia serve apenas a
+        esta consulta e não é publicada.
+
+        Args:
+            db: Sessão do banco de dados
+            paroquia_id: ID da paróquia
+
+        Returns:
+            Colunas atualizadas (não devem ser alteradas)
+        """
+        with self._lock:
+            atual = self._paroquias.get(paroquia_id)
+            if atual is not None and time.monotonic() - atual.carregado_em >= self.ttl_seconds:
+                atual = None
+            geracao = (self._geracao_global, self._geracoes.get(paroquia_id, 0))
+
+        query = db.query(
+            Contribuicao.id,
+            Contribuicao.comunidade_id,
+            Contribuicao.tipo,
+            Contribuicao.forma_pagamento,
+            Contribuicao.data_contribuicao,
+            Contribuicao.valor
+        ).join(Comunidade).filter(
+            Comunidade.paroquia_id == paroquia_id,
+            Contribuicao.id > (atual.max_id if atual is not None else 0)
+        ).order_by(Contribuicao.id).yield_per(LOTE_CARGA)
+
+        lotes = []
+        lote = []
+        for linha in query:
+            lote.append(linha)
+            if len(lote) == LOTE_CARGA:
+                lotes.append(lote)
+                lote = []
+        lotes.append(lote)
+        if atual is not None and not any(lotes):
+            return atual
+
+        nova = atual.sucessor() if atual is not None else _ColunasParoquia()
+        nova.acrescentar(lotes)
+
+        with self._lock:
+            if geracao != (self._geracao_global, self._geracoes.get(paroquia_id, 0)):
+                return nova
+            publicada = self._paroquias.get(paroquia_id)
+            # Outra consulta pode ter publicado uma versão mais nova enquanto
+            # esta lia o banco; as duas são prefixos da mesma sequência de ids
+            if publicada is atual or publicada is None or publicada.max_id < nova.max_id:
+                self._paroquias[paroquia_id] = nova
+                return nova
+            return publicada
+
+    def analisar(
+        self,
+        db: Session,
+        paroquia_id: int,
+        start_date: date,
+        end_date: date,
+        agrupar_por: Sequence[str] = (),
+        tipo: Optional[TipoContribuicaoEnum] = None,
+        comunidade_id: Optional[int] = None,
+        forma_pagamento: Optional[str] = None
+    ) -> list:
+        """
+        Soma contribuições filtradas, agrupadas pelos campos pedidos.
+
+        Args:
+            db: Sessão do banco de dados (usada só na sincronização)
+            paroquia_id: ID da paróquia
+            start_date: Data de início
+            end_date: Data de fim
+            agrupar_por: Campos de agrupamento (tipo, comunidade,
+                forma_pagamento, mes)
+            tipo: Tipo de contribuição para filtrar (opcional)
+            comunidade_id: ID da comunidade para filtrar (opcional)
+            forma_pagamento: Forma de pagamento para filtrar (opcional)
+
+        Returns:
+            Lista de grupos com os campos pedidos, total e quantidade
+        """
+        colunas = self._sincronizar(db, paroquia_id)
+
+        filtro = (colunas.dia >= start_date.toordinal()) & (colunas.dia <= end_date.toordinal())
+        if tipo is not None:
+            filtro &= colunas.tipo == TIPOS.index(tipo)
+        if comunidade_id is not None:
+            filtro &= colunas.comunidade_id == comunidade_id
+        if forma_pagamento is not None:
+            filtro &= colunas.forma == colunas.forma_codigo.get(forma_pagamento, -1)
+
+        centavos = colunas.centavos[filtro]
+        if not agrupar_por:
+            if not len(centavos):
+                return []
+            return [_grupo(colunas, {}, int(centavos.sum()), len(centavos))]
+
+        # Cada campo vira um código denso e os códigos são combinados numa
+        # única chave int64, agrupada com np.unique 1D e somada com bincount
+        valores_campos = []
+        codigos = []
+        for campo in agrupar_por:
+            valores, codigo = np.unique(
+                getattr(colunas, CAMPOS_AGRUPAMENTO[campo])[filtro], return_inverse=True
+            )
+            valores_campos.append(valores)
+            codigos.append(codigo.ravel())
+        formato = tuple(len(valores) for valores in valores_campos)
+        chaves, posicoes = np.unique(
+            np.ravel_multi_index(codigos, formato), return_inverse=True
+        )
+        posicoes = posicoes.ravel()
+        totais = np.bincount(posicoes, weights=centavos, minlength=len(chaves))
+        quantidades = np.bincount(posicoes, minlength=len(chaves))
+        grupos = zip(*(
+            valores[codigo]
+            for valores, codigo in zip(valores_campos, np.unravel_index(chaves, formato), strict=True)
+        ), strict=True)
+
+        return [
+            _grupo(
+                colunas,
+                dict(zip(agrupar_por, (int(v) for v in grupo), strict=True)),
+                int(round(total)),
+                int(quantidade)
+            )
+            for grupo, total, quantidade in zip(grupos, totais, quantidades, strict=True)
+        ]
+
+    def stats(self) -> dict:
+        """
+        Obtém métricas do motor.
+
+        Returns:
+            Dicionário com paróquias carregadas, linhas e memória ocupada
+        """
+        with self._lock:
+            return {
+                "paroquias": len(self._paroquias),
+                "linhas": sum(len(c.id) for c in self._paroquias.values()),
+                "bytes": sum(c.nbytes() for c in self._paroquias.values()),
+            }
+
+
+def _grupo(colunas: _ColunasParoquia, valores: dict, centavos: int, quantidade: int) -> dict:
+    """Decodifica os códigos de um grupo no formato da resposta."""
+    mes = valores.get("mes")
+    return {
+        "tipo": TIPOS[valores["tipo"]] if "tipo" in valores else None,
+        "comunidade_id": valores.get("comunidade"),
+        "forma_pagamento": colunas.formas[valores["forma_pagamento"]] if "forma_pagamento" in valores else None,
+        "mes": f"{mes // 100:04d}-{mes % 100:02d}" if mes is not None else None,
+        "total": (Decimal(centavos) / 100).quantize(Decimal("0.01")),
+        "quantidade": quantidade,
+    }
+
+
+# Instância global do motor de análise
+analytics_engine = AnalyticsEngine(ttl_seconds=settings.ANALYTICS_ENGINE_TTL_SECONDS)
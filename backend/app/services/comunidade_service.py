@@ -9,6 +9,8 @@ from fastapi import HTTPException, status
 from app.models.comunidade import Comunidade
 from app.models.dizimista import Dizimista
 from app.schemas.comunidade import ComunidadeCreate, ComunidadeUpdate
+from app.services.report_cache import aniversariantes_cache, report_cache
+from app.services.analytics_engine import analytics_engine
 
 
 def get_comunidade(db: Session, comunidade_id: int) -> Optional[Comunidade]:
@@ -82,6 +84,15 @@ def update_comunidade(db: Session, comunidade_id: int, comunidade_data: Comunida
 
     db.commit()
     db.refresh(db_comunidade)
+    # Nome e paróquia aparecem nos relatórios (comunidade_nome, filtros por
+    # paróquia) e o nome também na lista de aniversariantes
+    if update_data:
+        report_cache.bump_version(comunidade_id)
+    if "nome" in update_data:
+        aniversariantes_cache.bump_version(comunidade_id)
+    # O motor de análise guarda as contribuições por paróquia
+    if "paroquia_id" in update_data:
+        analytics_engine.invalidar()
     return db_comunidade
 
 
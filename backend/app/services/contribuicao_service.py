@@ -2,12 +2,24 @@
 Serviço de Contribuição.
 Lógica de negócio para operações CRUD de contribuições.
 """
+import csv
+import io
 from datetime import date
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-
-from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
-from app.schemas.contribuicao import ContribuicaoCreate, ContribuicaoUpdate
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import Query, Session
+
+from app.models.comunidade import Comunidade
+from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum, referencia_para_num
+from app.models.dizimista import Dizimista
+from app.models.fechamento import FechamentoMensal
+from app.models.lote_coleta import LoteColeta
+from app.schemas.contribuicao import ContribuicaoCreate, ContribuicaoResponse, ContribuicaoUpdate
+from app.services.report_cache import report_cache
+from app.services.analytics_engine import analytics_engine
+from app.services.fechamento_service import bloquear_comunidades, verificar_mes_aberto
 
 
 def get_contribuicao(db: Session, contribuicao_id: int) -> Optional[Contribuicao]:
@@ -33,6 +45,8 @@ def get_contribuicoes(
     tipo: Optional[TipoContribuicaoEnum] = None,
     data_inicio: Optional[date] = None,
     data_fim: Optional[date] = None,
+    referencia_inicio: Optional[str] = None,
+    referencia_fim: Optional[str] = None,
 ) -> Tuple[List[Contribuicao], int]:
     """
     Obtém contribuições com paginação e filtros.
@@ -46,13 +60,43 @@ def get_contribuicoes(
         tipo: Tipo de contribuição para filtrar
         data_inicio: Data de início do período
         data_fim: Data de fim do período
+        referencia_inicio: Mês de referência inicial (YYYY-MM)
+        referencia_fim: Mês de referência final (YYYY-MM)
 
     Returns:
         Tupla com (lista de contribuições, total de registros)
     """
-    query = db.query(Contribuicao)
+    query = _filtrar_contribuicoes(
+        db.query(Contribuicao), dizimista_id, comunidade_id, tipo,
+        data_inicio, data_fim, referencia_inicio, referencia_fim
+    )
+
+    # Contar total
+    total = query.count()
+
+    # Aplicar paginação
+    offset = (page - 1) * page_size
+    contribuicoes = (
+        query.order_by(Contribuicao.data_contribuicao.desc())
+        .offset(offset)
+        .limit(page_size)
+        .all()
+    )
 
-    # Aplicar filtros
+    return contribuicoes, total
+
+
+def _filtrar_contribuicoes(
+    query: Query,
+    dizimista_id: Optional[int] = None,
+    comunidade_id: Optional[int] = None,
+    tipo: Optional[TipoContribuicaoEnum] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    referencia_inicio: Optional[str] = None,
+    referencia_fim: Optional[str] = None,
+) -> Query:
+    """Aplica os filtros da listagem de contribuições a uma consulta."""
     if dizimista_id is not None:
         query = query.filter(Contribuicao.dizimista_id == dizimista_id)
 
@@ -68,19 +112,123 @@ def get_contribuicoes(
     if data_fim is not None:
         query = query.filter(Contribuicao.data_contribuicao <= data_fim)
 
-    # Contar total
-    total = query.count()
+    if referencia_inicio is not None:
+        query = query.filter(Contribuicao.referencia_mes_num >= referencia_para_num(referencia_inicio))
 
-    # Aplicar paginação
-    offset = (page - 1) * page_size
-    contribuicoes = (
-        query.order_by(Contribuicao.data_contribuicao.desc())
-        .offset(offset)
-        .limit(page_size)
-        .all()
-    )
+    if referencia_fim is not None:
+        query = query.filter(Contribuicao.referencia_mes_num <= referencia_para_num(referencia_fim))
 
-    return contribuicoes, total
+    return query
+
+
+# Colunas das exportações de contribuições (CSV e XLSX), na ordem do arquivo
+COLUNAS_EXPORTACAO = [
+    "id", "data_contribuicao", "tipo", "valor", "comunidade_id", "comunidade",
+    "dizimista_id", "dizimista", "forma_pagamento", "referencia_mes", "observacoes",
+]
+
+# Linhas lidas do cursor do servidor e enviadas por bloco
+LOTE_CSV = 1000
+
+
+def linhas_exportacao(
+    db: Session,
+    dizimista_id: Optional[int] = None,
+    comunidade_id: Optional[int] = None,
+    tipo: Optional[TipoContribuicaoEnum] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    referencia_inicio: Optional[str] = None,
+    referencia_fim: Optional[str] = None,
+) -> Iterator[tuple]:
+    """
+    Lê as contribuições filtradas com um cursor do servidor (``yield_per``).
+
+    Args:
+        db: Sessão do banco de dados
+        dizimista_id: ID do dizimista para filtrar
+        comunidade_id: ID da comunidade para filtrar
+        tipo: Tipo de contribuição para filtrar
+        data_inicio: Data de início do período
+        data_fim: Data de fim do período
+        referencia_inicio: Mês de referência inicial (YYYY-MM)
+        referencia_fim: Mês de referência final (YYYY-MM)
+
+    Yields:
+        Linhas com as colunas de COLUNAS_EXPORTACAO, da data mais recente
+        para a mais antiga
+    """
+    query = _filtrar_contribuicoes(
+        db.query(
+            Contribuicao.id,
+            Contribuicao.data_contribuicao,
+            Contribuicao.tipo,
+            Contribuicao.valor,
+            Contribuicao.comunidade_id,
+            Comunidade.nome.label("comunidade"),
+            Contribuicao.dizimista_id,
+            Dizimista.nome.label("dizimista"),
+            Contribuicao.forma_pagamento,
+            Contribuicao.referencia_mes,
+            Contribuicao.observacoes
+        ).join(Comunidade, Comunidade.id == Contribuicao.comunidade_id)
+        .outerjoin(Dizimista, Dizimista.id == Contribuicao.dizimista_id),
+        dizimista_id, comunidade_id, tipo, data_inicio, data_fim, referencia_inicio, referencia_fim
+    ).order_by(Contribuicao.data_contribuicao.desc(), Contribuicao.id.desc()).yield_per(LOTE_CSV)
+
+    for r in query:
+        yield (
+            r.id, r.data_contribuicao, r.tipo.value, r.valor, r.comunidade_id, r.comunidade,
+            r.dizimista_id, r.dizimista, r.forma_pagamento, r.referencia_mes, r.observacoes,
+        )
+
+
+def exportar_csv(
+    bind,
+    dizimista_id: Optional[int] = None,
+    comunidade_id: Optional[int] = None,
+    tipo: Optional[TipoContribuicaoEnum] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    referencia_inicio: Optional[str] = None,
+    referencia_fim: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Gera o CSV de contribuições em blocos, com memória constante.
+
+    As linhas são lidas com um cursor do servidor (``yield_per``) numa
+    sessão própria, aberta e fechada pelo gerador: a sessão da requisição
+    já pode ter sido fechada enquanto a resposta é transmitida.
+
+    Args:
+        bind: Engine/conexão do banco usada pela requisição
+        dizimista_id: ID do dizimista para filtrar
+        comunidade_id: ID da comunidade para filtrar
+        tipo: Tipo de contribuição para filtrar
+        data_inicio: Data de início do período
+        data_fim: Data de fim do período
+        referencia_inicio: Mês de referência inicial (YYYY-MM)
+        referencia_fim: Mês de referência final (YYYY-MM)
+
+    Yields:
+        Blocos de texto CSV, começando pelo cabeçalho
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUNAS_EXPORTACAO)
+
+    with Session(bind=bind) as db:
+        linhas = linhas_exportacao(
+            db, dizimista_id, comunidade_id, tipo, data_inicio, data_fim, referencia_inicio, referencia_fim
+        )
+        for numero, linha in enumerate(linhas, start=1):
+            writer.writerow(linha)
+            if numero % LOTE_CSV == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+    yield buffer.getvalue()
 
 
 def create_contribuicao(db: Session, contribuicao_data: ContribuicaoCreate) -> Contribuicao:
@@ -93,14 +241,180 @@ def create_contribuicao(db: Session, contribuicao_data: ContribuicaoCreate) -> C
 
     Returns:
         Contribuição criada
+
+    Raises:
+        HTTPException: Se o mês da contribuição estiver fechado
     """
+    verificar_mes_aberto(db, contribuicao_data.comunidade_id, contribuicao_data.data_contribuicao)
+
     db_contribuicao = Contribuicao(**contribuicao_data.model_dump())
     db.add(db_contribuicao)
     db.commit()
     db.refresh(db_contribuicao)
+    report_cache.bump_version(db_contribuicao.comunidade_id)
+    analytics_engine.registrar_criacao(db, [db_contribuicao.comunidade_id], db_contribuicao.id)
     return db_contribuicao
 
 
+_validador_itens = TypeAdapter(List[ContribuicaoCreate])
+
+
+def validar_itens(itens: list, validador: TypeAdapter = _validador_itens) -> tuple[list, list]:
+    """
+    Valida itens contra o schema de criação, separando os inválidos.
+
+    Args:
+        itens: Itens recebidos na requisição
+        validador: TypeAdapter da lista de itens (padrão: ContribuicaoCreate)
+
+    Returns:
+        Tupla com (lista de (posição, contribuição) válidos, lista de
+        (posição, campo, mensagem) dos erros)
+    """
+    erros = []
+    posicoes = list(range(len(itens)))
+    while posicoes:
+        try:
+            validos = validador.validate_python([itens[i] for i in posicoes])
+        except ValidationError as exc:
+            # Os erros apontam a posição dentro da lista validada; os itens
+            # restantes são validados de novo sem os inválidos
+            invalidas = set()
+            for erro in exc.errors(include_url=False, include_context=False):
+                posicao = posicoes[erro["loc"][0]]
+                campo = ".".join(str(parte) for parte in erro["loc"][1:]) or None
+                erros.append((posicao, campo, erro["msg"]))
+                invalidas.add(posicao)
+            posicoes = [i for i in posicoes if i not in invalidas]
+        else:
+            return list(zip(posicoes, validos, strict=True)), erros
+    return [], erros
+
+
+def conferir_itens(db: Session, validos: list, erros: list) -> list:
+    """
+    Confere comunidades, dizimistas e meses fechados de itens já validados.
+
+    Cada conferência é uma única consulta para todos os itens. Os itens
+    recusados são acrescentados a ``erros``.
+
+    Args:
+        db: Sessão do banco de dados
+        validos: Lista de (posição, contribuição) devolvida por validar_itens
+        erros: Lista de (posição, campo, mensagem) a completar
+
+    Returns:
+        Lista de (posição, contribuição, valores da linha em contribuicoes)
+        dos itens aceitos
+    """
+    comunidades_ids = {c.comunidade_id for _, c in validos}
+    dizimistas_ids = {c.dizimista_id for _, c in validos if c.dizimista_id is not None}
+    meses = {(c.comunidade_id, c.data_contribuicao.year * 100 + c.data_contribuicao.month) for _, c in validos}
+
+    # O bloqueio das comunidades serializa estas escritas com o fechamento
+    # do mês (ver fechamento_service)
+    comunidades = bloquear_comunidades(db, comunidades_ids) if comunidades_ids else set()
+    dizimistas = {
+        id_dizimista for (id_dizimista,) in
+        db.query(Dizimista.id).filter(Dizimista.id.in_(dizimistas_ids))
+    } if dizimistas_ids else set()
+    fechados = set(
+        db.query(FechamentoMensal.comunidade_id, FechamentoMensal.mes).filter(
+            tuple_(FechamentoMensal.comunidade_id, FechamentoMensal.mes).in_(meses)
+        ).all()
+    ) if meses else set()
+
+    aceitos = []
+    for posicao, contribuicao in validos:
+        data = contribuicao.data_contribuicao
+        if contribuicao.comunidade_id not in comunidades:
+            erros.append((posicao, "comunidade_id", "Comunidade não encontrada"))
+        elif contribuicao.dizimista_id is not None and contribuicao.dizimista_id not in dizimistas:
+            erros.append((posicao, "dizimista_id", "Dizimista não encontrado"))
+        elif (contribuicao.comunidade_id, data.year * 100 + data.month) in fechados:
+            erros.append((
+                posicao, "data_contribuicao",
+                f"O mês {data.year:04d}-{data.month:02d} está fechado para esta comunidade"
+            ))
+        else:
+            valores = contribuicao.model_dump(include=set(ContribuicaoCreate.model_fields))
+            # O @validates do modelo não roda em INSERT em massa
+            referencia = valores["referencia_mes"]
+            valores["referencia_mes_num"] = referencia_para_num(referencia) if referencia else None
+            aceitos.append((posicao, contribuicao, valores))
+    return aceitos
+
+
+def create_contribuicoes_lote(db: Session, itens: list) -> dict:
+    """
+    Cria várias contribuições numa única transação.
+
+    Cada item é validado como em create_contribuicao; comunidades,
+    dizimistas e meses fechados são conferidos com uma consulta por lote.
+    Os itens válidos são gravados num único INSERT de várias linhas com
+    RETURNING e os inválidos são devolvidos como erros, sem impedir os demais.
+
+    Args:
+        db: Sessão do banco de dados
+        itens: Itens no formato de ContribuicaoCreate
+
+    Returns:
+        Dicionário com total de itens, quantidade criada, contribuições
+        criadas (na ordem dos itens) e erros por item
+    """
+    validos, erros = validar_itens(itens)
+    linhas = [valores for _, _, valores in conferir_itens(db, validos, erros)]
+
+    criadas = []
+    if linhas:
+        # As linhas devolvidas pelo RETURNING são lidas antes do commit, que
+        # expira os objetos e custaria um SELECT por contribuição
+        criadas = [
+            ContribuicaoResponse.model_validate(contribuicao)
+            for contribuicao in db.scalars(
+                insert(Contribuicao).returning(Contribuicao, sort_by_parameter_order=True),
+                linhas
+            )
+        ]
+        db.commit()
+        comunidades = {valores["comunidade_id"] for valores in linhas}
+        report_cache.bump_version(*comunidades)
+        analytics_engine.registrar_criacao(db, comunidades, min(c.id for c in criadas))
+
+    erros.sort(key=lambda erro: erro[0])
+    return {
+        "total_itens": len(itens),
+        "criados": len(criadas),
+        "contribuicoes": criadas,
+        "erros": [
+            {"indice": posicao, "campo": campo, "mensagem": mensagem}
+            for posicao, campo, mensagem in erros
+        ],
+    }
+
+
+def ajustar_totais_lote(db: Session, lote_id: int, total: Decimal, quantidade: int) -> None:
+    """
+    Soma deltas aos totais de um lote de coleta, sem fazer commit.
+
+    O UPDATE é feito sobre os próprios valores da linha (total = total + x),
+    de modo que inclusões concorrentes no mesmo lote não se sobrescrevem.
+
+    Args:
+        db: Sessão do banco de dados
+        lote_id: ID do lote
+        total: Valor a somar ao total
+        quantidade: Quantidade a somar
+    """
+    db.query(LoteColeta).filter(LoteColeta.id == lote_id).update(
+        {
+            LoteColeta.total: LoteColeta.total + total,
+            LoteColeta.quantidade: LoteColeta.quantidade + quantidade,
+        },
+        synchronize_session=False
+    )
+
+
 def update_contribuicao(
     db: Session,
     contribuicao_id: int,
@@ -116,17 +430,31 @@ def update_contribuicao(
 
     Returns:
         Contribuição atualizada ou None se não encontrada
+
+    Raises:
+        HTTPException: Se o mês atual ou o novo mês da contribuição estiver fechado
     """
     db_contribuicao = get_contribuicao(db, contribuicao_id)
     if not db_contribuicao:
         return None
 
+    comunidade_anterior = db_contribuicao.comunidade_id
     update_data = contribuicao_data.model_dump(exclude_unset=True)
+    verificar_mes_aberto(db, comunidade_anterior, db_contribuicao.data_contribuicao)
+    verificar_mes_aberto(
+        db,
+        update_data.get("comunidade_id") or comunidade_anterior,
+        update_data.get("data_contribuicao") or db_contribuicao.data_contribuicao
+    )
+    if db_contribuicao.lote_id is not None and update_data.get("valor") is not None:
+        ajustar_totais_lote(db, db_contribuicao.lote_id, update_data["valor"] - db_contribuicao.valor, 0)
     for key, value in update_data.items():
         setattr(db_contribuicao, key, value)
 
     db.commit()
     db.refresh(db_contribuicao)
+    report_cache.bump_version(comunidade_anterior, db_contribuicao.comunidade_id)
+    analytics_engine.invalidar()
     return db_contribuicao
 
 
@@ -140,11 +468,21 @@ def delete_contribuicao(db: Session, contribuicao_id: int) -> bool:
 
     Returns:
         True se deletada, False se não encontrada
+
+    Raises:
+        HTTPException: Se o mês da contribuição estiver fechado
     """
     db_contribuicao = get_contribuicao(db, contribuicao_id)
     if not db_contribuicao:
         return False
 
+    verificar_mes_aberto(db, db_contribuicao.comunidade_id, db_contribuicao.data_contribuicao)
+
+    comunidade_id = db_contribuicao.comunidade_id
+    if db_contribuicao.lote_id is not None:
+        ajustar_totais_lote(db, db_contribuicao.lote_id, -db_contribuicao.valor, -1)
     db.delete(db_contribuicao)
     db.commit()
+    report_cache.bump_version(comunidade_id)
+    analytics_engine.invalidar()
     return True
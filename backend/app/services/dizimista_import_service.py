@@ -0,0 +1,222 @@
+"""
+Serviço de Importação de Dizimistas.
+Importação em massa de dizimistas a partir de um CSV.
+
+O arquivo é lido em fluxo e processado em lotes: cada lote é validado de
+uma vez contra as regras de DizimistaCreate (um TypeAdapter de lista), as
+comunidades são conferidas contra o conjunto carregado no início e os CPFs
+contra o banco com uma única consulta IN por lote (além dos repetidos no
+próprio arquivo). No PostgreSQL as linhas válidas vão por COPY para uma
+tabela temporária e entram em dizimistas num único INSERT ... SELECT com
+ON CONFLICT (cpf) DO NOTHING; CPFs cadastrados por outra transação durante a
+importação aparecem como erro da linha. Em outros bancos, cada lote é
+inserido com um INSERT em massa.
+
+Tudo é gravado numa única transação; linhas inválidas não impedem a
+importação das demais e são devolvidas no relatório de erros.
+"""
+import codecs
+import csv
+import io
+from typing import BinaryIO, List
+
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.models.comunidade import Comunidade
+from app.models.dizimista import Dizimista
+from app.schemas.dizimista import DizimistaCreate
+from app.services.contribuicao_service import validar_itens
+from app.services.report_cache import aniversariantes_cache, report_cache
+
+# Linhas do CSV validadas e gravadas por lote
+LOTE_IMPORTACAO = 5000
+
+# Erros devolvidos no relatório (o total é sempre informado)
+MAX_ERROS_RELATORIO = 1000
+
+# Colunas obrigatórias no cabeçalho do CSV
+COLUNAS_OBRIGATORIAS = {"nome", "comunidade_id"}
+
+# Colunas gravadas em dizimistas, na ordem da tabela temporária
+COLUNAS_DIZIMISTA = [
+    "comunidade_id", "nome", "cpf", "telefone", "email", "data_nascimento",
+    "aniversario_mmdd", "endereco", "ativo", "observacoes",
+]
+
+_validador_lote = TypeAdapter(List[DizimistaCreate])
+
+
+def _linha_dizimista(dizimista: DizimistaCreate) -> dict:
+    """Valores gravados em dizimistas, com a chave de aniversário derivada."""
+    valores = dizimista.model_dump()
+    nascimento = valores["data_nascimento"]
+    valores["aniversario_mmdd"] = nascimento.month * 100 + nascimento.day if nascimento else None
+    return valores
+
+
+def _copiar_para_temporaria(db: Session, linhas: list) -> None:
+    """Envia um lote à tabela temporária com COPY (PostgreSQL)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for numero_linha, valores in linhas:
+        writer.writerow([numero_linha] + [valores[coluna] for coluna in COLUNAS_DIZIMISTA])
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY dizimistas_importacao (linha, {', '.join(COLUNAS_DIZIMISTA)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def importar_csv(db: Session, arquivo: BinaryIO) -> dict:
+    """
+    Importa dizimistas de um CSV com cabeçalho.
+
+    Colunas aceitas: as de DizimistaCreate (nome e comunidade_id são
+    obrigatórias); colunas desconhecidas são ignoradas e células vazias
+    são tratadas como ausentes.
+
+    Args:
+        db: Sessão do banco de dados
+        arquivo: Arquivo CSV em UTF-8 (com ou sem BOM)
+
+    Returns:
+        Dicionário com total de linhas, importados, total de erros e os
+        erros por linha (limitados a MAX_ERROS_RELATORIO)
+
+    Raises:
+        HTTPException: Se o arquivo não for um CSV UTF-8 com as colunas obrigatórias
+    """
+    texto = codecs.getreader("utf-8-sig")(arquivo)
+    reader = csv.DictReader(texto)
+    try:
+        cabecalho = set(reader.fieldnames or [])
+    except UnicodeDecodeError:
+        cabecalho = None
+    if cabecalho is None or not COLUNAS_OBRIGATORIAS <= cabecalho:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"O CSV deve estar em UTF-8 e ter as colunas: {', '.join(sorted(COLUNAS_OBRIGATORIAS))}"
+        )
+
+    postgresql = db.get_bind().dialect.name == "postgresql"
+    if postgresql:
+        db.execute(text(
+            "CREATE TEMP TABLE dizimistas_importacao ("
+            "linha integer NOT NULL, comunidade_id integer NOT NULL, nome varchar(255) NOT NULL, "
+            "cpf varchar(14), telefone varchar(20), email varchar(255), data_nascimento date, "
+            "aniversario_mmdd smallint, endereco text, ativo boolean NOT NULL, observacoes text"
+            ") ON COMMIT DROP"
+        ))
+
+    comunidades = {id_comunidade for (id_comunidade,) in db.query(Comunidade.id)}
+    cpfs_arquivo = {}
+    erros = []
+    total_erros = 0
+    total_linhas = 0
+    importados = 0
+    comunidades_importadas = set()
+    comunidades_aniversariantes = set()
+
+    def registrar_erro(numero_linha: int, campo, mensagem: str) -> None:
+        nonlocal total_erros
+        total_erros += 1
+        if len(erros) < MAX_ERROS_RELATORIO:
+            erros.append({"linha": numero_linha, "campo": campo, "mensagem": mensagem})
+
+    def processar(lote: list) -> None:
+        nonlocal importados
+        validos, erros_lote = validar_itens([linha for _, linha in lote], _validador_lote)
+        for posicao, campo, mensagem in sorted(erros_lote, key=lambda erro: erro[0]):
+            registrar_erro(lote[posicao][0], campo, mensagem)
+
+        cpfs_lote = {dizimista.cpf for _, dizimista in validos if dizimista.cpf}
+        cpfs_cadastrados = {
+            cpf for (cpf,) in db.query(Dizimista.cpf).filter(Dizimista.cpf.in_(cpfs_lote))
+        } if cpfs_lote else set()
+
+        aceitos = []
+        for posicao, dizimista in validos:
+            numero_linha = lote[posicao][0]
+            if dizimista.comunidade_id not in comunidades:
+                registrar_erro(numero_linha, "comunidade_id", "Comunidade não encontrada")
+            elif dizimista.cpf and dizimista.cpf in cpfs_arquivo:
+                registrar_erro(numero_linha, "cpf", f"CPF repetido no arquivo (linha {cpfs_arquivo[dizimista.cpf]})")
+            elif dizimista.cpf and dizimista.cpf in cpfs_cadastrados:
+                registrar_erro(numero_linha, "cpf", "CPF já cadastrado no sistema")
+            else:
+                if dizimista.cpf:
+                    cpfs_arquivo[dizimista.cpf] = numero_linha
+                aceitos.append((numero_linha, _linha_dizimista(dizimista)))
+
+        if not aceitos:
+            return
+        if postgresql:
+            _copiar_para_temporaria(db, aceitos)
+        else:
+            db.execute(insert(Dizimista), [valores for _, valores in aceitos])
+            importados += len(aceitos)
+        comunidades_importadas.update(valores["comunidade_id"] for _, valores in aceitos)
+        comunidades_aniversariantes.update(
+            valores["comunidade_id"] for _, valores in aceitos if valores["data_nascimento"]
+        )
+
+    lote = []
+    try:
+        for linha in reader:
+            total_linhas += 1
+            lote.append((reader.line_num, {
+                campo: valor.strip() or None
+                for campo, valor in linha.items()
+                if campo is not None and isinstance(valor, str)
+            }))
+            if len(lote) == LOTE_IMPORTACAO:
+                processar(lote)
+                lote = []
+        processar(lote)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV inválido perto da linha {reader.line_num}: {exc}"
+        ) from exc
+
+    if postgresql:
+        colunas = ", ".join(COLUNAS_DIZIMISTA)
+        inseridos = {
+            linha for (linha,) in db.execute(text(
+                f"WITH inseridos AS ("
+                f"  INSERT INTO dizimistas ({colunas}) "
+                f"  SELECT {colunas} FROM dizimistas_importacao ORDER BY linha "
+                f"  ON CONFLICT (cpf) DO NOTHING RETURNING cpf"
+                f") SELECT i.linha FROM dizimistas_importacao i "
+                f"WHERE i.cpf IS NULL OR i.cpf IN (SELECT cpf FROM inseridos)"
+            ))
+        }
+        importados = len(inseridos)
+        for (numero_linha,) in db.execute(text(
+            "SELECT linha FROM dizimistas_importacao ORDER BY linha"
+        )):
+            if numero_linha not in inseridos:
+                registrar_erro(numero_linha, "cpf", "CPF já cadastrado no sistema")
+
+    db.commit()
+    if comunidades_importadas:
+        report_cache.bump_version(*comunidades_importadas)
+    if comunidades_aniversariantes:
+        aniversariantes_cache.bump_version(*comunidades_aniversariantes)
+
+    erros.sort(key=lambda erro: erro["linha"])
+    return {
+        "total_linhas": total_linhas,
+        "importados": importados,
+        "total_erros": total_erros,
+        "erros": erros,
+    }
@@ -2,12 +2,17 @@
 Serviço de Dizimista.
 Lógica de negócio para operações CRUD de dizimistas.
 """
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Query, Session
 from sqlalchemy import or_
 
+from app.models.comunidade import Comunidade
 from app.models.dizimista import Dizimista
 from app.schemas.dizimista import DizimistaCreate, DizimistaUpdate
+from app.services.report_cache import aniversariantes_cache, report_cache
+
+# Campos exibidos na lista de aniversariantes; alterá-los invalida a lista diária
+CAMPOS_ANIVERSARIANTES = {"nome", "data_nascimento", "telefone", "email", "ativo", "comunidade_id"}
 
 
 def get_dizimista(db: Session, dizimista_id: int) -> Optional[Dizimista]:
@@ -46,9 +51,25 @@ def get_dizimistas(
     Returns:
         Tupla com (lista de dizimistas, total de registros)
     """
-    query = db.query(Dizimista)
+    query = _filtrar_dizimistas(db.query(Dizimista), search, comunidade_id, ativo)
+
+    # Contar total
+    total = query.count()
+
+    # Aplicar paginação
+    offset = (page - 1) * page_size
+    dizimistas = query.order_by(Dizimista.nome).offset(offset).limit(page_size).all()
+
+    return dizimistas, total
+
 
-    # Aplicar filtros
+def _filtrar_dizimistas(
+    query: Query,
+    search: Optional[str] = None,
+    comunidade_id: Optional[int] = None,
+    ativo: Optional[bool] = None,
+) -> Query:
+    """Aplica os filtros da listagem de dizimistas a uma consulta."""
     if search:
         search_term = f"%{search}%"
         query = query.filter(
@@ -65,14 +86,56 @@ def get_dizimistas(
     if ativo is not None:
         query = query.filter(Dizimista.ativo == ativo)
 
-    # Contar total
-    total = query.count()
+    return query
 
-    # Aplicar paginação
-    offset = (page - 1) * page_size
-    dizimistas = query.order_by(Dizimista.nome).offset(offset).limit(page_size).all()
 
-    return dizimistas, total
+# Colunas da exportação de dizimistas, na ordem do arquivo
+COLUNAS_EXPORTACAO = [
+    "id", "nome", "cpf", "telefone", "email", "data_nascimento", "endereco",
+    "comunidade_id", "comunidade", "ativo", "observacoes",
+]
+
+# Linhas lidas por vez do cursor do servidor na exportação
+LOTE_EXPORTACAO = 1000
+
+
+def linhas_exportacao(
+    db: Session,
+    search: Optional[str] = None,
+    comunidade_id: Optional[int] = None,
+    ativo: Optional[bool] = None,
+) -> Iterator[tuple]:
+    """
+    Lê os dizimistas filtrados com um cursor do servidor (``yield_per``).
+
+    Args:
+        db: Sessão do banco de dados
+        search: Termo de busca (nome, telefone, email)
+        comunidade_id: ID da comunidade para filtrar
+        ativo: Status ativo para filtrar
+
+    Yields:
+        Linhas com as colunas de COLUNAS_EXPORTACAO, em ordem de nome
+    """
+    query = _filtrar_dizimistas(
+        db.query(
+            Dizimista.id,
+            Dizimista.nome,
+            Dizimista.cpf,
+            Dizimista.telefone,
+            Dizimista.email,
+            Dizimista.data_nascimento,
+            Dizimista.endereco,
+            Dizimista.comunidade_id,
+            Comunidade.nome.label("comunidade"),
+            Dizimista.ativo,
+            Dizimista.observacoes
+        ).join(Comunidade, Comunidade.id == Dizimista.comunidade_id),
+        search, comunidade_id, ativo
+    ).order_by(Dizimista.nome, Dizimista.id).yield_per(LOTE_EXPORTACAO)
+
+    for r in query:
+        yield tuple(r)
 
 
 def create_dizimista(db: Session, dizimista_data: DizimistaCreate) -> Dizimista:
@@ -90,6 +153,10 @@ def create_dizimista(db: Session, dizimista_data: DizimistaCreate) -> Dizimista:
     db.add(db_dizimista)
     db.commit()
     db.refresh(db_dizimista)
+    # Dizimistas ativos entram nos relatórios de adimplência e sem dízimo
+    report_cache.bump_version(db_dizimista.comunidade_id)
+    if db_dizimista.data_nascimento is not None:
+        aniversariantes_cache.bump_version(db_dizimista.comunidade_id)
     return db_dizimista
 
 
@@ -109,12 +176,20 @@ def update_dizimista(db: Session, dizimista_id: int, dizimista_data: DizimistaUp
     if not db_dizimista:
         return None
 
+    comunidade_anterior = db_dizimista.comunidade_id
     update_data = dizimista_data.model_dump(exclude_unset=True)
+    alterados = {key for key, value in update_data.items() if getattr(db_dizimista, key) != value}
     for key, value in update_data.items():
         setattr(db_dizimista, key, value)
 
     db.commit()
     db.refresh(db_dizimista)
+    # Nome, situação e comunidade do dizimista aparecem nos relatórios
+    # (ranking, histórico, adimplência, sem dízimo)
+    if alterados:
+        report_cache.bump_version(comunidade_anterior, db_dizimista.comunidade_id)
+    if alterados & CAMPOS_ANIVERSARIANTES:
+        aniversariantes_cache.bump_version(comunidade_anterior, db_dizimista.comunidade_id)
     return db_dizimista
 
 
@@ -135,4 +210,6 @@ def delete_dizimista(db: Session, dizimista_id: int) -> bool:
 
     db_dizimista.ativo = False
     db.commit()
+    report_cache.bump_version(db_dizimista.comunidade_id)
+    aniversariantes_cache.bump_version(db_dizimista.comunidade_id)
     return True
@@ -0,0 +1,227 @@
+"""
+Serviço de Fechamento Mensal.
+Lógica de negócio para fechar e reabrir meses de uma comunidade.
+
+Ao fechar um mês, os totais da comunidade por tipo e forma de pagamento são
+congelados em fechamento_totais. A partir daí o contribuicao_service recusa
+escritas naquele mês e os relatórios leem o mês a partir desses totais.
+
+Fechamento e escritas são serializados pela linha da comunidade: o
+fechamento a bloqueia com FOR UPDATE antes de somar o mês, e cada escrita a
+bloqueia com FOR SHARE (bloquear_comunidades) antes de conferir se o mês
+está aberto, mantendo o bloqueio até o commit. Uma escrita concorrente ou
+entra antes e aparece nos totais congelados, ou espera o fechamento e é
+recusada.
+"""
+import calendar
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from fastapi import HTTPException, status
+
+from app.models.comunidade import Comunidade
+from app.models.contribuicao import Contribuicao, referencia_para_num
+from app.models.fechamento import FechamentoMensal, FechamentoTotal
+from app.models.usuario import Usuario
+from app.schemas.fechamento import FechamentoCreate
+from app.services.report_cache import report_cache
+
+
+def _intervalo_mes(mes: int) -> tuple[date, date]:
+    """Primeiro e último dia de um mês YYYYMM."""
+    ano, numero = divmod(mes, 100)
+    return date(ano, numero, 1), date(ano, numero, calendar.monthrange(ano, numero)[1])
+
+
+def get_fechamento(db: Session, fechamento_id: int) -> Optional[FechamentoMensal]:
+    """
+    Obtém um fechamento por ID.
+
+    Args:
+        db: Sessão do banco de dados
+        fechamento_id: ID do fechamento
+
+    Returns:
+        Fechamento encontrado ou None
+    """
+    return db.query(FechamentoMensal).options(
+        selectinload(FechamentoMensal.totais)
+    ).filter(FechamentoMensal.id == fechamento_id).first()
+
+
+def get_fechamentos(db: Session, comunidade_id: Optional[int] = None) -> List[FechamentoMensal]:
+    """
+    Obtém fechamentos, do mês mais recente ao mais antigo.
+
+    Args:
+        db: Sessão do banco de dados
+        comunidade_id: ID da comunidade para filtrar (opcional)
+
+    Returns:
+        Lista de fechamentos com seus totais
+    """
+    query = db.query(FechamentoMensal).options(selectinload(FechamentoMensal.totais))
+    if comunidade_id is not None:
+        query = query.filter(FechamentoMensal.comunidade_id == comunidade_id)
+    return query.order_by(FechamentoMensal.mes.desc(), FechamentoMensal.comunidade_id).all()
+
+
+def bloquear_comunidades(db: Session, comunidade_ids, exclusivo: bool = False) -> set:
+    """
+    Bloqueia as linhas das comunidades até o fim da transação.
+
+    No SQLite (testes) o FOR UPDATE/FOR SHARE é omitido; as transações de
+    escrita já são serializadas pelo próprio banco.
+
+    Args:
+        db: Sessão do banco de dados
+        comunidade_ids: IDs das comunidades
+        exclusivo: FOR UPDATE (fechamento) em vez de FOR SHARE (escritas)
+
+    Returns:
+        IDs das comunidades existentes
+    """
+    return {
+        id_comunidade for (id_comunidade,) in
+        db.query(Comunidade.id).filter(
+            Comunidade.id.in_(set(comunidade_ids))
+        ).order_by(Comunidade.id).with_for_update(read=not exclusivo)
+    }
+
+
+def mes_fechado(db: Session, comunidade_id: int, data: date) -> bool:
+    """
+    Verifica se o mês de uma data está fechado para a comunidade.
+
+    Args:
+        db: Sessão do banco de dados
+        comunidade_id: ID da comunidade
+        data: Data da contribuição
+
+    Returns:
+        True se o mês estiver fechado
+    """
+    return db.query(FechamentoMensal.id).filter(
+        FechamentoMensal.comunidade_id == comunidade_id,
+        FechamentoMensal.mes == data.year * 100 + data.month
+    ).first() is not None
+
+
+def verificar_mes_aberto(db: Session, comunidade_id: int, data: date) -> None:
+    """
+    Garante que o mês de uma data não está fechado para a comunidade.
+
+    Bloqueia a comunidade (FOR SHARE) até o commit, para que um fechamento
+    concorrente do mesmo mês espere esta escrita.
+
+    Args:
+        db: Sessão do banco de dados
+        comunidade_id: ID da comunidade
+        data: Data da contribuição
+
+    Raises:
+        HTTPException: Se o mês estiver fechado
+    """
+    bloquear_comunidades(db, [comunidade_id])
+    if mes_fechado(db, comunidade_id, data):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"O mês {data.year:04d}-{data.month:02d} está fechado para esta comunidade"
+        )
+
+
+def fechar_mes(db: Session, fechamento_data: FechamentoCreate, usuario: Usuario) -> FechamentoMensal:
+    """
+    Fecha um mês de uma comunidade, congelando seus totais.
+
+    Args:
+        db: Sessão do banco de dados
+        fechamento_data: Comunidade e mês
+        usuario: Usuário que fechou o mês
+
+    Returns:
+        Fechamento criado
+
+    Raises:
+        HTTPException: Se a comunidade não existir, o mês não tiver
+            terminado ou já estiver fechado
+    """
+    # Bloqueio exclusivo antes de somar o mês: escritas em andamento terminam
+    # antes e as seguintes esperam o commit do fechamento
+    if not bloquear_comunidades(db, [fechamento_data.comunidade_id], exclusivo=True):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comunidade não encontrada"
+        )
+
+    mes = referencia_para_num(fechamento_data.mes)
+    hoje = date.today()
+    if mes >= hoje.year * 100 + hoje.month:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Apenas meses já encerrados podem ser fechados"
+        )
+
+    if db.query(FechamentoMensal.id).filter(
+        FechamentoMensal.comunidade_id == fechamento_data.comunidade_id,
+        FechamentoMensal.mes == mes
+    ).first() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Este mês já está fechado para a comunidade"
+        )
+
+    inicio, fim = _intervalo_mes(mes)
+    results = db.query(
+        Contribuicao.tipo,
+        Contribuicao.forma_pagamento,
+        func.sum(Contribuicao.valor).label("total"),
+        func.count(Contribuicao.id).label("quantidade")
+    ).filter(
+        Contribuicao.comunidade_id == fechamento_data.comunidade_id,
+        Contribuicao.data_contribuicao >= inicio,
+        Contribuicao.data_contribuicao <= fim
+    ).group_by(Contribuicao.tipo, Contribuicao.forma_pagamento).all()
+
+    db_fechamento = FechamentoMensal(
+        comunidade_id=fechamento_data.comunidade_id,
+        mes=mes,
+        usuario_id=usuario.id,
+        totais=[
+            FechamentoTotal(
+                tipo=r.tipo,
+                forma_pagamento=r.forma_pagamento,
+                total=r.total,
+                quantidade=r.quantidade
+            )
+            for r in results
+        ]
+    )
+    db.add(db_fechamento)
+    db.commit()
+    db.refresh(db_fechamento)
+    report_cache.bump_version(db_fechamento.comunidade_id)
+    return db_fechamento
+
+
+def reabrir_mes(db: Session, fechamento_id: int) -> bool:
+    """
+    Reabre um mês fechado, descartando os totais congelados.
+
+    Args:
+        db: Sessão do banco de dados
+        fechamento_id: ID do fechamento
+
+    Returns:
+        True se reaberto, False se não encontrado
+    """
+    db_fechamento = get_fechamento(db, fechamento_id)
+    if not db_fechamento:
+        return False
+
+    comunidade_id = db_fechamento.comunidade_id
+    db.delete(db_fechamento)
+    db.commit()
+    report_cache.bump_version(comunidade_id)
+    return True
@@ -0,0 +1,208 @@
+"""
+Serviço de Idempotência.
+Respostas guardadas por Idempotency-Key para reenvios de requisições de criação.
+
+Na primeira requisição com uma chave, uma linha é reservada em
+chaves_idempotencia (com commit próprio, antes de executar o endpoint) e,
+ao final, recebe o status, os cabeçalhos e o corpo da resposta. Um reenvio com a mesma
+chave é respondido com uma única busca no índice único (usuario_id, chave),
+sem executar o endpoint de novo. Um reenvio que chega enquanto a primeira
+requisição ainda está em andamento recebe 409; a mesma chave com outra
+rota ou outro corpo recebe 422. Respostas 5xx não são guardadas: a reserva
+é desfeita e o reenvio executa de novo.
+
+As chaves valem por IDEMPOTENCY_TTL_HOURS e as expiradas são apagadas pelo
+próprio processo, no máximo uma vez a cada INTERVALO_PURGA segundos.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.idempotencia import ChaveIdempotencia
+
+logger = logging.getLogger(__name__)
+
+# Intervalo mínimo entre limpezas de chaves expiradas, em segundos
+INTERVALO_PURGA = 3600
+
+_purga_lock = threading.Lock()
+_ultima_purga = 0.0
+
+
+class RespostaRepetida(Exception):
+    """Reenvio de uma requisição já concluída, com a resposta guardada."""
+
+    def __init__(self, status_code: int, cabecalhos: list, corpo: bytes):
+        self.status_code = status_code
+        self.cabecalhos = cabecalhos
+        self.corpo = corpo
+
+
+def buscar(db: Session, usuario_id: int, chave: str) -> Optional[ChaveIdempotencia]:
+    """
+    Obtém a chave de idempotência de um usuário, se ainda válida.
+
+    Args:
+        db: Sessão do banco de dados
+        usuario_id: ID do usuário
+        chave: Valor do cabeçalho Idempotency-Key
+
+    Returns:
+        Chave encontrada ou None
+    """
+    return db.query(ChaveIdempotencia).filter(
+        ChaveIdempotencia.usuario_id == usuario_id,
+        ChaveIdempotencia.chave == chave,
+        ChaveIdempotencia.expira_em > datetime.now(timezone.utc)
+    ).first()
+
+
+def purgar_expiradas(db: Session) -> int:
+    """
+    Apaga as chaves de idempotência expiradas.
+
+    Args:
+        db: Sessão do banco de dados
+
+    Returns:
+        Quantidade de chaves apagadas
+    """
+    apagadas = db.query(ChaveIdempotencia).filter(
+        ChaveIdempotencia.expira_em <= datetime.now(timezone.utc)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return apagadas
+
+
+def _purgar_periodicamente(db: Session) -> None:
+    """Apaga as chaves expiradas se a última limpeza já passou do intervalo."""
+    global _ultima_purga
+    with _purga_lock:
+        agora = time.monotonic()
+        if _ultima_purga and agora - _ultima_purga < INTERVALO_PURGA:
+            return
+        _ultima_purga = agora
+    apagadas = purgar_expiradas(db)
+    if apagadas:
+        logger.info("Chaves de idempotência expiradas apagadas: %d", apagadas)
+
+
+def _reservar(db: Session, usuario_id: int, chave: str, metodo: str, rota: str, hash_requisicao: str) -> Optional[int]:
+    """
+    Reserva uma chave para a requisição atual.
+
+    Returns:
+        ID da reserva, ou None se outra requisição reservou a chave antes
+    """
+    agora = datetime.now(timezone.utc)
+    # Uma chave expirada ainda não apagada ocuparia o índice único
+    db.query(ChaveIdempotencia).filter(
+        ChaveIdempotencia.usuario_id == usuario_id,
+        ChaveIdempotencia.chave == chave,
+        ChaveIdempotencia.expira_em <= agora
+    ).delete(synchronize_session=False)
+
+    registro = ChaveIdempotencia(
+        usuario_id=usuario_id,
+        chave=chave,
+        metodo=metodo,
+        rota=rota,
+        hash_requisicao=hash_requisicao,
+        expira_em=agora + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+    )
+    db.add(registro)
+    try:
+        db.flush()
+        registro_id = registro.id
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
+    return registro_id
+
+
+def iniciar(db: Session, usuario_id: int, chave: str, metodo: str, rota: str, hash_requisicao: str) -> int:
+    """
+    Reserva a chave ou responde com a requisição que já a usou.
+
+    Args:
+        db: Sessão do banco de dados
+        usuario_id: ID do usuário
+        chave: Valor do cabeçalho Idempotency-Key
+        metodo: Método HTTP
+        rota: Caminho da requisição
+        hash_requisicao: SHA-256 do corpo da requisição
+
+    Returns:
+        ID da reserva, a completar com registrar_resposta ou liberar
+
+    Raises:
+        RespostaRepetida: Se a chave já tiver uma resposta guardada
+        HTTPException: Se a chave estiver em uso por uma requisição em
+            andamento (409) ou por outra requisição (422)
+    """
+    registro = buscar(db, usuario_id, chave)
+    if registro is None:
+        _purgar_periodicamente(db)
+        registro_id = _reservar(db, usuario_id, chave, metodo, rota, hash_requisicao)
+        if registro_id is not None:
+            return registro_id
+        registro = buscar(db, usuario_id, chave)
+
+    if registro is None or registro.status_code is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Uma requisição com esta Idempotency-Key ainda está em andamento"
+        )
+    if (registro.metodo, registro.rota, registro.hash_requisicao) != (metodo, rota, hash_requisicao):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key já usada com outra requisição"
+        )
+    raise RespostaRepetida(registro.status_code, registro.cabecalhos or [], registro.corpo)
+
+
+def registrar_resposta(bind, registro_id: int, status_code: int, cabecalhos: list, corpo: bytes) -> None:
+    """
+    Guarda a resposta de uma requisição reservada.
+
+    Usa uma sessão própria: a da requisição já pode ter sido fechada.
+
+    Args:
+        bind: Engine/conexão do banco usada pela requisição
+        registro_id: ID da reserva
+        status_code: Status HTTP da resposta
+        cabecalhos: Cabeçalhos da resposta como pares [nome, valor], na
+            ordem original e com repetições (ex.: Set-Cookie)
+        corpo: Corpo da resposta
+    """
+    with Session(bind=bind) as db:
+        db.query(ChaveIdempotencia).filter(ChaveIdempotencia.id == registro_id).update(
+            {
+                ChaveIdempotencia.status_code: status_code,
+                ChaveIdempotencia.cabecalhos: cabecalhos,
+                ChaveIdempotencia.corpo: corpo,
+            },
+            synchronize_session=False
+        )
+        db.commit()
+
+
+def liberar(bind, registro_id: int) -> None:
+    """
+    Desfaz uma reserva, para que o reenvio execute a requisição de novo.
+
+    Args:
+        bind: Engine/conexão do banco usada pela requisição
+        registro_id: ID da reserva
+    """
+    with Session(bind=bind) as db:
+        db.query(ChaveIdempotencia).filter(ChaveIdempotencia.id == registro_id).delete(synchronize_session=False)
+        db.commit()
@@ -0,0 +1,266 @@
+"""
+Serviço de Lote de Coleta.
+Lógica de negócio para lançar as contribuições de uma celebração em lotes.
+
+Os itens chegam em levas, cada um com um id gerado no cliente (client_id),
+e são validados e conferidos pelas mesmas regras do contribuicao_service.
+Cada leva é gravada em blocos de LOTE_COMMIT_COLETA itens, cada bloco com
+um único INSERT de várias linhas e seu próprio commit: se a conexão cair no
+meio, os blocos já gravados ficam no banco e o reenvio da leva inteira só
+grava o que falta. Ids já existentes no lote são descartados por uma consulta
+no índice único (lote_id, client_id) e, contra reenvios simultâneos, pelo
+ON CONFLICT DO NOTHING do INSERT. Os totais do lote são somados no mesmo
+commit de cada bloco.
+
+Cada bloco relê o lote com trava de linha (SELECT ... FOR UPDATE) e confere
+que ele continua aberto; o encerramento toma a mesma trava antes de
+recalcular os totais. Assim um lote encerrado no meio de uma leva não
+recebe os blocos seguintes, e os totais conferidos no encerramento incluem
+todos os blocos já gravados.
+"""
+from datetime import datetime, timezone
+from typing import List, Optional
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.comunidade import Comunidade
+from app.models.contribuicao import Contribuicao
+from app.models.lote_coleta import LoteColeta
+from app.models.usuario import Usuario
+from app.schemas.lote_coleta import LoteColetaCreate, LoteColetaItemCreate
+from app.services.analytics_engine import analytics_engine
+from app.services.contribuicao_service import ajustar_totais_lote, conferir_itens, validar_itens
+from app.services.report_cache import report_cache
+
+# Itens gravados por commit ao incluir itens no lote
+LOTE_COMMIT_COLETA = 500
+
+_validador_itens_coleta = TypeAdapter(List[LoteColetaItemCreate])
+
+
+def get_lote(db: Session, lote_id: int) -> Optional[LoteColeta]:
+    """
+    Obtém um lote de coleta por ID.
+
+    Args:
+        db: Sessão do banco de dados
+        lote_id: ID do lote
+
+    Returns:
+        Lote encontrado ou None
+    """
+    return db.query(LoteColeta).filter(LoteColeta.id == lote_id).first()
+
+
+def get_lotes(db: Session, comunidade_id: Optional[int] = None, abertos: bool = False) -> List[LoteColeta]:
+    """
+    Obtém lotes de coleta, da coleta mais recente à mais antiga.
+
+    Args:
+        db: Sessão do banco de dados
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        abertos: Se True, apenas lotes não encerrados
+
+    Returns:
+        Lista de lotes
+    """
+    query = db.query(LoteColeta)
+    if comunidade_id is not None:
+        query = query.filter(LoteColeta.comunidade_id == comunidade_id)
+    if abertos:
+        query = query.filter(LoteColeta.encerrado_em.is_(None))
+    return query.order_by(LoteColeta.data_coleta.desc(), LoteColeta.id.desc()).all()
+
+
+def create_lote(db: Session, lote_data: LoteColetaCreate, usuario: Usuario) -> LoteColeta:
+    """
+    Abre um lote de coleta.
+
+    Args:
+        db: Sessão do banco de dados
+        lote_data: Comunidade, data e descrição
+        usuario: Usuário que abriu o lote
+
+    Returns:
+        Lote criado
+
+    Raises:
+        HTTPException: Se a comunidade não existir
+    """
+    if db.query(Comunidade.id).filter(Comunidade.id == lote_data.comunidade_id).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comunidade não encontrada"
+        )
+
+    db_lote = LoteColeta(**lote_data.model_dump(), usuario_id=usuario.id)
+    db.add(db_lote)
+    db.commit()
+    db.refresh(db_lote)
+    return db_lote
+
+
+def _insert_ignorando_repetidos(db: Session):
+    """INSERT em contribuicoes que ignora client_id já existente no lote."""
+    dialeto = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialeto.insert(Contribuicao).on_conflict_do_nothing(
+        index_elements=[Contribuicao.lote_id, Contribuicao.client_id]
+    )
+
+
+def _travar_lote(db: Session, lote_id: int) -> LoteColeta:
+    """Relê o lote com trava de linha até o fim da transação."""
+    return db.query(LoteColeta).filter(
+        LoteColeta.id == lote_id
+    ).with_for_update().populate_existing().one()
+
+
+def _client_id(item) -> Optional[str]:
+    """client_id de um item recebido, para o relatório de erros."""
+    client_id = item.get("client_id") if isinstance(item, dict) else None
+    return str(client_id) if client_id is not None else None
+
+
+def incluir_itens(db: Session, lote: LoteColeta, itens: list) -> dict:
+    """
+    Inclui itens num lote de coleta aberto.
+
+    A comunidade de cada item é sempre a do lote e a data, se omitida, é a
+    da coleta. Itens com client_id já presente no lote (ou repetido na
+    leva) são contados como duplicados e não geram erro.
+
+    Args:
+        db: Sessão do banco de dados
+        lote: Lote de coleta
+        itens: Itens no formato de LoteColetaItemCreate
+
+    Returns:
+        Dicionário com itens recebidos, criados, duplicados, erros por
+        item e o lote com os totais atualizados
+
+    Raises:
+        HTTPException: Se o lote estiver encerrado, inclusive se for
+            encerrado entre dois blocos (os blocos anteriores ficam gravados)
+    """
+    if lote.encerrado_em is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Lote de coleta encerrado"
+        )
+
+    preparados = []
+    for item in itens:
+        if isinstance(item, dict):
+            item = {**item, "comunidade_id": lote.comunidade_id}
+            if item.get("data_contribuicao") is None:
+                item["data_contribuicao"] = lote.data_coleta
+        preparados.append(item)
+
+    validos, erros = validar_itens(preparados, _validador_itens_coleta)
+
+    # Repetidos na própria leva: vale o primeiro
+    unicos = []
+    vistos = set()
+    duplicados = 0
+    for posicao, item in validos:
+        if item.client_id in vistos:
+            duplicados += 1
+        else:
+            vistos.add(item.client_id)
+            unicos.append((posicao, item))
+
+    criados = 0
+    menor_id = None
+    insert_stmt = _insert_ignorando_repetidos(db)
+    for inicio in range(0, len(unicos), LOTE_COMMIT_COLETA):
+        bloco = unicos[inicio:inicio + LOTE_COMMIT_COLETA]
+        if _travar_lote(db, lote.id).encerrado_em is not None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Lote de coleta encerrado"
+            )
+        existentes = {
+            client_id for (client_id,) in db.query(Contribuicao.client_id).filter(
+                Contribuicao.lote_id == lote.id,
+                Contribuicao.client_id.in_([item.client_id for _, item in bloco])
+            )
+        }
+        novos = [(posicao, item) for posicao, item in bloco if item.client_id not in existentes]
+        duplicados += len(bloco) - len(novos)
+
+        linhas = [
+            {**valores, "lote_id": lote.id, "client_id": item.client_id}
+            for _, item, valores in conferir_itens(db, novos, erros)
+        ]
+        if not linhas:
+            db.commit()  # libera a trava do lote
+            continue
+        inseridos = db.execute(
+            insert_stmt.returning(Contribuicao.id, Contribuicao.valor), linhas
+        ).all()
+        duplicados += len(linhas) - len(inseridos)
+        if inseridos:
+            ajustar_totais_lote(db, lote.id, sum(valor for _, valor in inseridos), len(inseridos))
+        db.commit()
+        criados += len(inseridos)
+        if inseridos:
+            menor_bloco = min(id_criado for id_criado, _ in inseridos)
+            menor_id = menor_bloco if menor_id is None else min(menor_id, menor_bloco)
+
+    if criados:
+        report_cache.bump_version(lote.comunidade_id)
+        analytics_engine.registrar_criacao(db, [lote.comunidade_id], menor_id)
+    db.refresh(lote)
+
+    erros.sort(key=lambda erro: erro[0])
+    return {
+        "recebidos": len(itens),
+        "criados": criados,
+        "duplicados": duplicados,
+        "erros": [
+            {
+                "indice": posicao,
+                "client_id": _client_id(itens[posicao]),
+                "campo": campo,
+                "mensagem": mensagem,
+            }
+            for posicao, campo, mensagem in erros
+        ],
+        "lote": lote,
+    }
+
+
+def encerrar_lote(db: Session, lote: LoteColeta) -> LoteColeta:
+    """
+    Encerra um lote de coleta, conferindo os totais com as contribuições.
+
+    Os totais mantidos a cada inclusão são recalculados numa única consulta,
+    o que corrige qualquer diferença causada por alterações feitas fora do
+    contribuicao_service. Encerrar um lote já encerrado apenas confere os
+    totais de novo. O lote é travado antes da soma, esperando o bloco de
+    itens em gravação, se houver.
+
+    Args:
+        db: Sessão do banco de dados
+        lote: Lote de coleta
+
+    Returns:
+        Lote encerrado
+    """
+    lote = _travar_lote(db, lote.id)
+    total, quantidade = db.query(
+        func.coalesce(func.sum(Contribuicao.valor), 0),
+        func.count(Contribuicao.id)
+    ).filter(Contribuicao.lote_id == lote.id).one()
+
+    lote.total = total
+    lote.quantidade = quantidade
+    if lote.encerrado_em is None:
+        lote.encerrado_em = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(lote)
+    return lote
@@ -0,0 +1,326 @@
+"""
+Extração Parquet de Contribuições.
+Cópia colunar de contribuicoes em disco local para análises fora do banco.
+
+As contribuições são gravadas em arquivos Parquet particionados por mês
+(``contribuicoes/mes=YYYYMM/dados.parquet``), junto com a dimensão de
+comunidades (``comunidades.parquet``) e um manifesto com a impressão
+digital de cada mês extraído. A extração é incremental: uma única consulta
+agregada calcula a impressão digital atual de cada mês (quantidade, soma
+dos ids, total e última alteração) e apenas os meses que mudaram desde a
+extração anterior são regravados; meses que ficaram vazios são removidos.
+Meses fechados não mudam e, portanto, nunca são regravados.
+
+Os relatórios com ``fonte="parquet"`` leem esses arquivos com DuckDB
+embarcado e refletem os dados da última extração.
+"""
+import json
+import os
+import shutil
+import threading
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import HTTPException, status
+from sqlalchemy import func, extract
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.comunidade import Comunidade
+from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
+
+# Linhas lidas do cursor e gravadas por grupo de linhas do Parquet
+LOTE_EXTRACAO = 50000
+
+MANIFESTO = "manifesto.json"
+
+SCHEMA_CONTRIBUICOES = pa.schema([
+    ("id", pa.int32()),
+    ("comunidade_id", pa.int32()),
+    ("dizimista_id", pa.int32()),
+    ("tipo", pa.string()),
+    ("valor", pa.decimal128(10, 2)),
+    ("data_contribuicao", pa.date32()),
+    ("forma_pagamento", pa.string()),
+    ("referencia_mes_num", pa.int32()),
+])
+
+SCHEMA_COMUNIDADES = pa.schema([
+    ("id", pa.int32()),
+    ("nome", pa.string()),
+    ("paroquia_id", pa.int32()),
+])
+
+# Uma extração por vez no processo
+_extracao_lock = threading.Lock()
+
+
+def _diretorio(diretorio: Optional[str]) -> Path:
+    """Diretório da extração (padrão: PARQUET_DIR)."""
+    return Path(diretorio or settings.PARQUET_DIR)
+
+
+def _arquivo_mes(base: Path, mes: int) -> Path:
+    """Arquivo Parquet da partição de um mês YYYYMM."""
+    return base / "contribuicoes" / f"mes={mes}" / "dados.parquet"
+
+
+def _gravar_atomico(tabela: pa.Table, destino: Path) -> None:
+    """Grava uma tabela Parquet sem expor arquivos incompletos aos leitores."""
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_suffix(".tmp")
+    pq.write_table(tabela, temporario, row_group_size=LOTE_EXTRACAO)
+    os.replace(temporario, destino)
+
+
+def ler_manifesto(diretorio: Optional[str] = None) -> Optional[dict]:
+    """
+    Lê o manifesto da última extração.
+
+    Args:
+        diretorio: Diretório da extração (padrão: PARQUET_DIR)
+
+    Returns:
+        Manifesto com data da extração e meses extraídos, ou None se
+        nenhuma extração foi feita
+    """
+    caminho = _diretorio(diretorio) / MANIFESTO
+    if not caminho.exists():
+        return None
+    return json.loads(caminho.read_text())
+
+
+def _impressoes_digitais(db: Session) -> dict:
+    """Impressão digital atual de cada mês com contribuições."""
+    mes = (
+        extract('year', Contribuicao.data_contribuicao) * 100
+        + extract('month', Contribuicao.data_contribuicao)
+    ).label("mes")
+    return {
+        str(int(r.mes)): [
+            r.quantidade,
+            int(r.soma_ids),
+            str(Decimal(r.total).quantize(Decimal("0.01"))),
+            r.atualizado_em.isoformat() if isinstance(r.atualizado_em, datetime) else str(r.atualizado_em),
+        ]
+        for r in db.query(
+            mes,
+            func.count(Contribuicao.id).label("quantidade"),
+            func.sum(Contribuicao.id).label("soma_ids"),
+            func.sum(Contribuicao.valor).label("total"),
+            func.max(Contribuicao.atualizado_em).label("atualizado_em")
+        ).group_by(mes).all()
+    }
+
+
+def _extrair_mes(db: Session, base: Path, mes: int) -> int:
+    """
+    Grava a partição de um mês a partir do banco.
+
+    Returns:
+        Quantidade de contribuições gravadas
+    """
+    ano, numero = divmod(mes, 100)
+    inicio = date(ano, numero, 1)
+    fim = date(ano + 1, 1, 1) if numero == 12 else date(ano, numero + 1, 1)
+
+    query = db.query(
+        Contribuicao.id,
+        Contribuicao.comunidade_id,
+        Contribuicao.dizimista_id,
+        Contribuicao.tipo,
+        Contribuicao.valor,
+        Contribuicao.data_contribuicao,
+        Contribuicao.forma_pagamento,
+        Contribuicao.referencia_mes_num
+    ).filter(
+        Contribuicao.data_contribuicao >= inicio,
+        Contribuicao.data_contribuicao < fim
+    ).order_by(Contribuicao.id).yield_per(LOTE_EXTRACAO)
+
+    destino = _arquivo_mes(base, mes)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_suffix(".tmp")
+    linhas = 0
+    with pq.ParquetWriter(temporario, SCHEMA_CONTRIBUICOES) as writer:
+        def gravar(lote):
+            colunas = list(zip(*lote, strict=True))
+            colunas[3] = [tipo.value for tipo in colunas[3]]
+            writer.write_table(pa.Table.from_arrays(
+                [
+                    pa.array(valores, type=campo.type)
+                    for valores, campo in zip(colunas, SCHEMA_CONTRIBUICOES, strict=True)
+                ],
+                schema=SCHEMA_CONTRIBUICOES
+            ))
+
+        lote = []
+        for linha in query:
+            lote.append(linha)
+            if len(lote) == LOTE_EXTRACAO:
+                gravar(lote)
+                linhas += len(lote)
+                lote = []
+        if lote:
+            gravar(lote)
+            linhas += len(lote)
+    os.replace(temporario, destino)
+    return linhas
+
+
+def extrair(db: Session, diretorio: Optional[str] = None) -> dict:
+    """
+    Atualiza a extração Parquet com os meses alterados desde a anterior.
+
+    Args:
+        db: Sessão do banco de dados
+        diretorio: Diretório da extração (padrão: PARQUET_DIR)
+
+    Returns:
+        Dicionário com meses regravados, meses removidos, linhas gravadas
+        e meses inalterados
+    """
+    base = _diretorio(diretorio)
+    with _extracao_lock:
+        anterior = (ler_manifesto(diretorio) or {}).get("meses", {})
+        atual = _impressoes_digitais(db)
+
+        regravados = sorted(mes for mes, digital in atual.items() if anterior.get(mes) != digital)
+        removidos = sorted(mes for mes in anterior if mes not in atual)
+
+        linhas = 0
+        for mes in regravados:
+            linhas += _extrair_mes(db, base, int(mes))
+
+        comunidades = db.query(Comunidade.id, Comunidade.nome, Comunidade.paroquia_id).order_by(Comunidade.id).all()
+        _gravar_atomico(
+            pa.Table.from_arrays(
+                [pa.array(valores, type=campo.type) for valores, campo in zip(
+                    zip(*comunidades, strict=True) if comunidades else ([], [], []),
+                    SCHEMA_COMUNIDADES,
+                    strict=True
+                )],
+                schema=SCHEMA_COMUNIDADES
+            ),
+            base / "comunidades.parquet"
+        )
+
+        # O manifesto só é gravado depois das partições: numa extração
+        # interrompida, os meses pendentes são refeitos na próxima execução
+        base.mkdir(parents=True, exist_ok=True)
+        temporario = base / f"{MANIFESTO}.tmp"
+        temporario.write_text(json.dumps({
+            "extraido_em": datetime.now(timezone.utc).isoformat(),
+            "meses": atual,
+        }))
+        os.replace(temporario, base / MANIFESTO)
+
+        # Partições vazias saem depois que o manifesto deixou de listá-las
+        for mes in removidos:
+            shutil.rmtree(_arquivo_mes(base, int(mes)).parent, ignore_errors=True)
+
+    return {
+        "meses_regravados": len(regravados),
+        "meses_removidos": len(removidos),
+        "meses_inalterados": len(atual) - len(regravados),
+        "linhas": linhas,
+    }
+
+
+def _manifesto_obrigatorio(diretorio: Optional[str]) -> dict:
+    """Manifesto da extração; erro 503 se ainda não houver extração."""
+    manifesto = ler_manifesto(diretorio)
+    if manifesto is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Extração Parquet ainda não foi executada"
+        )
+    return manifesto
+
+
+def comunidades(paroquia_id: Optional[int] = None, diretorio: Optional[str] = None) -> List[Tuple[int, str]]:
+    """
+    Lista as comunidades da extração, ordenadas pelo nome.
+
+    Args:
+        paroquia_id: ID da paróquia para filtrar (opcional)
+        diretorio: Diretório da extração (padrão: PARQUET_DIR)
+
+    Returns:
+        Lista de (id, nome)
+
+    Raises:
+        HTTPException: Se ainda não houver extração
+    """
+    _manifesto_obrigatorio(diretorio)
+    sql = "SELECT id, nome FROM read_parquet(?)"
+    params = [str(_diretorio(diretorio) / "comunidades.parquet")]
+    if paroquia_id is not None:
+        sql += " WHERE paroquia_id = ?"
+        params.append(paroquia_id)
+    with duckdb.connect() as conexao:
+        return conexao.execute(sql + " ORDER BY nome", params).fetchall()
+
+
+def agregados(
+    start_date: date,
+    end_date: date,
+    comunidade_id: Optional[int] = None,
+    paroquia_id: Optional[int] = None,
+    diretorio: Optional[str] = None
+) -> dict:
+    """
+    Agrega contribuições da extração por comunidade, tipo e mês.
+
+    Apenas as partições dos meses do período são lidas.
+
+    Args:
+        start_date: Data de início
+        end_date: Data de fim
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        paroquia_id: ID da paróquia para filtrar (opcional)
+        diretorio: Diretório da extração (padrão: PARQUET_DIR)
+
+    Returns:
+        Dicionário (comunidade_id, tipo, mês YYYYMM) -> [total, quantidade],
+        no formato de report_service._agregados_com_fechamentos
+
+    Raises:
+        HTTPException: Se ainda não houver extração
+    """
+    manifesto = _manifesto_obrigatorio(diretorio)
+    base = _diretorio(diretorio)
+    inicio, fim = start_date.year * 100 + start_date.month, end_date.year * 100 + end_date.month
+    arquivos = [
+        str(_arquivo_mes(base, int(mes)))
+        for mes in sorted(manifesto["meses"])
+        if inicio <= int(mes) <= fim
+    ]
+    if not arquivos:
+        return {}
+
+    sql = """
+        SELECT c.comunidade_id, c.tipo, c.mes, SUM(c.valor) AS total, COUNT(*) AS quantidade
+        FROM read_parquet(?, hive_partitioning = true) AS c
+    """
+    params: list = [arquivos]
+    if paroquia_id is not None:
+        sql += " JOIN read_parquet(?) AS m ON m.id = c.comunidade_id AND m.paroquia_id = ?"
+        params += [str(base / "comunidades.parquet"), paroquia_id]
+    sql += " WHERE c.data_contribuicao BETWEEN ? AND ?"
+    params += [start_date, end_date]
+    if comunidade_id is not None:
+        sql += " AND c.comunidade_id = ?"
+        params.append(comunidade_id)
+    sql += " GROUP BY c.comunidade_id, c.tipo, c.mes"
+
+    with duckdb.connect() as conexao:
+        return {
+            (comunidade, TipoContribuicaoEnum(tipo), int(mes)): [total, quantidade]
+            for comunidade, tipo, mes, total, quantidade in conexao.execute(sql, params).fetchall()
+        }
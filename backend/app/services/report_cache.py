@@ -0,0 +1,360 @@
+"""
+Cache de Relatórios.
+Cache em memória dos resultados de relatórios, invalidado por versão de dados.
+
+Cada comunidade possui uma versão de dados que é incrementada pelo
+contribuicao_service a cada escrita. Um resultado guardado no cache só é
+reaproveitado enquanto a versão da comunidade consultada (ou a versão
+global, para relatórios sem filtro de comunidade) for a mesma de quando
+ele foi calculado. O TTL limita a defasagem causada por escritas feitas
+fora do serviço (outros processos, scripts, seed).
+
+Requisições idênticas que chegam enquanto um relatório está sendo
+calculado aguardam esse mesmo cálculo em vez de repeti-lo (single-flight).
+
+Chamadas que aceitam resultado defasado (``stale_ok``) recebem
+imediatamente o último resultado calculado enquanto ele estiver dentro do
+TTL máximo; se ele já passou do TTL curto ou os dados mudaram, o
+relatório é recalculado em segundo plano.
+"""
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from enum import Enum
+from typing import Any, Callable, Hashable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ReportCache:
+    """Cache LRU de resultados de relatórios com invalidação por versão."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        soft_ttl_seconds: Optional[float] = None,
+        refresh_workers: int = 2
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.soft_ttl_seconds = ttl_seconds if soft_ttl_seconds is None else soft_ttl_seconds
+        self.refresh_workers = refresh_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._versions: dict = {}
+        self._global_version = 0
+        self._inflight: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.computations = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+
+    def version(self, comunidade_id: Optional[int] = None) -> int:
+        """
+        Obtém a versão de dados de uma comunidade.
+
+        Args:
+            comunidade_id: ID da comunidade ou None para a versão global
+
+        Returns:
+            Versão atual dos dados
+        """
+        with self._lock:
+            if comunidade_id is None:
+                return self._global_version
+            return self._versions.get(comunidade_id, 0)
+
+    def bump_version(self, *comunidade_ids: Optional[int]) -> None:
+        """
+        Incrementa a versão das comunidades afetadas por uma escrita.
+
+        A versão global também é incrementada, já que relatórios sem
+        filtro de comunidade incluem os dados de todas elas.
+
+        Args:
+            comunidade_ids: IDs das comunidades alteradas
+        """
+        with self._lock:
+            for comunidade_id in set(comunidade_ids):
+                if comunidade_id is not None:
+                    self._versions[comunidade_id] = self._versions.get(comunidade_id, 0) + 1
+            self._global_version += 1
+
+    def get(self, key: Hashable, version: int, stale_ok: bool = False) -> tuple[str, Any]:
+        """
+        Busca um resultado no cache.
+
+        Um resultado é atual se foi calculado com a versão informada e
+        dentro do TTL (ou do TTL curto, quando se aceita defasagem). Com
+        ``stale_ok``, resultados de versões anteriores ou além do TTL
+        curto ainda são devolvidos como defasados até o TTL máximo.
+
+        Args:
+            key: Chave do relatório
+            version: Versão atual dos dados do escopo do relatório
+            stale_ok: Se aceita resultado defasado
+
+        Returns:
+            Tupla com (situação, valor), onde a situação é "atual",
+            "defasado" ou "ausente"
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, criado_em, value = entry
+                idade = time.monotonic() - criado_em
+                if idade < self.ttl_seconds:
+                    if entry_version == version and (not stale_ok or idade < self.soft_ttl_seconds):
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return "atual", value
+                    if stale_ok:
+                        self._entries.move_to_end(key)
+                        self.stale_hits += 1
+                        return "defasado", value
+                else:
+                    del self._entries[key]
+            self.misses += 1
+            return "ausente", None
+
+    def set(self, key: Hashable, version: int, value: Any) -> None:
+        """
+        Guarda um resultado no cache, descartando o menos usado se cheio.
+
+        Args:
+            key: Chave do relatório
+            version: Versão dos dados usada no cálculo
+            value: Resultado do relatório
+        """
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        comunidade_id: Optional[int],
+        compute: Callable[[], Any],
+        stale_ok: bool = False,
+        refresh: Optional[Callable[[], Any]] = None
+    ) -> Any:
+        """
+        Retorna o resultado em cache ou calcula e guarda um novo.
+
+        A versão é lida antes do cálculo: se uma escrita ocorrer durante o
+        cálculo, o resultado fica guardado com a versão antiga e não será
+        reaproveitado. Chamadas concorrentes com a mesma chave e versão
+        compartilham um único cálculo e recebem o mesmo resultado (ou a
+        mesma exceção).
+
+        Args:
+            key: Chave do relatório
+            comunidade_id: Comunidade que define a versão (None = global)
+            compute: Função que calcula o relatório
+            stale_ok: Se aceita resultado defasado com atualização em segundo plano
+            refresh: Função usada na atualização em segundo plano; deve
+                abrir sua própria sessão do banco (padrão: ``compute``)
+
+        Returns:
+            Resultado do relatório
+        """
+        version = self.version(comunidade_id)
+        situacao, value = self.get(key, version, stale_ok=stale_ok)
+        if situacao == "atual":
+            return value
+        if situacao == "defasado":
+            self._refresh_in_background(key, version, refresh or compute)
+            return value
+
+        with self._lock:
+            future = self._inflight.get((key, version))
+            leader = future is None
+            if leader:
+                future = self._start(key, version)
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+        return self._run(key, version, compute, future)
+
+    def _start(self, key: Hashable, version: int) -> Future:
+        """Registra um cálculo em andamento. Deve ser chamado com o lock."""
+        future = Future()
+        self._inflight[(key, version)] = future
+        self.computations += 1
+        return future
+
+    def _run(self, key: Hashable, version: int, compute: Callable[[], Any], future: Future) -> Any:
+        """Executa um cálculo registrado e entrega o resultado aos que aguardam."""
+        try:
+            value = compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            self.set(key, version, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop((key, version), None)
+
+    def _refresh_in_background(self, key: Hashable, version: int, refresh: Callable[[], Any]) -> None:
+        """
+        Agenda o recálculo de um relatório defasado, se ainda não houver um.
+
+        Args:
+            key: Chave do relatório
+            version: Versão atual dos dados do escopo do relatório
+            refresh: Função que recalcula o relatório
+        """
+        with self._lock:
+            if (key, version) in self._inflight:
+                return
+            future = self._start(key, version)
+            self.refreshes += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers,
+                    thread_name_prefix="report-refresh"
+                )
+            executor = self._executor
+
+        def run():
+            try:
+                self._run(key, version, refresh, future)
+            except Exception:
+                logger.exception("Falha ao atualizar relatório em segundo plano: %s", key)
+
+        executor.submit(run)
+
+    def clear(self) -> None:
+        """Remove todos os resultados e zera versões e métricas."""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._global_version = 0
+            self.hits = 0
+            self.misses = 0
+            self.coalesced = 0
+            self.computations = 0
+            self.stale_hits = 0
+            self.refreshes = 0
+
+    def stats(self) -> dict:
+        """
+        Obtém métricas do cache.
+
+        Returns:
+            Dicionário com tamanho, acertos, acertos defasados, falhas,
+            cálculos executados, atualizações em segundo plano, requisições
+            agrupadas e cálculos em andamento
+        """
+        with self._lock:
+            return {
+                "entradas": len(self._entries),
+                "acertos": self.hits,
+                "acertos_defasados": self.stale_hits,
+                "falhas": self.misses,
+                "calculos": self.computations,
+                "atualizacoes_segundo_plano": self.refreshes,
+                "agrupadas": self.coalesced,
+                "em_andamento": len(self._inflight),
+            }
+
+
+def _normalize(value: Any) -> Hashable:
+    """Normaliza um parâmetro de relatório para compor a chave do cache."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+def cached_report(func: Callable) -> Callable:
+    """
+    Decorator que guarda em cache o resultado de uma função de relatório.
+
+    A função deve receber a sessão do banco como primeiro argumento
+    (``db``); os demais argumentos compõem a chave. Se houver um
+    argumento ``comunidade_id`` preenchido, o resultado é invalidado pela
+    versão daquela comunidade; caso contrário, pela versão global.
+
+    A função decorada aceita o argumento nomeado ``stale_ok``: quando
+    verdadeiro, um resultado defasado é devolvido imediatamente e o
+    recálculo é feito em segundo plano com uma sessão própria.
+
+    O resultado é compartilhado entre as requisições e não deve ser
+    alterado por quem o recebe.
+
+    Args:
+        func: Função de relatório
+
+    Returns:
+        Função com cache
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(db, *args, stale_ok: bool = False, **kwargs):
+        if not settings.REPORT_CACHE_ENABLED:
+            return func(db, *args, **kwargs)
+
+        bound = signature.bind(db, *args, **kwargs)
+        bound.apply_defaults()
+        params = {name: value for name, value in bound.arguments.items() if name != "db"}
+        key = (func.__qualname__, tuple(sorted((name, _normalize(v)) for name, v in params.items())))
+
+        bind = db.get_bind()
+
+        def refresh():
+            # A sessão da requisição já terá sido fechada quando o
+            # recálculo em segundo plano rodar
+            with Session(bind=bind) as session:
+                return func(session, *args, **kwargs)
+
+        return report_cache.get_or_compute(
+            key,
+            params.get("comunidade_id"),
+            lambda: func(db, *args, **kwargs),
+            stale_ok=stale_ok,
+            refresh=refresh
+        )
+
+    return wrapper
+
+
+# Lista diária de aniversariantes por comunidade. A chave inclui o dia, então
+# a lista é reconstruída na primeira consulta de cada dia; a versão é
+# incrementada pelo dizimista_service quando um aniversariante muda.
+aniversariantes_cache = ReportCache(
+    max_entries=settings.REPORT_CACHE_MAX_ENTRIES,
+    ttl_seconds=24 * 60 * 60,
+)
+
+# Instância global do cache de relatórios
+report_cache = ReportCache(
+    max_entries=settings.REPORT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.REPORT_CACHE_TTL_SECONDS,
+    soft_ttl_seconds=settings.REPORT_CACHE_SOFT_TTL_SECONDS,
+    refresh_workers=settings.REPORT_CACHE_REFRESH_WORKERS,
+)
@@ -0,0 +1,417 @@
+"""
+Serviço de Jobs de Relatórios.
+Executa relatórios pesados fora da requisição HTTP.
+
+O job é gravado na tabela relatorio_jobs e executado por um pool de
+threads do próprio processo, com uma sessão do banco própria. O cliente
+acompanha a situação pelo ID do job e busca o resultado, guardado em JSON
+no mesmo formato do endpoint síncrono, até ele expirar.
+
+O progresso é informado pela etapa do job (FILA, CONSULTA, GRAVACAO,
+FINALIZADO). Cada relatório é uma única consulta agregada no banco, sem
+pontos intermediários a medir, por isso não há percentual dentro da
+etapa CONSULTA.
+
+Cada job registra o processo que o executa (executor) e um batimento
+(atualizado_em), renovado enquanto o job está na fila ou em andamento
+nesse processo. Só jobs sem batimento há REPORT_JOB_HEARTBEAT_SECONDS *
+BATIMENTOS_PERDIDOS são dados como interrompidos, de modo que outros
+workers ou réplicas em execução não têm seus jobs marcados como erro.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.relatorio_job import EtapaJobEnum, RelatorioJob, StatusJobEnum
+from app.models.usuario import Usuario, RoleEnum
+from app.schemas.report_job import (
+    RelatorioJobCreate,
+    TotalJobParams,
+    TotalComunidadeJobParams,
+    SerieMensalJobParams,
+    RankingJobParams,
+    ComparativoJobParams,
+    DistribuicaoJobParams,
+)
+from app.schemas.reports import (
+    TotalPeriodoResponse,
+    TotalTipoListResponse,
+    TotalComunidadeListResponse,
+    SerieMensalListResponse,
+    RankingListResponse,
+    ComparativoResponse,
+    DistribuicaoListResponse,
+)
+from app.services import report_service
+
+logger = logging.getLogger(__name__)
+
+# Mensagem gravada em jobs que falharam; o detalhe da exceção fica só no log
+ERRO_JOB = "Falha ao gerar o relatório"
+
+# Relatórios disponíveis como job: (parâmetros, função, schema do resultado)
+RELATORIOS = {
+    "total-periodo": (TotalJobParams, report_service.get_total_by_period, TotalPeriodoResponse),
+    "total-tipo": (TotalJobParams, report_service.get_total_by_tipo, TotalTipoListResponse),
+    "total-comunidade": (TotalComunidadeJobParams, report_service.get_total_by_comunidade, TotalComunidadeListResponse),
+    "serie-mensal": (SerieMensalJobParams, report_service.get_serie_mensal, SerieMensalListResponse),
+    "ranking": (RankingJobParams, report_service.get_ranking_dizimistas, RankingListResponse),
+    "comparativo": (ComparativoJobParams, report_service.get_comparativo, ComparativoResponse),
+    "distribuicao": (DistribuicaoJobParams, report_service.get_distribuicao_valores, DistribuicaoListResponse),
+}
+
+# Batimentos perdidos até um job ser considerado interrompido
+BATIMENTOS_PERDIDOS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_batimento: Optional[threading.Thread] = None
+_identidade: Optional[tuple[int, str]] = None
+# Jobs na fila ou em execução neste processo
+_jobs_locais: set[str] = set()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Obtém o pool de execução de jobs, criando-o no primeiro uso."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.REPORT_JOB_WORKERS,
+                thread_name_prefix="report-job"
+            )
+        return _executor
+
+
+def _executor_id() -> str:
+    """
+    Identifica este processo como executor de jobs (host, PID e um sufixo
+    aleatório, pois PIDs se repetem entre contêineres e reinicializações).
+    """
+    global _identidade
+    pid = os.getpid()
+    if _identidade is None or _identidade[0] != pid:
+        _identidade = (pid, f"{socket.gethostname()}:{pid}:{uuid.uuid4().hex[:8]}")
+    return _identidade[1]
+
+
+def _iniciar_batimento(bind) -> None:
+    """Inicia, se ainda não estiver rodando, a thread de batimento dos jobs locais."""
+    global _batimento
+    with _executor_lock:
+        if _batimento is None or not _batimento.is_alive():
+            _batimento = threading.Thread(
+                target=_bater, args=(bind,), name="report-job-heartbeat", daemon=True
+            )
+            _batimento.start()
+
+
+def _bater(bind) -> None:
+    """Renova periodicamente o batimento dos jobs na fila ou em execução neste processo."""
+    while True:
+        time.sleep(settings.REPORT_JOB_HEARTBEAT_SECONDS)
+        with _executor_lock:
+            jobs = list(_jobs_locais)
+        if not jobs:
+            continue
+        try:
+            with Session(bind=bind) as db:
+                db.query(RelatorioJob).filter(
+                    RelatorioJob.id.in_(jobs),
+                    RelatorioJob.executor == _executor_id()
+                ).update({RelatorioJob.atualizado_em: _agora()}, synchronize_session=False)
+                db.commit()
+        except Exception:
+            logger.exception("Falha ao registrar o batimento dos jobs de relatório")
+
+
+def _agora() -> datetime:
+    """Data e hora atual em UTC."""
+    return datetime.now(timezone.utc)
+
+
+def _utc(valor: datetime) -> datetime:
+    """Garante fuso horário em datas lidas do banco (SQLite as devolve sem fuso)."""
+    return valor if valor.tzinfo is not None else valor.replace(tzinfo=timezone.utc)
+
+
+def purge_expired_jobs(db: Session) -> int:
+    """
+    Remove jobs expirados e jobs sem conclusão além do prazo de expiração.
+
+    Args:
+        db: Sessão do banco de dados
+
+    Returns:
+        Quantidade de jobs removidos
+    """
+    agora = _agora()
+    removidos = db.query(RelatorioJob).filter(
+        or_(
+            RelatorioJob.expira_em < agora,
+            (RelatorioJob.expira_em.is_(None))
+            & (RelatorioJob.criado_em < agora - timedelta(seconds=settings.REPORT_JOB_TTL_SECONDS))
+        )
+    ).delete(synchronize_session=False)
+    db.commit()
+    return removidos
+
+
+def _marcar_interrompidos(db: Session, *criterios) -> int:
+    """
+    Marca como erro os jobs pendentes ou em andamento sem batimento recente.
+
+    Args:
+        db: Sessão do banco de dados
+        criterios: Filtros adicionais dos jobs verificados
+
+    Returns:
+        Quantidade de jobs marcados como erro
+    """
+    agora = _agora()
+    limite = agora - timedelta(seconds=settings.REPORT_JOB_HEARTBEAT_SECONDS * BATIMENTOS_PERDIDOS)
+    interrompidos = db.query(RelatorioJob).filter(
+        RelatorioJob.status.in_([StatusJobEnum.PENDENTE, StatusJobEnum.EXECUTANDO]),
+        RelatorioJob.atualizado_em < limite,
+        *criterios
+    ).update(
+        {
+            RelatorioJob.status: StatusJobEnum.ERRO,
+            RelatorioJob.etapa: EtapaJobEnum.FINALIZADO,
+            RelatorioJob.erro: "Job interrompido: o processo que o executava parou",
+            RelatorioJob.concluido_em: agora,
+            RelatorioJob.atualizado_em: agora,
+            RelatorioJob.expira_em: agora + timedelta(seconds=settings.REPORT_JOB_TTL_SECONDS),
+        },
+        synchronize_session=False
+    )
+    db.commit()
+    return interrompidos
+
+
+def recuperar_jobs_interrompidos(db: Session) -> int:
+    """
+    Marca como erro os jobs cujo executor parou de enviar batimentos.
+
+    Jobs de outros workers ou réplicas ainda ativos continuam renovando o
+    batimento e não são afetados. Chamada na inicialização da API; jobs
+    consultados pelo cliente também são verificados em get_job.
+
+    Args:
+        db: Sessão do banco de dados
+
+    Returns:
+        Quantidade de jobs marcados como erro
+    """
+    return _marcar_interrompidos(db)
+
+
+def create_job(db: Session, job_data: RelatorioJobCreate, usuario: Usuario) -> RelatorioJob:
+    """
+    Registra um job de relatório e o agenda para execução.
+
+    Args:
+        db: Sessão do banco de dados
+        job_data: Relatório e parâmetros
+        usuario: Usuário que submeteu o job
+
+    Returns:
+        Job criado, na situação PENDENTE
+
+    Raises:
+        HTTPException: Se os parâmetros forem inválidos para o relatório
+    """
+    params_schema, _, _ = RELATORIOS[job_data.tipo]
+    try:
+        params = params_schema.model_validate(job_data.parametros)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=exc.errors(include_url=False, include_context=False)
+        ) from exc
+
+    purge_expired_jobs(db)
+
+    db_job = RelatorioJob(
+        id=str(uuid.uuid4()),
+        usuario_id=usuario.id,
+        tipo=job_data.tipo,
+        parametros=params.model_dump(mode="json"),
+        status=StatusJobEnum.PENDENTE,
+        etapa=EtapaJobEnum.FILA,
+        executor=_executor_id(),
+        atualizado_em=_agora(),
+    )
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+
+    # O job roda depois que a sessão da requisição for fechada
+    with _executor_lock:
+        _jobs_locais.add(db_job.id)
+    _iniciar_batimento(db.get_bind())
+    _get_executor().submit(_run_job, db.get_bind(), db_job.id)
+    return db_job
+
+
+def _avancar_etapa(db: Session, job_id: str, executor: str, etapa: EtapaJobEnum) -> None:
+    """
+    Registra a etapa de um job em andamento por este executor, renovando o batimento.
+
+    Args:
+        db: Sessão do banco de dados
+        job_id: ID do job
+        executor: Identificação do processo que executa o job
+        etapa: Nova etapa
+    """
+    db.query(RelatorioJob).filter(
+        RelatorioJob.id == job_id,
+        RelatorioJob.status == StatusJobEnum.EXECUTANDO,
+        RelatorioJob.executor == executor
+    ).update(
+        {RelatorioJob.etapa: etapa, RelatorioJob.atualizado_em: _agora()},
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def _run_job(bind, job_id: str) -> None:
+    """
+    Executa um job de relatório com uma sessão própria.
+
+    O job só é iniciado se ainda estiver PENDENTE, e o resultado só é
+    gravado se ele continuar EXECUTANDO por este processo: um job dado como
+    interrompido não volta a mudar de situação.
+
+    Args:
+        bind: Engine/conexão do banco usada pela requisição que criou o job
+        job_id: ID do job
+    """
+    executor = _executor_id()
+    try:
+        with Session(bind=bind) as db:
+            agora = _agora()
+            iniciado = db.query(RelatorioJob).filter(
+                RelatorioJob.id == job_id,
+                RelatorioJob.status == StatusJobEnum.PENDENTE
+            ).update(
+                {
+                    RelatorioJob.status: StatusJobEnum.EXECUTANDO,
+                    RelatorioJob.etapa: EtapaJobEnum.CONSULTA,
+                    RelatorioJob.executor: executor,
+                    RelatorioJob.iniciado_em: agora,
+                    RelatorioJob.atualizado_em: agora,
+                },
+                synchronize_session=False
+            )
+            db.commit()
+            if not iniciado:
+                return
+
+            job = db.query(RelatorioJob).filter(RelatorioJob.id == job_id).one()
+            params_schema, relatorio, response_schema = RELATORIOS[job.tipo]
+            try:
+                params = params_schema.model_validate(job.parametros)
+                resultado = relatorio(db, **params.model_dump())
+                _avancar_etapa(db, job_id, executor, EtapaJobEnum.GRAVACAO)
+                valores = {
+                    RelatorioJob.status: StatusJobEnum.CONCLUIDO,
+                    RelatorioJob.resultado: response_schema.model_validate(resultado).model_dump(mode="json"),
+                }
+            except Exception:
+                logger.exception("Falha ao executar job de relatório %s", job_id)
+                db.rollback()
+                valores = {
+                    RelatorioJob.status: StatusJobEnum.ERRO,
+                    RelatorioJob.erro: ERRO_JOB,
+                }
+
+            concluido_em = _agora()
+            valores[RelatorioJob.etapa] = EtapaJobEnum.FINALIZADO
+            valores[RelatorioJob.concluido_em] = concluido_em
+            valores[RelatorioJob.atualizado_em] = concluido_em
+            valores[RelatorioJob.expira_em] = concluido_em + timedelta(seconds=settings.REPORT_JOB_TTL_SECONDS)
+            db.query(RelatorioJob).filter(
+                RelatorioJob.id == job_id,
+                RelatorioJob.status == StatusJobEnum.EXECUTANDO,
+                RelatorioJob.executor == executor
+            ).update(valores, synchronize_session=False)
+            db.commit()
+    finally:
+        with _executor_lock:
+            _jobs_locais.discard(job_id)
+
+
+def get_job(db: Session, job_id: str, usuario: Usuario) -> RelatorioJob:
+    """
+    Obtém um job de relatório visível ao usuário.
+
+    Administradores veem todos os jobs; os demais, apenas os próprios. Um
+    job pendente ou em andamento sem batimento recente é marcado como erro.
+
+    Args:
+        db: Sessão do banco de dados
+        job_id: ID do job
+        usuario: Usuário autenticado
+
+    Returns:
+        Job encontrado
+
+    Raises:
+        HTTPException: Se o job não existir, tiver expirado ou for de outro usuário
+    """
+    job = db.query(RelatorioJob).filter(RelatorioJob.id == job_id).first()
+    if job is not None and _marcar_interrompidos(db, RelatorioJob.id == job_id):
+        db.refresh(job)
+    expirado = job is not None and job.expira_em is not None and _utc(job.expira_em) < _agora()
+    if (
+        job is None
+        or expirado
+        or (usuario.role != RoleEnum.ADMIN and job.usuario_id != usuario.id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job de relatório não encontrado"
+        )
+    return job
+
+
+def get_job_resultado(db: Session, job_id: str, usuario: Usuario) -> RelatorioJob:
+    """
+    Obtém um job de relatório concluído, com seu resultado.
+
+    Args:
+        db: Sessão do banco de dados
+        job_id: ID do job
+        usuario: Usuário autenticado
+
+    Returns:
+        Job concluído
+
+    Raises:
+        HTTPException: Se o job não for encontrado ou ainda não tiver resultado
+    """
+    job = get_job(db, job_id, usuario)
+    if job.status == StatusJobEnum.ERRO:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job de relatório falhou: {job.erro}"
+        )
+    if job.status != StatusJobEnum.CONCLUIDO:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job de relatório ainda não foi concluído"
+        )
+    return job
@@ -1,35 +1,293 @@
 """
 Serviço de Relatórios.
 Lógica de negócio para geração de relatórios e estatísticas.
+
+Os relatórios de totais (período, tipo, comunidade e série mensal) leem os
+meses fechados a partir dos fechamentos e só agregam contribuicoes nos
+trechos ainda abertos. Com ``fonte="parquet"`` os mesmos agregados vêm da
+extração Parquet (parquet_store), sem consultar o banco.
 """
+import base64
+import calendar
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import List, Optional, Literal
+from types import SimpleNamespace
+from typing import List, Optional, Literal, Sequence, Tuple
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import Integer, func, extract, and_, or_, case, cast, tuple_
 
 from app.models.dizimista import Dizimista
 from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
 from app.models.comunidade import Comunidade
+from app.models.fechamento import FechamentoMensal, FechamentoTotal
+from app.config import settings
+from app.services.report_cache import cached_report, aniversariantes_cache
+from app.services.analytics_engine import analytics_engine
+from app.services import parquet_store
 
+# Número máximo de meses aceitos pela série mensal
+SERIE_MENSAL_MAX_MESES = 60
 
-def get_aniversariantes(
+# Percentis calculados pelo relatório de distribuição de valores
+PERCENTIS = (0.25, 0.5, 0.9)
+
+# Linhas lidas do cursor por bloco no cálculo da distribuição com NumPy
+LOTE_DISTRIBUICAO = 50000
+
+# Executor das consultas do dashboard; limita as conexões usadas em paralelo
+_dashboard_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="dashboard")
+
+
+def _is_postgresql(db: Session) -> bool:
+    """Indica se a sessão está conectada a um banco PostgreSQL."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _totais_vazios() -> dict:
+    """Cria o dicionário de totais zerados para todos os tipos."""
+    return {tipo: {"tipo": tipo, "total": Decimal("0.00"), "quantidade": 0} for tipo in TipoContribuicaoEnum}
+
+
+def _mes_key(data: date) -> int:
+    """Converte uma data na chave de mês YYYYMM."""
+    return data.year * 100 + data.month
+
+
+def _iter_meses(start_date: date, end_date: date) -> List[int]:
+    """
+    Lista as chaves de mês (YYYYMM) cobertas por um período, em ordem.
+
+    Args:
+        start_date: Data de início
+        end_date: Data de fim
+
+    Returns:
+        Lista de chaves de mês
+    """
+    meses = []
+    ano, mes = start_date.year, start_date.month
+    while ano * 100 + mes <= _mes_key(end_date):
+        meses.append(ano * 100 + mes)
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+    return meses
+
+
+def _segmentos_abertos(start_date: date, end_date: date, fechados: set) -> List[Tuple[date, date]]:
+    """
+    Divide um período nos trechos que não pertencem a meses fechados.
+
+    Args:
+        start_date: Data de início
+        end_date: Data de fim
+        fechados: Chaves de mês (YYYYMM) fechadas e inteiramente no período
+
+    Returns:
+        Lista de (início, fim) contíguos, em ordem
+    """
+    segmentos = []
+    for chave in _iter_meses(start_date, end_date):
+        if chave in fechados:
+            continue
+        ano, mes = divmod(chave, 100)
+        inicio = max(start_date, date(ano, mes, 1))
+        fim = min(end_date, date(ano, mes, calendar.monthrange(ano, mes)[1]))
+        if segmentos and segmentos[-1][1] + timedelta(days=1) == inicio:
+            segmentos[-1] = (segmentos[-1][0], fim)
+        else:
+            segmentos.append((inicio, fim))
+    return segmentos
+
+
+def _agregados_com_fechamentos(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    comunidade_id: Optional[int] = None,
+    paroquia_id: Optional[int] = None
+) -> Optional[dict]:
+    """
+    Agrega contribuições por comunidade, tipo e mês usando os fechamentos.
+
+    Meses fechados inteiramente contidos no período são lidos dos totais
+    congelados (uma linha por tipo e forma de pagamento); apenas os trechos
+    abertos de cada comunidade são agregados a partir de contribuicoes.
+
+    Args:
+        db: Sessão do banco de dados
+        start_date: Data de início
+        end_date: Data de fim
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        paroquia_id: ID da paróquia para filtrar (opcional)
+
+    Returns:
+        Dicionário (comunidade_id, tipo, mês YYYYMM) -> [total, quantidade],
+        ou None se nenhum mês fechado estiver inteiramente no período
+    """
+    primeiro = start_date if start_date.day == 1 else (
+        start_date.replace(day=28) + timedelta(days=4)
+    ).replace(day=1)
+    ultimo = end_date if (end_date + timedelta(days=1)).day == 1 else end_date.replace(day=1) - timedelta(days=1)
+    if primeiro > ultimo:
+        return None
+
+    fechados_query = db.query(
+        FechamentoMensal.id, FechamentoMensal.comunidade_id, FechamentoMensal.mes
+    ).filter(FechamentoMensal.mes.between(_mes_key(primeiro), _mes_key(ultimo)))
+    comunidades_query = db.query(Comunidade.id)
+    if comunidade_id is not None:
+        fechados_query = fechados_query.filter(FechamentoMensal.comunidade_id == comunidade_id)
+    if paroquia_id is not None:
+        fechados_query = fechados_query.join(
+            Comunidade, Comunidade.id == FechamentoMensal.comunidade_id
+        ).filter(Comunidade.paroquia_id == paroquia_id)
+        comunidades_query = comunidades_query.filter(Comunidade.paroquia_id == paroquia_id)
+
+    fechados = fechados_query.all()
+    if not fechados:
+        return None
+
+    agregados = {}
+    for r in db.query(
+        FechamentoMensal.comunidade_id,
+        FechamentoMensal.mes,
+        FechamentoTotal.tipo,
+        func.sum(FechamentoTotal.total).label("total"),
+        func.sum(FechamentoTotal.quantidade).label("quantidade")
+    ).join(FechamentoMensal.totais).filter(
+        FechamentoMensal.id.in_([f.id for f in fechados])
+    ).group_by(FechamentoMensal.comunidade_id, FechamentoMensal.mes, FechamentoTotal.tipo).all():
+        agregados[(r.comunidade_id, r.tipo, r.mes)] = [r.total, int(r.quantidade)]
+
+    # Comunidades com os mesmos trechos abertos compartilham um predicado
+    meses_fechados = {}
+    for f in fechados:
+        meses_fechados.setdefault(f.comunidade_id, set()).add(f.mes)
+    comunidades = [comunidade_id] if comunidade_id is not None else [c.id for c in comunidades_query.all()]
+    por_segmentos = {}
+    for c in comunidades:
+        segmentos = tuple(_segmentos_abertos(start_date, end_date, meses_fechados.get(c, set())))
+        if segmentos:
+            por_segmentos.setdefault(segmentos, []).append(c)
+
+    if por_segmentos:
+        mes = (
+            extract('year', Contribuicao.data_contribuicao) * 100
+            + extract('month', Contribuicao.data_contribuicao)
+        ).label("mes")
+        trechos = or_(*[
+            and_(
+                Contribuicao.comunidade_id.in_(ids),
+                or_(*[Contribuicao.data_contribuicao.between(inicio, fim) for inicio, fim in segmentos])
+            )
+            for segmentos, ids in por_segmentos.items()
+        ])
+        for r in db.query(
+            Contribuicao.comunidade_id,
+            Contribuicao.tipo,
+            mes,
+            func.sum(Contribuicao.valor).label("total"),
+            func.count(Contribuicao.id).label("quantidade")
+        ).filter(trechos).group_by(Contribuicao.comunidade_id, Contribuicao.tipo, mes).all():
+            agregados[(r.comunidade_id, r.tipo, int(r.mes))] = [r.total, r.quantidade]
+
+    return agregados
+
+
+def _agregados(
+    db: Session,
+    fonte: str,
+    start_date: date,
+    end_date: date,
+    comunidade_id: Optional[int] = None,
+    paroquia_id: Optional[int] = None
+) -> Optional[dict]:
+    """
+    Agregados por comunidade, tipo e mês da fonte pedida.
+
+    Na extração Parquet todos os meses vêm agregados; no banco, apenas
+    quando houver meses fechados no período (ver _agregados_com_fechamentos).
+    """
+    if fonte == "parquet":
+        return parquet_store.agregados(start_date, end_date, comunidade_id, paroquia_id)
+    return _agregados_com_fechamentos(db, start_date, end_date, comunidade_id, paroquia_id)
+
+
+def _agrupar(agregados: dict, *campos: str) -> list:
+    """
+    Soma agregados por comunidade, tipo e mês em um agrupamento menor.
+
+    Args:
+        agregados: Resultado de _agregados_com_fechamentos
+        campos: Campos mantidos ("comunidade_id", "tipo", "mes")
+
+    Returns:
+        Linhas com os campos pedidos, total e quantidade
+    """
+    grupos = {}
+    for (comunidade_id, tipo, mes), (total, quantidade) in agregados.items():
+        valores = {"comunidade_id": comunidade_id, "tipo": tipo, "mes": mes}
+        grupo = grupos.setdefault(tuple(valores[campo] for campo in campos), [Decimal("0.00"), 0])
+        grupo[0] += total
+        grupo[1] += quantidade
+    return [
+        SimpleNamespace(**dict(zip(campos, chave, strict=True)), total=total, quantidade=quantidade)
+        for chave, (total, quantidade) in grupos.items()
+    ]
+
+
+def _mmdd(data: date) -> int:
+    """Converte uma data na chave de aniversário MMDD."""
+    return data.month * 100 + data.day
+
+
+def _faixas_aniversario(inicio: date, fim: date) -> List[Tuple[int, int]]:
+    """
+    Converte uma janela de datas em faixas de chaves de aniversário (MMDD).
+
+    Janelas que atravessam a virada do ano viram duas faixas. Em anos não
+    bissextos, quem nasceu em 29/02 comemora em 28/02, então uma janela
+    que termina em 28/02 inclui também a chave 229.
+
+    Args:
+        inicio: Primeiro dia da janela
+        fim: Último dia da janela
+
+    Returns:
+        Lista de faixas (início, fim) inclusivas
+    """
+    if (fim - inicio).days >= 365:
+        return [(101, 1231)]
+
+    mmdd_inicio, mmdd_fim = _mmdd(inicio), _mmdd(fim)
+    if mmdd_fim == 228 and not calendar.isleap(fim.year):
+        mmdd_fim = 229
+
+    if mmdd_inicio <= mmdd_fim:
+        return [(mmdd_inicio, mmdd_fim)]
+    return [(mmdd_inicio, 1231), (101, mmdd_fim)]
+
+
+def _consultar_aniversariantes(
     db: Session,
-    periodo: Literal["hoje", "7dias", "mes"],
+    faixas: List[Tuple[int, int]],
     comunidade_id: Optional[int] = None
 ) -> List[dict]:
     """
-    Obtém dizimistas aniversariantes.
+    Consulta dizimistas ativos com aniversário dentro das faixas MMDD.
+
+    As buscas usam a chave aniversario_mmdd, coberta pelos índices
+    (ativo, aniversario_mmdd) e (comunidade_id, ativo, aniversario_mmdd).
 
     Args:
         db: Sessão do banco de dados
-        periodo: Período de aniversário ('hoje', '7dias', 'mes')
+        faixas: Faixas de chaves de aniversário (ver _faixas_aniversario)
         comunidade_id: ID da comunidade para filtrar (opcional)
 
     Returns:
-        Lista de aniversariantes
+        Lista de aniversariantes, em ordem de aniversário a partir da primeira faixa
     """
-    hoje = date.today()
     query = db.query(
         Dizimista.id,
         Dizimista.nome,
@@ -40,45 +298,21 @@ def get_aniversariantes(
         Comunidade.nome.label("comunidade_nome")
     ).join(Comunidade)
 
-    # Filtrar apenas ativos com data de nascimento
+    # Filtrar apenas ativos com aniversário dentro da janela
     query = query.filter(
-        Dizimista.ativo == True,
-        Dizimista.data_nascimento.isnot(None)
+        Dizimista.ativo.is_(True),
+        or_(*[Dizimista.aniversario_mmdd.between(a, b) for a, b in faixas])
     )
 
     # Filtrar por comunidade se especificado
     if comunidade_id is not None:
         query = query.filter(Dizimista.comunidade_id == comunidade_id)
 
-    # Determinar intervalo de datas baseado no período
-    if periodo == "hoje":
-        query = query.filter(
-            extract('month', Dizimista.data_nascimento) == hoje.month,
-            extract('day', Dizimista.data_nascimento) == hoje.day
-        )
-    elif periodo == "7dias":
-        # Próximos 7 dias
-        fim = hoje + timedelta(days=7)
-        # Lidar com mudança de ano
-        if hoje.year == fim.year:
-            query = query.filter(
-                extract('month', Dizimista.data_nascimento) * 100 + extract('day', Dizimista.data_nascimento) >= hoje.month * 100 + hoje.day,
-                extract('month', Dizimista.data_nascimento) * 100 + extract('day', Dizimista.data_nascimento) <= fim.month * 100 + fim.day
-            )
-        else:
-            # Aniversários até o fim do ano ou do início do ano até a data fim
-            query = query.filter(
-                (extract('month', Dizimista.data_nascimento) * 100 + extract('day', Dizimista.data_nascimento) >= hoje.month * 100 + hoje.day) |
-                (extract('month', Dizimista.data_nascimento) * 100 + extract('day', Dizimista.data_nascimento) <= fim.month * 100 + fim.day)
-            )
-    elif periodo == "mes":
-        query = query.filter(
-            extract('month', Dizimista.data_nascimento) == hoje.month
-        )
-
+    # Na virada do ano, os aniversários de dezembro vêm antes dos de janeiro
     results = query.order_by(
-        extract('month', Dizimista.data_nascimento),
-        extract('day', Dizimista.data_nascimento)
+        case((Dizimista.aniversario_mmdd >= faixas[0][0], 0), else_=1),
+        Dizimista.aniversario_mmdd,
+        Dizimista.nome
     ).all()
 
     return [
@@ -95,11 +329,84 @@ def get_aniversariantes(
     ]
 
 
+def _janela_do_dia(hoje: date) -> Tuple[date, date]:
+    """
+    Janela coberta pela lista diária de aniversariantes.
+
+    Inclui o mês atual e os próximos 7 dias, cobrindo os períodos
+    'hoje', '7dias' e 'mes'.
+    """
+    fim_mes = hoje.replace(day=calendar.monthrange(hoje.year, hoje.month)[1])
+    return hoje.replace(day=1), max(fim_mes, hoje + timedelta(days=7))
+
+
+def get_aniversariantes(
+    db: Session,
+    periodo: Literal["hoje", "7dias", "mes", "intervalo"],
+    comunidade_id: Optional[int] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None
+) -> List[dict]:
+    """
+    Obtém dizimistas aniversariantes.
+
+    Os períodos 'hoje', '7dias' e 'mes' são filtrados a partir de uma lista
+    diária por comunidade, calculada na primeira consulta do dia e
+    invalidada quando um dizimista é alterado. O período 'intervalo'
+    consulta o banco diretamente.
+
+    Args:
+        db: Sessão do banco de dados
+        periodo: Período de aniversário ('hoje', '7dias', 'mes', 'intervalo')
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        data_inicio: Início da janela, para o período 'intervalo'
+        data_fim: Fim da janela, para o período 'intervalo'
+
+    Returns:
+        Lista de aniversariantes, em ordem de aniversário a partir do início da janela
+    """
+    hoje = date.today()
+
+    # Determinar janela de datas baseada no período
+    if periodo == "hoje":
+        inicio, fim = hoje, hoje
+    elif periodo == "7dias":
+        inicio, fim = hoje, hoje + timedelta(days=7)
+    elif periodo == "mes":
+        inicio = hoje.replace(day=1)
+        fim = hoje.replace(day=calendar.monthrange(hoje.year, hoje.month)[1])
+    else:
+        inicio, fim = data_inicio, data_fim
+
+    faixas = _faixas_aniversario(inicio, fim)
+    if periodo == "intervalo" or not settings.REPORT_CACHE_ENABLED:
+        return _consultar_aniversariantes(db, faixas, comunidade_id)
+
+    lista_do_dia = aniversariantes_cache.get_or_compute(
+        ("aniversariantes", hoje.isoformat(), comunidade_id),
+        comunidade_id,
+        lambda: _consultar_aniversariantes(db, _faixas_aniversario(*_janela_do_dia(hoje)), comunidade_id)
+    )
+
+    selecionados = []
+    for aniversariante in lista_do_dia:
+        mmdd = _mmdd(aniversariante["data_nascimento"])
+        if any(a <= mmdd <= b for a, b in faixas):
+            selecionados.append(aniversariante)
+
+    return sorted(
+        selecionados,
+        key=lambda a: (_mmdd(a["data_nascimento"]) < faixas[0][0], _mmdd(a["data_nascimento"]))
+    )
+
+
+@cached_report
 def get_total_by_period(
     db: Session,
     start_date: date,
     end_date: date,
-    comunidade_id: Optional[int] = None
+    comunidade_id: Optional[int] = None,
+    fonte: Literal["banco", "parquet"] = "banco"
 ) -> dict:
     """
     Obtém total de contribuições em um período.
@@ -109,22 +416,27 @@ def get_total_by_period(
         start_date: Data de início
         end_date: Data de fim
         comunidade_id: ID da comunidade para filtrar (opcional)
+        fonte: "banco" ou "parquet" (extração, sem consultar o banco)
 
     Returns:
         Dicionário com total e quantidade
     """
-    query = db.query(
-        func.sum(Contribuicao.valor).label("total"),
-        func.count(Contribuicao.id).label("quantidade")
-    ).filter(
-        Contribuicao.data_contribuicao >= start_date,
-        Contribuicao.data_contribuicao <= end_date
-    )
+    agregados = _agregados(db, fonte, start_date, end_date, comunidade_id)
+    if agregados is not None:
+        result = (_agrupar(agregados) or [SimpleNamespace(total=None, quantidade=0)])[0]
+    else:
+        query = db.query(
+            func.sum(Contribuicao.valor).label("total"),
+            func.count(Contribuicao.id).label("quantidade")
+        ).filter(
+            Contribuicao.data_contribuicao >= start_date,
+            Contribuicao.data_contribuicao <= end_date
+        )
 
-    if comunidade_id is not None:
-        query = query.filter(Contribuicao.comunidade_id == comunidade_id)
+        if comunidade_id is not None:
+            query = query.filter(Contribuicao.comunidade_id == comunidade_id)
 
-    result = query.first()
+        result = query.first()
 
     return {
         "total": result.total or Decimal("0.00"),
@@ -135,11 +447,13 @@ def get_total_by_period(
     }
 
 
+@cached_report
 def get_total_by_tipo(
     db: Session,
     start_date: date,
     end_date: date,
-    comunidade_id: Optional[int] = None
+    comunidade_id: Optional[int] = None,
+    fonte: Literal["banco", "parquet"] = "banco"
 ) -> dict:
     """
     Obtém totais de contribuições por tipo em um período.
@@ -149,26 +463,31 @@ def get_total_by_tipo(
         start_date: Data de início
         end_date: Data de fim
         comunidade_id: ID da comunidade para filtrar (opcional)
+        fonte: "banco" ou "parquet" (extração, sem consultar o banco)
 
     Returns:
         Dicionário com totais por tipo
     """
-    query = db.query(
-        Contribuicao.tipo,
-        func.sum(Contribuicao.valor).label("total"),
-        func.count(Contribuicao.id).label("quantidade")
-    ).filter(
-        Contribuicao.data_contribuicao >= start_date,
-        Contribuicao.data_contribuicao <= end_date
-    )
+    agregados = _agregados(db, fonte, start_date, end_date, comunidade_id)
+    if agregados is not None:
+        results = _agrupar(agregados, "tipo")
+    else:
+        query = db.query(
+            Contribuicao.tipo,
+            func.sum(Contribuicao.valor).label("total"),
+            func.count(Contribuicao.id).label("quantidade")
+        ).filter(
+            Contribuicao.data_contribuicao >= start_date,
+            Contribuicao.data_contribuicao <= end_date
+        )
 
-    if comunidade_id is not None:
-        query = query.filter(Contribuicao.comunidade_id == comunidade_id)
+        if comunidade_id is not None:
+            query = query.filter(Contribuicao.comunidade_id == comunidade_id)
 
-    results = query.group_by(Contribuicao.tipo).all()
+        results = query.group_by(Contribuicao.tipo).all()
 
     # Garantir que todos os tipos estejam presentes
-    totais = {tipo: {"tipo": tipo, "total": Decimal("0.00"), "quantidade": 0} for tipo in TipoContribuicaoEnum}
+    totais = _totais_vazios()
 
     for result in results:
         totais[result.tipo] = {
@@ -185,37 +504,1125 @@ def get_total_by_tipo(
     }
 
 
-def get_dizimista_history(db: Session, dizimista_id: int) -> dict:
+@cached_report
+def get_total_by_comunidade(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    paroquia_id: Optional[int] = None,
+    fonte: Literal["banco", "parquet"] = "banco"
+) -> dict:
     """
-    Obtém histórico de contribuições de um dizimista.
+    Obtém totais de contribuições por comunidade e tipo em um período.
+
+    Retorna, em uma única consulta, os totais de cada comunidade × tipo,
+    os subtotais por comunidade e por tipo e o total geral. No PostgreSQL
+    os subtotais vêm do próprio GROUP BY CUBE; em outros bancos são
+    somados a partir dos grupos comunidade × tipo.
 
     Args:
         db: Sessão do banco de dados
-        dizimista_id: ID do dizimista
+        start_date: Data de início
+        end_date: Data de fim
+        paroquia_id: ID da paróquia para filtrar (opcional)
+        fonte: "banco" ou "parquet" (extração, sem consultar o banco)
 
     Returns:
-        Dicionário com histórico e totais
+        Dicionário com totais por comunidade, por tipo e geral
     """
-    dizimista = db.query(Dizimista).filter(Dizimista.id == dizimista_id).first()
-    if not dizimista:
-        return None
+    if fonte == "parquet":
+        lista_comunidades = parquet_store.comunidades(paroquia_id)
+    else:
+        comunidades_query = db.query(Comunidade.id, Comunidade.nome)
+        if paroquia_id is not None:
+            comunidades_query = comunidades_query.filter(Comunidade.paroquia_id == paroquia_id)
+        lista_comunidades = comunidades_query.order_by(Comunidade.nome).all()
 
-    # Obter contribuições
-    contribuicoes = (
-        db.query(Contribuicao)
-        .filter(Contribuicao.dizimista_id == dizimista_id)
-        .order_by(Contribuicao.data_contribuicao.desc())
-        .all()
-    )
+    # Com meses fechados no período, os grupos vêm dos fechamentos e os
+    # subtotais são somados aqui, como nos bancos sem CUBE
+    agregados = _agregados(db, fonte, start_date, end_date, paroquia_id=paroquia_id)
+    postgresql = _is_postgresql(db) and agregados is None
 
-    # Calcular totais
-    total_geral = sum(c.valor for c in contribuicoes)
-    quantidade_total = len(contribuicoes)
+    if agregados is not None:
+        results = _agrupar(agregados, "comunidade_id", "tipo")
+    else:
+        colunas = [
+            Contribuicao.comunidade_id,
+            Contribuicao.tipo,
+            func.sum(Contribuicao.valor).label("total"),
+            func.count(Contribuicao.id).label("quantidade"),
+        ]
+        if postgresql:
+            colunas += [
+                func.grouping(Contribuicao.comunidade_id).label("sem_comunidade"),
+                func.grouping(Contribuicao.tipo).label("sem_tipo"),
+            ]
+
+        query = db.query(*colunas).filter(
+            Contribuicao.data_contribuicao >= start_date,
+            Contribuicao.data_contribuicao <= end_date
+        )
+
+        if paroquia_id is not None:
+            query = query.join(Comunidade).filter(Comunidade.paroquia_id == paroquia_id)
+
+        if postgresql:
+            results = query.group_by(func.cube(Contribuicao.comunidade_id, Contribuicao.tipo)).all()
+        else:
+            results = query.group_by(Contribuicao.comunidade_id, Contribuicao.tipo).all()
+
+    # Todas as comunidades do escopo aparecem, mesmo sem contribuições
+    comunidades = {
+        id_comunidade: {
+            "comunidade_id": id_comunidade,
+            "comunidade_nome": nome,
+            "total": Decimal("0.00"),
+            "quantidade": 0,
+            "totais": _totais_vazios(),
+        }
+        for id_comunidade, nome in lista_comunidades
+    }
+    totais_tipo = _totais_vazios()
+    geral = {"total": Decimal("0.00"), "quantidade": 0}
+
+    for result in results:
+        total = result.total or Decimal("0.00")
+        quantidade = result.quantidade or 0
+
+        if postgresql:
+            # Linhas de subtotal e total geral geradas pelo CUBE
+            if result.sem_comunidade and result.sem_tipo:
+                geral = {"total": total, "quantidade": quantidade}
+            elif result.sem_comunidade:
+                totais_tipo[result.tipo] = {"tipo": result.tipo, "total": total, "quantidade": quantidade}
+            elif result.sem_tipo:
+                comunidades[result.comunidade_id].update(total=total, quantidade=quantidade)
+            else:
+                comunidades[result.comunidade_id]["totais"][result.tipo] = {
+                    "tipo": result.tipo, "total": total, "quantidade": quantidade
+                }
+            continue
+
+        comunidade = comunidades[result.comunidade_id]
+        comunidade["totais"][result.tipo] = {"tipo": result.tipo, "total": total, "quantidade": quantidade}
+        comunidade["total"] += total
+        comunidade["quantidade"] += quantidade
+        totais_tipo[result.tipo]["total"] += total
+        totais_tipo[result.tipo]["quantidade"] += quantidade
+        geral["total"] += total
+        geral["quantidade"] += quantidade
+
+    for comunidade in comunidades.values():
+        comunidade["totais"] = list(comunidade["totais"].values())
 
     return {
-        "dizimista_id": dizimista.id,
-        "dizimista_nome": dizimista.nome,
-        "total_geral": total_geral,
-        "quantidade_total": quantidade_total,
-        "contribuicoes": contribuicoes,
+        "data_inicio": start_date,
+        "data_fim": end_date,
+        "paroquia_id": paroquia_id,
+        "total": geral["total"],
+        "quantidade": geral["quantidade"],
+        "totais": list(totais_tipo.values()),
+        "comunidades": list(comunidades.values()),
+    }
+
+
+@cached_report
+def get_serie_mensal(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    comunidade_id: Optional[int] = None,
+    por_comunidade: bool = False,
+    fonte: Literal["banco", "parquet"] = "banco"
+) -> dict:
+    """
+    Obtém a série mensal de contribuições por tipo em um período.
+
+    Todos os meses são calculados em uma única consulta agrupada por mês
+    e tipo (e comunidade, se solicitado). Meses sem contribuições são
+    preenchidos com zero.
+
+    Args:
+        db: Sessão do banco de dados
+        start_date: Data de início
+        end_date: Data de fim
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        por_comunidade: Se True, gera uma série por comunidade e tipo
+        fonte: "banco" ou "parquet" (extração, sem consultar o banco)
+
+    Returns:
+        Dicionário com as séries mensais
+    """
+    agregados = _agregados(db, fonte, start_date, end_date, comunidade_id)
+    if agregados is not None:
+        campos = ["tipo", "mes"]
+        if por_comunidade:
+            campos.insert(0, "comunidade_id")
+        results = _agrupar(agregados, *campos)
+    else:
+        mes = (
+            extract('year', Contribuicao.data_contribuicao) * 100
+            + extract('month', Contribuicao.data_contribuicao)
+        ).label("mes")
+
+        colunas = [Contribuicao.tipo, mes]
+        if por_comunidade:
+            colunas.insert(0, Contribuicao.comunidade_id)
+
+        query = db.query(
+            *colunas,
+            func.sum(Contribuicao.valor).label("total"),
+            func.count(Contribuicao.id).label("quantidade")
+        ).filter(
+            Contribuicao.data_contribuicao >= start_date,
+            Contribuicao.data_contribuicao <= end_date
+        )
+
+        if comunidade_id is not None:
+            query = query.filter(Contribuicao.comunidade_id == comunidade_id)
+
+        results = query.group_by(*colunas).all()
+
+    # Indexar resultados por (comunidade, tipo) -> mês
+    valores = {}
+    for result in results:
+        chave_comunidade = result.comunidade_id if por_comunidade else comunidade_id
+        valores.setdefault((chave_comunidade, result.tipo), {})[int(result.mes)] = result
+
+    if por_comunidade:
+        comunidades = sorted({chave[0] for chave in valores})
+    else:
+        comunidades = [comunidade_id]
+
+    # Preencher lacunas: todos os meses e tipos presentes em cada série
+    meses = _iter_meses(start_date, end_date)
+    series = []
+    for chave_comunidade in comunidades:
+        for tipo in TipoContribuicaoEnum:
+            por_mes = valores.get((chave_comunidade, tipo), {})
+            pontos = []
+            for chave_mes in meses:
+                result = por_mes.get(chave_mes)
+                pontos.append({
+                    "mes": f"{chave_mes // 100:04d}-{chave_mes % 100:02d}",
+                    "total": (result.total if result else None) or Decimal("0.00"),
+                    "quantidade": (result.quantidade if result else None) or 0,
+                })
+            series.append({
+                "tipo": tipo,
+                "comunidade_id": chave_comunidade,
+                "pontos": pontos,
+            })
+
+    return {
+        "data_inicio": start_date,
+        "data_fim": end_date,
+        "comunidade_id": comunidade_id,
+        "series": series,
     }
+
+
+@cached_report
+def get_ranking_dizimistas(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    limite: int = 10,
+    comunidade_id: Optional[int] = None,
+    tipo: Optional[TipoContribuicaoEnum] = None
+) -> dict:
+    """
+    Obtém os dizimistas que mais contribuíram em um período, por comunidade.
+
+    A classificação é feita em uma única consulta: os totais por
+    comunidade × dizimista são numerados com ROW_NUMBER() por comunidade e
+    só as primeiras posições de cada uma são retornadas. O índice
+    (comunidade_id, data_contribuicao, dizimista_id) INCLUDE (valor)
+    permite agregar sem ler a tabela no PostgreSQL.
+
+    Args:
+        db: Sessão do banco de dados
+        start_date: Data de início
+        end_date: Data de fim
+        limite: Quantidade de dizimistas por comunidade
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        tipo: Tipo de contribuição para filtrar (opcional)
+
+    Returns:
+        Dicionário com o ranking de cada comunidade
+    """
+    totais = db.query(
+        Contribuicao.comunidade_id,
+        Contribuicao.dizimista_id,
+        func.sum(Contribuicao.valor).label("total"),
+        func.count(Contribuicao.id).label("quantidade")
+    ).filter(
+        Contribuicao.data_contribuicao >= start_date,
+        Contribuicao.data_contribuicao <= end_date,
+        Contribuicao.dizimista_id.isnot(None)
+    )
+
+    if comunidade_id is not None:
+        totais = totais.filter(Contribuicao.comunidade_id == comunidade_id)
+
+    if tipo is not None:
+        totais = totais.filter(Contribuicao.tipo == tipo)
+
+    totais = totais.group_by(Contribuicao.comunidade_id, Contribuicao.dizimista_id).subquery()
+
+    classificados = db.query(
+        totais,
+        func.row_number().over(
+            partition_by=totais.c.comunidade_id,
+            order_by=(totais.c.total.desc(), totais.c.dizimista_id)
+        ).label("posicao")
+    ).subquery()
+
+    results = db.query(
+        classificados,
+        Dizimista.nome.label("dizimista_nome"),
+        Comunidade.nome.label("comunidade_nome")
+    ).join(
+        Dizimista, Dizimista.id == classificados.c.dizimista_id
+    ).join(
+        Comunidade, Comunidade.id == classificados.c.comunidade_id
+    ).filter(
+        classificados.c.posicao <= limite
+    ).order_by(
+        Comunidade.nome, classificados.c.comunidade_id, classificados.c.posicao
+    ).all()
+
+    comunidades = {}
+    for r in results:
+        comunidade = comunidades.setdefault(r.comunidade_id, {
+            "comunidade_id": r.comunidade_id,
+            "comunidade_nome": r.comunidade_nome,
+            "dizimistas": [],
+        })
+        comunidade["dizimistas"].append({
+            "posicao": r.posicao,
+            "dizimista_id": r.dizimista_id,
+            "dizimista_nome": r.dizimista_nome,
+            "total": r.total,
+            "quantidade": r.quantidade,
+        })
+
+    return {
+        "data_inicio": start_date,
+        "data_fim": end_date,
+        "comunidade_id": comunidade_id,
+        "tipo": tipo,
+        "limite": limite,
+        "comunidades": list(comunidades.values()),
+    }
+
+
+def _janelas_comparativo(
+    periodo: Literal["mes", "ano"],
+    comparacao: Literal["periodo_anterior", "ano_anterior"],
+    data_referencia: date
+) -> Tuple[Tuple[date, date], Tuple[date, date]]:
+    """
+    Calcula as janelas atual e de comparação de um relatório comparativo.
+
+    Args:
+        periodo: "mes" ou "ano"
+        comparacao: "periodo_anterior" (mês/ano anterior) ou "ano_anterior"
+            (mesmo período do ano anterior)
+        data_referencia: Data contida na janela atual
+
+    Returns:
+        Tupla com ((início, fim) atual, (início, fim) de comparação)
+    """
+    if periodo == "ano":
+        atual = (date(data_referencia.year, 1, 1), date(data_referencia.year, 12, 31))
+        anterior = (date(data_referencia.year - 1, 1, 1), date(data_referencia.year - 1, 12, 31))
+        return atual, anterior
+
+    inicio = data_referencia.replace(day=1)
+    atual = (inicio, date(inicio.year, inicio.month, calendar.monthrange(inicio.year, inicio.month)[1]))
+    inicio_anterior = _subtrair_meses(inicio, 12 if comparacao == "ano_anterior" else 1)
+    anterior = (
+        inicio_anterior,
+        date(
+            inicio_anterior.year,
+            inicio_anterior.month,
+            calendar.monthrange(inicio_anterior.year, inicio_anterior.month)[1]
+        )
+    )
+    return atual, anterior
+
+
+def _linha_comparativo(tipo, comunidade_id, total_atual, total_anterior, quantidade_atual, quantidade_anterior) -> dict:
+    """Monta uma linha do comparativo com diferença e variação percentual."""
+    diferenca = total_atual - total_anterior
+    variacao = None
+    if total_anterior:
+        variacao = (diferenca * 100 / total_anterior).quantize(Decimal("0.01"))
+    return {
+        "tipo": tipo,
+        "comunidade_id": comunidade_id,
+        "total_atual": total_atual,
+        "total_anterior": total_anterior,
+        "quantidade_atual": quantidade_atual,
+        "quantidade_anterior": quantidade_anterior,
+        "diferenca": diferenca,
+        "variacao_percentual": variacao,
+    }
+
+
+def get_comparativo(
+    db: Session,
+    periodo: Literal["mes", "ano"] = "mes",
+    comparacao: Literal["periodo_anterior", "ano_anterior"] = "periodo_anterior",
+    data_referencia: Optional[date] = None,
+    comunidade_id: Optional[int] = None,
+    por_comunidade: bool = False,
+    stale_ok: bool = False
+) -> dict:
+    """
+    Compara os totais de um mês ou ano com o período de comparação.
+
+    As duas janelas são calculadas na mesma varredura, com agregações
+    condicionais (SUM/COUNT de CASE) agrupadas por tipo e, opcionalmente,
+    por comunidade. A data de referência é resolvida antes do cache, para
+    que a virada do dia (e do mês) gere uma nova chave.
+
+    Args:
+        db: Sessão do banco de dados
+        periodo: "mes" ou "ano"
+        comparacao: "periodo_anterior" ou "ano_anterior" (mesmo mês do ano anterior)
+        data_referencia: Data contida no período atual (padrão: hoje)
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        por_comunidade: Se True, gera uma linha por comunidade e tipo
+        stale_ok: Se aceita resultado defasado do cache
+
+    Returns:
+        Dicionário com as janelas comparadas, as linhas por tipo (e
+        comunidade) e a linha consolidada
+    """
+    return _comparativo(
+        db, periodo, comparacao, data_referencia or date.today(), comunidade_id, por_comunidade,
+        stale_ok=stale_ok
+    )
+
+
+@cached_report
+def _comparativo(
+    db: Session,
+    periodo: Literal["mes", "ano"],
+    comparacao: Literal["periodo_anterior", "ano_anterior"],
+    data_referencia: date,
+    comunidade_id: Optional[int],
+    por_comunidade: bool
+) -> dict:
+    """Calcula o comparativo de get_comparativo para uma data de referência já resolvida."""
+    (inicio_atual, fim_atual), (inicio_anterior, fim_anterior) = _janelas_comparativo(
+        periodo, comparacao, data_referencia
+    )
+
+    na_atual = Contribuicao.data_contribuicao.between(inicio_atual, fim_atual)
+    na_anterior = Contribuicao.data_contribuicao.between(inicio_anterior, fim_anterior)
+
+    colunas = [Contribuicao.tipo]
+    if por_comunidade:
+        colunas.append(Contribuicao.comunidade_id)
+
+    query = db.query(
+        *colunas,
+        func.sum(case((na_atual, Contribuicao.valor), else_=0)).label("total_atual"),
+        func.sum(case((na_anterior, Contribuicao.valor), else_=0)).label("total_anterior"),
+        func.count(case((na_atual, 1))).label("quantidade_atual"),
+        func.count(case((na_anterior, 1))).label("quantidade_anterior")
+    ).filter(or_(na_atual, na_anterior))
+
+    if comunidade_id is not None:
+        query = query.filter(Contribuicao.comunidade_id == comunidade_id)
+
+    results = query.group_by(*colunas).all()
+
+    linhas = {}
+    if not por_comunidade:
+        # Garantir que todos os tipos estejam presentes
+        for tipo in TipoContribuicaoEnum:
+            linhas[(tipo, None)] = (Decimal("0.00"), Decimal("0.00"), 0, 0)
+    for r in results:
+        chave = (r.tipo, r.comunidade_id if por_comunidade else None)
+        linhas[chave] = (
+            Decimal(r.total_atual or 0),
+            Decimal(r.total_anterior or 0),
+            r.quantidade_atual or 0,
+            r.quantidade_anterior or 0,
+        )
+
+    itens = [
+        _linha_comparativo(tipo, linha_comunidade, *valores)
+        for (tipo, linha_comunidade), valores in sorted(
+            linhas.items(), key=lambda item: (item[0][1] or 0, item[0][0].value)
+        )
+    ]
+    consolidado = _linha_comparativo(
+        None,
+        comunidade_id,
+        sum((item["total_atual"] for item in itens), Decimal("0.00")),
+        sum((item["total_anterior"] for item in itens), Decimal("0.00")),
+        sum(item["quantidade_atual"] for item in itens),
+        sum(item["quantidade_anterior"] for item in itens),
+    )
+
+    return {
+        "periodo": periodo,
+        "comparacao": comparacao,
+        "comunidade_id": comunidade_id,
+        "atual_inicio": inicio_atual,
+        "atual_fim": fim_atual,
+        "anterior_inicio": inicio_anterior,
+        "anterior_fim": fim_anterior,
+        "itens": itens,
+        "consolidado": consolidado,
+    }
+
+
+def _valor(numero) -> Decimal:
+    """Converte um número (float ou Decimal) em valor monetário com 2 casas."""
+    return Decimal(str(numero)).quantize(Decimal("0.01"))
+
+
+def _distribuicao_grupo(
+    tipo,
+    comunidade_id,
+    quantidade: int,
+    minimo,
+    maximo,
+    media,
+    percentis: list,
+    contagens: list
+) -> dict:
+    """Monta o resultado de distribuição de um grupo tipo (× comunidade)."""
+    faixas = len(contagens)
+    largura = (float(maximo) - float(minimo)) / faixas
+    return {
+        "tipo": tipo,
+        "comunidade_id": comunidade_id,
+        "quantidade": quantidade,
+        "minimo": _valor(minimo),
+        "maximo": _valor(maximo),
+        "media": _valor(media),
+        "p25": _valor(percentis[0]),
+        "p50": _valor(percentis[1]),
+        "p90": _valor(percentis[2]),
+        "histograma": [
+            {
+                "inicio": _valor(float(minimo) + largura * i),
+                "fim": _valor(float(minimo) + largura * (i + 1)) if i < faixas - 1 else _valor(maximo),
+                "quantidade": int(contagens[i]),
+            }
+            for i in range(faixas)
+        ],
+    }
+
+
+def _distribuicao_postgresql(db: Session, filtros: list, colunas: list, faixas: int) -> list:
+    """
+    Calcula a distribuição de valores no PostgreSQL.
+
+    Percentis com percentile_cont e histograma com width_bucket sobre o
+    mínimo e o máximo de cada grupo; nenhuma linha individual sai do banco.
+    """
+    estatisticas = db.query(
+        *colunas,
+        func.count(Contribuicao.id).label("quantidade"),
+        func.min(Contribuicao.valor).label("minimo"),
+        func.max(Contribuicao.valor).label("maximo"),
+        func.avg(Contribuicao.valor).label("media"),
+        *[
+            func.percentile_cont(p).within_group(Contribuicao.valor).label(f"p{i}")
+            for i, p in enumerate(PERCENTIS)
+        ]
+    ).filter(*filtros).group_by(*colunas).subquery()
+
+    # O valor máximo cai na última faixa; grupos com um único valor ficam na primeira
+    faixa = case(
+        (
+            estatisticas.c.maximo > estatisticas.c.minimo,
+            func.least(
+                func.width_bucket(Contribuicao.valor, estatisticas.c.minimo, estatisticas.c.maximo, faixas),
+                faixas
+            )
+        ),
+        else_=1
+    )
+    juncao = [Contribuicao.tipo == estatisticas.c.tipo]
+    if len(colunas) > 1:
+        juncao.append(Contribuicao.comunidade_id == estatisticas.c.comunidade_id)
+
+    histograma = {}
+    for r in db.query(
+        *colunas, faixa.label("faixa"), func.count(Contribuicao.id).label("quantidade")
+    ).join(estatisticas, and_(*juncao)).filter(*filtros).group_by(*colunas, faixa).all():
+        chave = (r.tipo, r.comunidade_id if len(colunas) > 1 else None)
+        histograma.setdefault(chave, [0] * faixas)[r.faixa - 1] = r.quantidade
+
+    grupos = []
+    for r in db.query(estatisticas).all():
+        chave = (r.tipo, r.comunidade_id if len(colunas) > 1 else None)
+        grupos.append(_distribuicao_grupo(
+            r.tipo, chave[1], r.quantidade, r.minimo, r.maximo, r.media,
+            [r.p0, r.p1, r.p2], histograma.get(chave, [0] * faixas)
+        ))
+    return grupos
+
+
+def _distribuicao_numpy(db: Session, filtros: list, colunas: list, faixas: int) -> list:
+    """
+    Calcula a distribuição de valores com NumPy (bancos sem percentile_cont).
+
+    O banco devolve apenas inteiros: o código do tipo, a comunidade (se
+    houver) e o valor em centavos. O cursor é lido em blocos de
+    LOTE_DISTRIBUICAO linhas, cada bloco vira direto um array int64, e o
+    agrupamento é feito com uma ordenação do NumPy. Mínimo, máximo e média
+    são exatos em centavos; a interpolação linear de numpy.percentile
+    equivale à de percentile_cont.
+    """
+    tipos = list(TipoContribuicaoEnum)
+    chaves = [case({tipo: codigo for codigo, tipo in enumerate(tipos)}, value=Contribuicao.tipo)]
+    if len(colunas) > 1:
+        chaves.append(Contribuicao.comunidade_id)
+    centavos = cast(func.round(Contribuicao.valor * 100), Integer)
+
+    result = db.execute(
+        db.query(*chaves, centavos).filter(*filtros).statement
+        .execution_options(yield_per=LOTE_DISTRIBUICAO)
+    )
+    blocos = [np.array(linhas, dtype=np.int64) for linhas in result.partitions()]
+    if not blocos:
+        return []
+    dados = np.concatenate(blocos)
+
+    codigos = dados[:, 0]
+    comunidades = dados[:, 1] if len(colunas) > 1 else np.zeros(len(dados), dtype=np.int64)
+    ordem = np.lexsort((comunidades, codigos))
+    codigos, comunidades, valores = codigos[ordem], comunidades[ordem], dados[ordem, -1]
+    inicios = np.flatnonzero((np.diff(codigos) != 0) | (np.diff(comunidades) != 0)) + 1
+
+    grupos = []
+    for inicio, fatia in zip(np.r_[0, inicios], np.split(valores, inicios), strict=True):
+        minimo, maximo = int(fatia.min()), int(fatia.max())
+        if maximo > minimo:
+            contagens, _ = np.histogram(fatia, bins=faixas, range=(minimo, maximo))
+        else:
+            contagens = [len(fatia)] + [0] * (faixas - 1)
+        percentis = np.percentile(fatia, [p * 100 for p in PERCENTIS])
+        grupos.append(_distribuicao_grupo(
+            tipos[codigos[inicio]], int(comunidades[inicio]) if len(colunas) > 1 else None, len(fatia),
+            Decimal(minimo) / 100, Decimal(maximo) / 100,
+            Decimal(int(fatia.sum())) / len(fatia) / 100,
+            [Decimal(float(p)) / 100 for p in percentis], contagens
+        ))
+    return grupos
+
+
+@cached_report
+def get_distribuicao_valores(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    comunidade_id: Optional[int] = None,
+    por_comunidade: bool = False,
+    faixas: int = 10
+) -> dict:
+    """
+    Obtém a distribuição dos valores de contribuição por tipo.
+
+    Para cada tipo (e, opcionalmente, comunidade) retorna mínimo, máximo,
+    média, percentis 25/50/90 e um histograma de faixas de mesma largura
+    entre o mínimo e o máximo do grupo. No PostgreSQL tudo é calculado no
+    banco; nos demais, com NumPy.
+
+    Args:
+        db: Sessão do banco de dados
+        start_date: Data de início
+        end_date: Data de fim
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        por_comunidade: Se True, gera uma distribuição por comunidade e tipo
+        faixas: Quantidade de faixas do histograma
+
+    Returns:
+        Dicionário com as distribuições de cada grupo
+    """
+    filtros = [
+        Contribuicao.data_contribuicao >= start_date,
+        Contribuicao.data_contribuicao <= end_date,
+    ]
+    if comunidade_id is not None:
+        filtros.append(Contribuicao.comunidade_id == comunidade_id)
+
+    colunas = [Contribuicao.tipo]
+    if por_comunidade:
+        colunas.append(Contribuicao.comunidade_id)
+
+    if _is_postgresql(db):
+        grupos = _distribuicao_postgresql(db, filtros, colunas, faixas)
+    else:
+        grupos = _distribuicao_numpy(db, filtros, colunas, faixas)
+
+    grupos.sort(key=lambda g: (g["comunidade_id"] or 0, g["tipo"].value))
+
+    return {
+        "data_inicio": start_date,
+        "data_fim": end_date,
+        "comunidade_id": comunidade_id,
+        "faixas": faixas,
+        "distribuicoes": grupos,
+    }
+
+
+def _analise_sql(
+    db: Session,
+    paroquia_id: int,
+    start_date: date,
+    end_date: date,
+    agrupar_por: Sequence[str] = (),
+    tipo: Optional[TipoContribuicaoEnum] = None,
+    comunidade_id: Optional[int] = None,
+    forma_pagamento: Optional[str] = None
+) -> list:
+    """
+    Soma contribuições filtradas e agrupadas com um GROUP BY no banco.
+
+    Mesmos argumentos e resultado de AnalyticsEngine.analisar.
+    """
+    mes = (
+        extract('year', Contribuicao.data_contribuicao) * 100
+        + extract('month', Contribuicao.data_contribuicao)
+    )
+    expressoes = {
+        "tipo": Contribuicao.tipo,
+        "comunidade": Contribuicao.comunidade_id,
+        "forma_pagamento": Contribuicao.forma_pagamento,
+        "mes": mes,
+    }
+    colunas = [expressoes[campo].label(campo) for campo in agrupar_por]
+
+    query = db.query(
+        *colunas,
+        func.sum(Contribuicao.valor).label("total"),
+        func.count(Contribuicao.id).label("quantidade")
+    ).join(Comunidade).filter(
+        Comunidade.paroquia_id == paroquia_id,
+        Contribuicao.data_contribuicao >= start_date,
+        Contribuicao.data_contribuicao <= end_date
+    )
+
+    if tipo is not None:
+        query = query.filter(Contribuicao.tipo == tipo)
+    if comunidade_id is not None:
+        query = query.filter(Contribuicao.comunidade_id == comunidade_id)
+    if forma_pagamento is not None:
+        query = query.filter(Contribuicao.forma_pagamento == forma_pagamento)
+
+    if colunas:
+        query = query.group_by(*colunas)
+
+    grupos = []
+    for r in query.all():
+        if not r.quantidade:
+            continue
+        chave_mes = int(r.mes) if "mes" in agrupar_por else None
+        grupos.append({
+            "tipo": r.tipo if "tipo" in agrupar_por else None,
+            "comunidade_id": r.comunidade if "comunidade" in agrupar_por else None,
+            "forma_pagamento": r.forma_pagamento if "forma_pagamento" in agrupar_por else None,
+            "mes": f"{chave_mes // 100:04d}-{chave_mes % 100:02d}" if chave_mes is not None else None,
+            "total": r.total,
+            "quantidade": r.quantidade,
+        })
+    return grupos
+
+
+def get_analise(
+    db: Session,
+    paroquia_id: int,
+    start_date: date,
+    end_date: date,
+    agrupar_por: Sequence[str] = (),
+    tipo: Optional[TipoContribuicaoEnum] = None,
+    comunidade_id: Optional[int] = None,
+    forma_pagamento: Optional[str] = None,
+    motor: Optional[Literal["sql", "numpy"]] = None
+) -> dict:
+    """
+    Soma contribuições de uma paróquia com filtros e agrupamentos livres.
+
+    Por padrão usa o motor em memória quando ANALYTICS_ENGINE_ENABLED está
+    ativo e o GROUP BY no banco caso contrário.
+
+    Args:
+        db: Sessão do banco de dados
+        paroquia_id: ID da paróquia
+        start_date: Data de início
+        end_date: Data de fim
+        agrupar_por: Campos de agrupamento (tipo, comunidade,
+            forma_pagamento, mes)
+        tipo: Tipo de contribuição para filtrar (opcional)
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        forma_pagamento: Forma de pagamento para filtrar (opcional)
+        motor: Força "sql" ou "numpy" (opcional)
+
+    Returns:
+        Dicionário com os grupos ordenados pelos campos de agrupamento
+    """
+    motor = motor or ("numpy" if settings.ANALYTICS_ENGINE_ENABLED else "sql")
+    analisar = analytics_engine.analisar if motor == "numpy" else _analise_sql
+    grupos = analisar(
+        db, paroquia_id, start_date, end_date, tuple(agrupar_por), tipo, comunidade_id, forma_pagamento
+    )
+
+    def ordem(grupo):
+        # Valores nulos (ex.: forma de pagamento não informada) vão por último
+        return tuple(
+            (grupo[campo] is None, "" if grupo[campo] is None else grupo[campo])
+            for campo in ("tipo", "comunidade_id", "forma_pagamento", "mes")
+        )
+
+    grupos.sort(key=ordem)
+
+    return {
+        "paroquia_id": paroquia_id,
+        "data_inicio": start_date,
+        "data_fim": end_date,
+        "agrupar_por": list(agrupar_por),
+        "motor": motor,
+        "grupos": grupos,
+    }
+
+
+def _subtrair_meses(data: date, meses: int) -> date:
+    """Subtrai meses de uma data, ajustando o dia ao fim do mês se necessário."""
+    total = data.year * 12 + data.month - 1 - meses
+    ano, mes = divmod(total, 12)
+    dia = min(data.day, calendar.monthrange(ano, mes + 1)[1])
+    return date(ano, mes + 1, dia)
+
+
+def get_dizimistas_sem_dizimo(
+    db: Session,
+    meses: int = 3,
+    comunidade_id: Optional[int] = None,
+    limit: int = 100,
+    cursor: Optional[int] = None
+) -> dict:
+    """
+    Obtém dizimistas ativos que não contribuíram com dízimo nos últimos meses.
+
+    A ausência de dízimo é verificada com NOT EXISTS e a data do último
+    dízimo com MAX(), ambos resolvidos pelo índice
+    (dizimista_id, tipo, data_contribuicao) sem carregar históricos. A
+    paginação é por chave (id do dizimista).
+
+    Args:
+        db: Sessão do banco de dados
+        meses: Quantidade de meses sem dízimo
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        limit: Quantidade máxima de dizimistas na página
+        cursor: ID do último dizimista da página anterior (proximo_cursor)
+
+    Returns:
+        Dicionário com a data de corte, a página de dizimistas e o cursor
+        da próxima página
+    """
+    desde = _subtrair_meses(date.today(), meses)
+
+    dizimo_recente = db.query(Contribuicao.id).filter(
+        Contribuicao.dizimista_id == Dizimista.id,
+        Contribuicao.tipo == TipoContribuicaoEnum.DIZIMO,
+        Contribuicao.data_contribuicao >= desde
+    ).exists()
+
+    ultimo_dizimo = db.query(func.max(Contribuicao.data_contribuicao)).filter(
+        Contribuicao.dizimista_id == Dizimista.id,
+        Contribuicao.tipo == TipoContribuicaoEnum.DIZIMO
+    ).scalar_subquery()
+
+    query = db.query(
+        Dizimista.id,
+        Dizimista.nome,
+        Dizimista.telefone,
+        Dizimista.email,
+        Dizimista.comunidade_id,
+        Comunidade.nome.label("comunidade_nome"),
+        ultimo_dizimo.label("ultimo_dizimo")
+    ).join(Comunidade).filter(
+        Dizimista.ativo.is_(True),
+        ~dizimo_recente
+    )
+
+    if comunidade_id is not None:
+        query = query.filter(Dizimista.comunidade_id == comunidade_id)
+
+    if cursor is not None:
+        query = query.filter(Dizimista.id > cursor)
+
+    results = query.order_by(Dizimista.id).limit(limit + 1).all()
+
+    proximo_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        proximo_cursor = results[-1].id
+
+    return {
+        "meses": meses,
+        "desde": desde,
+        "comunidade_id": comunidade_id,
+        "dizimistas": [
+            {
+                "id": r.id,
+                "nome": r.nome,
+                "telefone": r.telefone,
+                "email": r.email,
+                "comunidade_id": r.comunidade_id,
+                "comunidade_nome": r.comunidade_nome,
+                "ultimo_dizimo": r.ultimo_dizimo,
+            }
+            for r in results
+        ],
+        "proximo_cursor": proximo_cursor,
+    }
+
+
+def get_adimplencia(
+    db: Session,
+    comunidade_id: Optional[int] = None,
+    meses: int = 12,
+    limit: int = 200,
+    cursor: Optional[int] = None
+) -> dict:
+    """
+    Obtém a grade dizimista × mês de referência dos dízimos pagos.
+
+    Cada dizimista recebe um bitmap inteiro em que o bit ``i`` indica se há
+    dízimo com ``referencia_mes`` igual a ``meses[i]``. O bitmap é montado
+    no próprio banco, em uma única consulta agrupada por dizimista, e a
+    paginação é por chave (id do dizimista).
+
+    Args:
+        db: Sessão do banco de dados
+        comunidade_id: ID da comunidade para filtrar (opcional)
+        meses: Quantidade de meses da grade, terminando no mês atual
+        limit: Quantidade máxima de dizimistas na página
+        cursor: ID do último dizimista da página anterior (proximo_cursor)
+
+    Returns:
+        Dicionário com os meses da grade, a página de dizimistas com seus
+        bitmaps e o cursor da próxima página
+    """
+    inicio = _subtrair_meses(date.today().replace(day=1), meses - 1)
+    chaves = _iter_meses(inicio, date.today())
+    referencias = [f"{chave // 100:04d}-{chave % 100:02d}" for chave in chaves]
+
+    bitmap = sum(
+        func.max(case((Contribuicao.referencia_mes_num == chave, 1 << bit), else_=0))
+        for bit, chave in enumerate(chaves)
+    )
+
+    query = db.query(
+        Dizimista.id,
+        Dizimista.nome,
+        bitmap.label("bitmap")
+    ).outerjoin(
+        Contribuicao,
+        (Contribuicao.dizimista_id == Dizimista.id)
+        & (Contribuicao.tipo == TipoContribuicaoEnum.DIZIMO)
+        & Contribuicao.referencia_mes_num.between(chaves[0], chaves[-1])
+    ).filter(Dizimista.ativo.is_(True))
+
+    if comunidade_id is not None:
+        query = query.filter(Dizimista.comunidade_id == comunidade_id)
+
+    if cursor is not None:
+        query = query.filter(Dizimista.id > cursor)
+
+    results = query.group_by(
+        Dizimista.id, Dizimista.nome
+    ).order_by(Dizimista.id).limit(limit + 1).all()
+
+    proximo_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        proximo_cursor = results[-1].id
+
+    return {
+        "comunidade_id": comunidade_id,
+        "meses": referencias,
+        "dizimistas": [
+            {
+                "id": r.id,
+                "nome": r.nome,
+                "bitmap": int(r.bitmap or 0),
+                "meses_pagos": bin(int(r.bitmap or 0)).count("1"),
+            }
+            for r in results
+        ],
+        "proximo_cursor": proximo_cursor,
+    }
+
+
+def _encode_cursor(data: date, contribuicao_id: int) -> str:
+    """Codifica a posição (data, id) de uma contribuição em um cursor opaco."""
+    return base64.urlsafe_b64encode(f"{data.isoformat()}|{contribuicao_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[date, int]:
+    """
+    Decodifica um cursor de paginação do histórico.
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        data, contribuicao_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return date.fromisoformat(data), int(contribuicao_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Cursor inválido") from exc
+
+
+def get_dizimista_history(
+    db: Session,
+    dizimista_id: int,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    por_ano: bool = False
+) -> Optional[dict]:
+    """
+    Obtém histórico de contribuições de um dizimista.
+
+    Os totais são calculados no banco (SUM/COUNT) e as contribuições são
+    paginadas por cursor, da mais recente para a mais antiga, usando o
+    índice (dizimista_id, data_contribuicao, id).
+
+    Args:
+        db: Sessão do banco de dados
+        dizimista_id: ID do dizimista
+        limit: Quantidade máxima de contribuições na página
+        cursor: Cursor da página anterior (proximo_cursor), ou None para a primeira
+        por_ano: Se True, inclui subtotais por ano
+
+    Returns:
+        Dicionário com totais, página de contribuições e cursor da próxima
+        página, ou None se o dizimista não existir
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    dizimista = db.query(Dizimista.id, Dizimista.nome).filter(Dizimista.id == dizimista_id).first()
+    if not dizimista:
+        return None
+
+    # Calcular totais
+    totais = db.query(
+        func.sum(Contribuicao.valor).label("total"),
+        func.count(Contribuicao.id).label("quantidade")
+    ).filter(Contribuicao.dizimista_id == dizimista_id).first()
+
+    # Obter página de contribuições
+    query = db.query(Contribuicao).filter(Contribuicao.dizimista_id == dizimista_id)
+    if cursor is not None:
+        query = query.filter(
+            tuple_(Contribuicao.data_contribuicao, Contribuicao.id) < tuple_(*_decode_cursor(cursor))
+        )
+    contribuicoes = query.order_by(
+        Contribuicao.data_contribuicao.desc(),
+        Contribuicao.id.desc()
+    ).limit(limit + 1).all()
+
+    proximo_cursor = None
+    if len(contribuicoes) > limit:
+        contribuicoes = contribuicoes[:limit]
+        ultima = contribuicoes[-1]
+        proximo_cursor = _encode_cursor(ultima.data_contribuicao, ultima.id)
+
+    subtotais_ano = None
+    if por_ano:
+        ano = extract('year', Contribuicao.data_contribuicao).label("ano")
+        results = db.query(
+            ano,
+            func.sum(Contribuicao.valor).label("total"),
+            func.count(Contribuicao.id).label("quantidade")
+        ).filter(
+            Contribuicao.dizimista_id == dizimista_id
+        ).group_by(ano).order_by(ano.desc()).all()
+        subtotais_ano = [
+            {"ano": int(r.ano), "total": r.total or Decimal("0.00"), "quantidade": r.quantidade}
+            for r in results
+        ]
+
+    return {
+        "dizimista_id": dizimista.id,
+        "dizimista_nome": dizimista.nome,
+        "total_geral": totais.total or Decimal("0.00"),
+        "quantidade_total": totais.quantidade or 0,
+        "contribuicoes": contribuicoes,
+        "proximo_cursor": proximo_cursor,
+        "subtotais_ano": subtotais_ano,
+    }
+
+
+def _count_dizimistas_ativos(db: Session, comunidade_id: Optional[int] = None) -> int:
+    """Conta os dizimistas ativos, opcionalmente de uma comunidade."""
+    query = db.query(func.count(Dizimista.id)).filter(Dizimista.ativo.is_(True))
+    if comunidade_id is not None:
+        query = query.filter(Dizimista.comunidade_id == comunidade_id)
+    return query.scalar()
+
+
+def _count_contribuicoes(db: Session, comunidade_id: Optional[int] = None) -> int:
+    """Conta as contribuições registradas, opcionalmente de uma comunidade."""
+    query = db.query(func.count(Contribuicao.id))
+    if comunidade_id is not None:
+        query = query.filter(Contribuicao.comunidade_id == comunidade_id)
+    return query.scalar()
+
+
+def get_dashboard(db: Session, comunidade_id: Optional[int] = None) -> dict:
+    """
+    Obtém todos os indicadores do dashboard em uma única chamada.
+
+    No PostgreSQL cada consulta roda em paralelo, em uma sessão (e conexão)
+    própria, de modo que o tempo total é o da consulta mais lenta. Em
+    outros bancos as consultas rodam em sequência na sessão recebida.
+    Os totais do mês aceitam resultado defasado do cache de relatórios.
+
+    Args:
+        db: Sessão do banco de dados
+        comunidade_id: ID da comunidade para filtrar (opcional)
+
+    Returns:
+        Dicionário com contagens, totais do mês e aniversariantes do dia
+    """
+    hoje = date.today()
+    inicio_mes = hoje.replace(day=1)
+    fim_mes = hoje.replace(day=calendar.monthrange(hoje.year, hoje.month)[1])
+
+    consultas = {
+        "dizimistas_ativos": lambda s: _count_dizimistas_ativos(s, comunidade_id),
+        "total_contribuicoes": lambda s: _count_contribuicoes(s, comunidade_id),
+        "total_mes": lambda s: get_total_by_period(
+            s, inicio_mes, fim_mes, comunidade_id, stale_ok=True
+        ),
+        "totais_tipo_mes": lambda s: get_total_by_tipo(
+            s, inicio_mes, fim_mes, comunidade_id, stale_ok=True
+        ),
+        "aniversariantes_hoje": lambda s: get_aniversariantes(s, "hoje", comunidade_id),
+    }
+
+    if not _is_postgresql(db):
+        return {nome: consulta(db) for nome, consulta in consultas.items()}
+
+    bind = db.get_bind()
+
+    def executar(consulta):
+        with Session(bind=bind) as session:
+            return consulta(session)
+
+    futures = {nome: _dashboard_executor.submit(executar, consulta) for nome, consulta in consultas.items()}
+    return {nome: future.result() for nome, future in futures.items()}
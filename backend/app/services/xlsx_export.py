@@ -0,0 +1,157 @@
+"""
+Exportação XLSX.
+Gera planilhas Excel com memória constante a partir de cursores do banco.
+
+A planilha é escrita pelo openpyxl em modo write-only (as linhas vão para
+disco à medida que são acrescentadas, sem montar a pasta de trabalho em
+memória) e o arquivo final é gravado num SpooledTemporaryFile, que só fica
+em memória até EXPORT_SPOOL_MAX_BYTES e passa para disco acima disso. O
+XLSX é um zip e precisa estar completo antes do envio; a resposta então
+transmite o arquivo pronto em blocos.
+"""
+import logging
+import threading
+from tempfile import SpooledTemporaryFile
+from typing import IO, Iterable, Iterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tamanho dos blocos lidos do arquivo ao transmitir a resposta
+BLOCO_ENVIO = 64 * 1024
+
+MEDIA_TYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class _MetricasExportacao:
+    """Contadores das exportações XLSX do processo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.exportacoes = 0
+        self.linhas = 0
+        self.bytes = 0
+        self.maior_arquivo_bytes = 0
+        self.em_disco = 0
+
+    def registrar(self, linhas: int, tamanho: int, em_disco: bool) -> None:
+        """Registra uma exportação concluída."""
+        with self._lock:
+            self.exportacoes += 1
+            self.linhas += linhas
+            self.bytes += tamanho
+            self.maior_arquivo_bytes = max(self.maior_arquivo_bytes, tamanho)
+            self.em_disco += int(em_disco)
+
+    def stats(self) -> dict:
+        """
+        Obtém as métricas de exportação.
+
+        Returns:
+            Dicionário com exportações, linhas, bytes, maior arquivo e
+            exportações que passaram para disco
+        """
+        with self._lock:
+            return {
+                "exportacoes": self.exportacoes,
+                "linhas": self.linhas,
+                "bytes": self.bytes,
+                "maior_arquivo_bytes": self.maior_arquivo_bytes,
+                "em_disco": self.em_disco,
+            }
+
+
+def gerar_xlsx(titulo: str, cabecalho: Sequence[str], linhas: Iterable[Sequence]) -> tuple[IO[bytes], int, int]:
+    """
+    Escreve uma planilha XLSX com uma aba a partir de um iterável de linhas.
+
+    Args:
+        titulo: Nome da aba
+        cabecalho: Títulos das colunas
+        linhas: Linhas da planilha, consumidas uma a uma
+
+    Returns:
+        Tupla com (arquivo posicionado no início, quantidade de linhas,
+        tamanho em bytes). Quem recebe o arquivo deve fechá-lo.
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(titulo)
+
+    negrito = Font(bold=True)
+    celulas = []
+    for texto in cabecalho:
+        celula = WriteOnlyCell(worksheet, value=texto)
+        celula.font = negrito
+        celulas.append(celula)
+    worksheet.append(celulas)
+
+    quantidade = 0
+    for linha in linhas:
+        worksheet.append(linha)
+        quantidade += 1
+
+    arquivo = SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_MAX_BYTES)
+    try:
+        workbook.save(arquivo)
+    except BaseException:
+        arquivo.close()
+        raise
+    tamanho = arquivo.tell()
+    arquivo.seek(0)
+
+    em_disco = bool(getattr(arquivo, "_rolled", False))
+    metricas_exportacao.registrar(quantidade, tamanho, em_disco)
+    logger.info(
+        "Exportação XLSX '%s': %d linhas, %d bytes%s",
+        titulo, quantidade, tamanho, " (em disco)" if em_disco else ""
+    )
+    return arquivo, quantidade, tamanho
+
+
+def ler_em_blocos(arquivo: IO[bytes]) -> Iterator[bytes]:
+    """
+    Transmite um arquivo em blocos e o fecha ao final.
+
+    Args:
+        arquivo: Arquivo gerado por gerar_xlsx
+
+    Yields:
+        Blocos de até BLOCO_ENVIO bytes
+    """
+    with arquivo:
+        while bloco := arquivo.read(BLOCO_ENVIO):
+            yield bloco
+
+
+def resposta_xlsx(arquivo: IO[bytes], linhas: int, tamanho: int, nome_arquivo: str) -> StreamingResponse:
+    """
+    Monta a resposta de download de uma planilha gerada por gerar_xlsx.
+
+    Args:
+        arquivo: Arquivo da planilha
+        linhas: Quantidade de linhas exportadas
+        tamanho: Tamanho do arquivo em bytes
+        nome_arquivo: Nome sugerido para o download
+
+    Returns:
+        Resposta transmitida em blocos, com tamanho e linhas nos cabeçalhos
+    """
+    return StreamingResponse(
+        ler_em_blocos(arquivo),
+        media_type=MEDIA_TYPE_XLSX,
+        headers={
+            "Content-Disposition": f'attachment; filename="{nome_arquivo}"',
+            "Content-Length": str(tamanho),
+            "X-Export-Linhas": str(linhas),
+        }
+    )
+
+
+# Instância global das métricas de exportação
+metricas_exportacao = _MetricasExportacao()
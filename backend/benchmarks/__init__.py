@@ -0,0 +1,3 @@
+"""
+Benchmarks de desempenho (não fazem parte da aplicação).
+"""
@@ -0,0 +1,188 @@
+"""
+Benchmark da análise de contribuições: GROUP BY no banco x motor NumPy.
+
+Uso:
+    python -m benchmarks.analise                  # dados sintéticos em SQLite
+    python -m benchmarks.analise --linhas 500000
+    python -m benchmarks.analise --banco --paroquia-id 1   # banco configurado
+
+Executar a partir do diretório backend.
+
+Para cada combinação de agrupamento mede a mediana de várias execuções de
+cada motor e confere se os dois devolvem os mesmos grupos.
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, SessionLocal
+from app.models.comunidade import Comunidade
+from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
+from app.models.dizimista import Dizimista
+from app.models.paroquia import Paroquia
+from app.services import report_service
+from app.services.analytics_engine import AnalyticsEngine
+
+# Combinações de agrupamento medidas
+CENARIOS = [
+    (),
+    ("tipo",),
+    ("comunidade",),
+    ("mes",),
+    ("tipo", "mes"),
+    ("comunidade", "forma_pagamento"),
+    ("tipo", "comunidade", "forma_pagamento", "mes"),
+]
+
+FORMAS_PAGAMENTO = ["Dinheiro", "PIX", "Cartão", "Transferência", None]
+
+
+def _popular(db: Session, linhas: int, comunidades: int, dizimistas: int) -> int:
+    """
+    Cria uma paróquia com contribuições sintéticas.
+
+    Returns:
+        ID da paróquia criada
+    """
+    rng = random.Random(42)
+    paroquia = Paroquia(nome="Paróquia Benchmark")
+    db.add(paroquia)
+    db.flush()
+
+    ids_comunidades = []
+    for i in range(comunidades):
+        comunidade = Comunidade(nome=f"Comunidade {i + 1}", paroquia_id=paroquia.id)
+        db.add(comunidade)
+        db.flush()
+        ids_comunidades.append(comunidade.id)
+
+    db.bulk_insert_mappings(Dizimista, [
+        {"nome": f"Dizimista {i + 1}", "comunidade_id": ids_comunidades[i % comunidades], "ativo": True}
+        for i in range(dizimistas)
+    ])
+
+    inicio = date.today() - timedelta(days=3 * 365)
+    tipos = list(TipoContribuicaoEnum)
+    lote = []
+    for _ in range(linhas):
+        tipo = rng.choice(tipos)
+        data = inicio + timedelta(days=rng.randrange(3 * 365))
+        lote.append({
+            "comunidade_id": rng.choice(ids_comunidades),
+            "dizimista_id": rng.randrange(1, dizimistas + 1) if tipo == TipoContribuicaoEnum.DIZIMO else None,
+            "tipo": tipo,
+            "valor": Decimal(rng.randrange(500, 50000)) / 100,
+            "data_contribuicao": data,
+            "forma_pagamento": rng.choice(FORMAS_PAGAMENTO),
+            "referencia_mes": f"{data.year:04d}-{data.month:02d}" if tipo == TipoContribuicaoEnum.DIZIMO else None,
+        })
+        if len(lote) == 10000:
+            db.bulk_insert_mappings(Contribuicao, lote)
+            lote = []
+    db.bulk_insert_mappings(Contribuicao, lote)
+    db.commit()
+    return paroquia.id
+
+
+def _mediana(funcao, repeticoes: int) -> float:
+    """Mediana do tempo de execução, em milissegundos."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def executar(db: Session, paroquia_id: int, start_date: date, end_date: date, repeticoes: int) -> bool:
+    """
+    Mede os dois motores em cada cenário e imprime a comparação.
+
+    Returns:
+        True se todos os cenários deram o mesmo resultado nos dois motores
+    """
+    motor = AnalyticsEngine(ttl_seconds=float("inf"))
+
+    inicio = time.perf_counter()
+    motor.analisar(db, paroquia_id, start_date, end_date)
+    carga = (time.perf_counter() - inicio) * 1000
+    stats = motor.stats()
+    print(f"Carga inicial: {stats['linhas']} linhas, {stats['bytes'] / 1024:.0f} KiB em {carga:.0f} ms\n")
+
+    print(f"{'agrupamento':<45} {'sql (ms)':>10} {'numpy (ms)':>11} {'ganho':>7}  ok")
+    todos_iguais = True
+    for agrupar_por in CENARIOS:
+        def sql(agrupar_por=agrupar_por):
+            return report_service._analise_sql(db, paroquia_id, start_date, end_date, agrupar_por)
+
+        def numpy(agrupar_por=agrupar_por):
+            return motor.analisar(db, paroquia_id, start_date, end_date, agrupar_por)
+
+        iguais = _normalizar(sql()) == _normalizar(numpy())
+        todos_iguais &= iguais
+        tempo_sql = _mediana(sql, repeticoes)
+        tempo_numpy = _mediana(numpy, repeticoes)
+        nome = ", ".join(agrupar_por) or "(total)"
+        print(
+            f"{nome:<45} {tempo_sql:>10.1f} {tempo_numpy:>11.1f} "
+            f"{tempo_sql / tempo_numpy:>6.1f}x  {'sim' if iguais else 'NÃO'}"
+        )
+    return todos_iguais
+
+
+def _normalizar(grupos: list) -> list:
+    """Grupos em forma comparável entre os motores."""
+    return sorted(
+        (
+            tuple("" if grupo[campo] is None else str(grupo[campo])
+                  for campo in ("tipo", "comunidade_id", "forma_pagamento", "mes")),
+            Decimal(grupo["total"]).quantize(Decimal("0.01")),
+            grupo["quantidade"],
+        )
+        for grupo in grupos
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--banco", action="store_true", help="Usar o banco configurado em vez de dados sintéticos")
+    parser.add_argument("--paroquia-id", type=int, help="Paróquia analisada (com --banco)")
+    parser.add_argument("--linhas", type=int, default=200000, help="Contribuições sintéticas")
+    parser.add_argument("--comunidades", type=int, default=20, help="Comunidades sintéticas")
+    parser.add_argument("--dizimistas", type=int, default=2000, help="Dizimistas sintéticos")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções por cenário")
+    args = parser.parse_args()
+
+    end_date = date.today()
+    start_date = end_date - timedelta(days=3 * 365)
+
+    if args.banco:
+        if args.paroquia_id is None:
+            parser.error("--paroquia-id é obrigatório com --banco")
+        with SessionLocal() as db:
+            ok = executar(db, args.paroquia_id, start_date, end_date, args.repeticoes)
+    else:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=engine)
+        with Session(bind=engine) as db:
+            print(f"Gerando {args.linhas} contribuições sintéticas...")
+            paroquia_id = _popular(db, args.linhas, args.comunidades, args.dizimistas)
+            ok = executar(db, paroquia_id, start_date, end_date, args.repeticoes)
+
+    if not ok:
+        raise SystemExit("Resultados diferentes entre os motores")
+
+
+if __name__ == "__main__":
+    main()
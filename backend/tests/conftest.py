@@ -21,6 +21,24 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_report_cache():
+    """
+    Fixture que limpa os caches de relatórios entre os testes,
+    já que cada teste recria o banco de dados.
+    """
+    from app.services.report_cache import report_cache, aniversariantes_cache
+    from app.services.analytics_engine import analytics_engine
+
+    report_cache.clear()
+    aniversariantes_cache.clear()
+    analytics_engine.invalidar()
+    yield
+    report_cache.clear()
+    aniversariantes_cache.clear()
+    analytics_engine.invalidar()
+
+
 @pytest.fixture
 def db_session():
     """
@@ -37,10 +55,13 @@ def db_session():
 
 
 @pytest.fixture
-def client(db_session):
+def client(db_session, monkeypatch):
     """
     Fixture que retorna um TestClient do FastAPI com banco de dados de teste.
     """
+    # A inicialização da API também usa o banco de teste
+    monkeypatch.setattr("app.main.SessionLocal", TestingSessionLocal)
+
     def override_get_db():
         try:
             yield db_session
@@ -161,6 +182,53 @@ def sample_dizimista(db_session, sample_comunidade):
     return dizimista
 
 
+@pytest.fixture
+def outra_comunidade(db_session, sample_paroquia):
+    """
+    Fixture que cria e retorna uma segunda comunidade na paróquia de exemplo.
+    """
+    from app.models.comunidade import Comunidade
+
+    comunidade = Comunidade(
+        nome="Outra Comunidade",
+        paroquia_id=sample_paroquia.id
+    )
+    db_session.add(comunidade)
+    db_session.commit()
+    db_session.refresh(comunidade)
+    return comunidade
+
+
+@pytest.fixture
+def criar_contribuicao(db_session, sample_comunidade):
+    """
+    Fixture que retorna uma função para criar contribuições direto no banco.
+
+    Por padrão a contribuição é um dízimo anônimo de hoje na comunidade de
+    exemplo; demais colunas vão como argumentos nomeados. A contribuição é
+    apenas adicionada à sessão, e o commit fica com o teste.
+    """
+    from datetime import date
+    from decimal import Decimal
+
+    from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
+
+    comunidade_id = sample_comunidade.id
+
+    def criar(valor, data_contribuicao=None, tipo=TipoContribuicaoEnum.DIZIMO, **campos):
+        campos.setdefault("comunidade_id", comunidade_id)
+        contribuicao = Contribuicao(
+            tipo=tipo,
+            valor=Decimal(valor),
+            data_contribuicao=data_contribuicao or date.today(),
+            **campos
+        )
+        db_session.add(contribuicao)
+        return contribuicao
+
+    return criar
+
+
 @pytest.fixture
 def auth_headers(admin_user):
     """
@@ -61,6 +61,47 @@ def test_create_contribuicao_anonima(client, auth_headers, sample_comunidade):
     assert data["dizimista_id"] is None
 
 
+def test_create_contribuicoes_batch(client, auth_headers, db_session, sample_dizimista, sample_comunidade):
+    """Testa criação em lote com erros por item."""
+    from app.models.contribuicao import Contribuicao
+    from app.models.fechamento import FechamentoMensal
+
+    comunidade_id = sample_comunidade.id
+    dizimista_id = sample_dizimista.id
+    db_session.add(FechamentoMensal(comunidade_id=comunidade_id, mes=202503))
+    db_session.commit()
+
+    hoje = str(date.today())
+    response = client.post(
+        "/api/contribuicoes/batch",
+        headers=auth_headers,
+        json={"itens": [
+            {"dizimista_id": dizimista_id, "comunidade_id": comunidade_id, "tipo": "DIZIMO",
+             "valor": "150.00", "data_contribuicao": hoje, "referencia_mes": "2026-02"},
+            {"comunidade_id": comunidade_id, "tipo": "OFERTA", "valor": "0", "data_contribuicao": hoje},
+            {"comunidade_id": 99999, "tipo": "OFERTA", "valor": "10.00", "data_contribuicao": hoje},
+            {"dizimista_id": 99999, "comunidade_id": comunidade_id, "tipo": "DIZIMO",
+             "valor": "10.00", "data_contribuicao": hoje},
+            {"comunidade_id": comunidade_id, "tipo": "OFERTA", "valor": "10.00", "data_contribuicao": "2025-03-09"},
+            {"comunidade_id": comunidade_id, "tipo": "OFERTA", "valor": "25.50", "data_contribuicao": hoje},
+        ]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total_itens"] == 6
+    assert data["criados"] == 2
+    assert [float(c["valor"]) for c in data["contribuicoes"]] == [150.00, 25.50]
+    assert [(e["indice"], e["campo"]) for e in data["erros"]] == [
+        (1, "valor"), (2, "comunidade_id"), (3, "dizimista_id"), (4, "data_contribuicao")
+    ]
+
+    criada = db_session.get(Contribuicao, data["contribuicoes"][0]["id"])
+    assert criada.referencia_mes_num == 202602
+
+    response = client.post("/api/contribuicoes/batch", headers=auth_headers, json={"itens": []})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 def test_list_contribuicoes(client, auth_headers, db_session, sample_dizimista, sample_comunidade):
     """Testa listagem paginada de contribuições."""
     from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
@@ -126,6 +167,79 @@ def test_list_contribuicoes_by_tipo(client, auth_headers, db_session, sample_diz
     assert all(c["tipo"] == "OFERTA" for c in data["items"])
 
 
+
+def test_list_contribuicoes_by_referencia(client, auth_headers, db_session, sample_dizimista, sample_comunidade):
+    """Testa filtro por faixa de mês de referência."""
+    from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
+
+    for referencia in ["2025-11", "2025-12", "2026-01", "2026-02"]:
+        db_session.add(Contribuicao(
+            dizimista_id=sample_dizimista.id,
+            comunidade_id=sample_comunidade.id,
+            tipo=TipoContribuicaoEnum.DIZIMO,
+            valor=Decimal("100.00"),
+            data_contribuicao=date.today(),
+            referencia_mes=referencia
+        ))
+    db_session.commit()
+
+    response = client.get(
+        "/api/contribuicoes?referencia_inicio=2025-12&referencia_fim=2026-01",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert sorted(c["referencia_mes"] for c in data["items"]) == ["2025-12", "2026-01"]
+
+    response = client.get("/api/contribuicoes?referencia_inicio=2026-13", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_export_contribuicoes_csv(client, auth_headers, db_session, sample_dizimista, sample_comunidade, monkeypatch):
+    """Testa exportação CSV em blocos com os filtros da listagem."""
+    import csv
+    import io
+    from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
+    from app.services import contribuicao_service
+
+    monkeypatch.setattr(contribuicao_service, "LOTE_CSV", 2)
+    for dia in range(1, 6):
+        db_session.add(Contribuicao(
+            dizimista_id=sample_dizimista.id,
+            comunidade_id=sample_comunidade.id,
+            tipo=TipoContribuicaoEnum.DIZIMO,
+            valor=Decimal("10.50"),
+            data_contribuicao=date(2026, 1, dia),
+            forma_pagamento="PIX"
+        ))
+    db_session.add(Contribuicao(
+        comunidade_id=sample_comunidade.id,
+        tipo=TipoContribuicaoEnum.OFERTA,
+        valor=Decimal("7.00"),
+        data_contribuicao=date(2026, 1, 3),
+        observacoes="Missa, domingo"
+    ))
+    db_session.commit()
+    dizimista_nome = sample_dizimista.nome
+
+    response = client.get("/api/contribuicoes/export.csv?data_fim=2026-01-04", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "contribuicoes.csv" in response.headers["content-disposition"]
+
+    linhas = list(csv.DictReader(io.StringIO(response.text)))
+    assert [linha["data_contribuicao"] for linha in linhas] == [
+        "2026-01-04", "2026-01-03", "2026-01-03", "2026-01-02", "2026-01-01"
+    ]
+    oferta = next(linha for linha in linhas if linha["tipo"] == "OFERTA")
+    assert oferta["observacoes"] == "Missa, domingo"
+    assert oferta["dizimista"] == ""
+    assert linhas[0]["dizimista"] == dizimista_nome
+    assert linhas[0]["valor"] == "10.50"
+
+    response = client.get("/api/contribuicoes/export.csv?tipo=OFERTA", headers=auth_headers)
+    assert len(list(csv.DictReader(io.StringIO(response.text)))) == 1
+
 def test_get_contribuicao(client, auth_headers, db_session, sample_dizimista, sample_comunidade):
     """Testa obtenção de contribuição por ID."""
     from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
@@ -112,3 +112,56 @@ def test_soft_delete_dizimista(client, auth_headers, sample_dizimista, db_sessio
     # Verificar que foi marcado como inativo
     db_session.refresh(sample_dizimista)
     assert sample_dizimista.ativo is False
+
+
+def test_import_dizimistas_csv(client, auth_headers, db_session, sample_dizimista, sample_comunidade, monkeypatch):
+    """Testa importação em massa com validação em lotes e relatório de erros."""
+    from app.models.dizimista import Dizimista
+    from app.services import dizimista_import_service
+
+    monkeypatch.setattr(dizimista_import_service, "LOTE_IMPORTACAO", 3)
+    comunidade_id = sample_comunidade.id
+    cpf_existente = sample_dizimista.cpf
+
+    csv_texto = (
+        "﻿nome,comunidade_id,cpf,email,data_nascimento,coluna_extra\n"
+        f"Ana Souza,{comunidade_id},111.111.111-11,ana@example.com,1990-05-20,x\n"
+        f"Bruno Lima,{comunidade_id},,,,\n"
+        f",{comunidade_id},222.222.222-22,,,\n"
+        f"Carla Dias,{comunidade_id},{cpf_existente},,,\n"
+        f"Davi Reis,{comunidade_id},111.111.111-11,,,\n"
+        f"Eva Melo,{comunidade_id},,email-invalido,,\n"
+        "Fábio Costa,9999,,,,\n"
+        f"Gil Rocha,{comunidade_id},333.333.333-33,,1985-13-01,\n"
+    )
+    response = client.post(
+        "/api/dizimistas/import",
+        headers=auth_headers,
+        files={"arquivo": ("dizimistas.csv", csv_texto.encode("utf-8"), "text/csv")}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total_linhas"] == 8
+    assert data["importados"] == 2
+    assert data["total_erros"] == 6
+    assert [(e["linha"], e["campo"]) for e in data["erros"]] == [
+        (4, "nome"),
+        (5, "cpf"),
+        (6, "cpf"),
+        (7, "email"),
+        (8, "comunidade_id"),
+        (9, "data_nascimento"),
+    ]
+    assert "linha 2" in data["erros"][2]["mensagem"]
+
+    ana = db_session.query(Dizimista).filter(Dizimista.cpf == "111.111.111-11").one()
+    assert ana.nome == "Ana Souza"
+    assert ana.aniversario_mmdd == 520
+    assert ana.ativo is True
+
+    response = client.post(
+        "/api/dizimistas/import",
+        headers=auth_headers,
+        files={"arquivo": ("dizimistas.csv", b"nome;telefone\nAna;123\n", "text/csv")}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
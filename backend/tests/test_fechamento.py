@@ -0,0 +1,148 @@
+"""
+Testes para fechamento mensal de comunidades.
+"""
+from fastapi import status
+from datetime import date
+from decimal import Decimal
+
+
+def _contribuicao(db_session, comunidade_id, valor, data, tipo=None, forma_pagamento=None):
+    """Cria uma contribuição direto no banco, sem passar pelo serviço."""
+    from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
+
+    contrib = Contribuicao(
+        comunidade_id=comunidade_id,
+        tipo=tipo or TipoContribuicaoEnum.DIZIMO,
+        valor=Decimal(valor),
+        data_contribuicao=data,
+        forma_pagamento=forma_pagamento
+    )
+    db_session.add(contrib)
+    db_session.commit()
+    return contrib
+
+
+def test_fechar_mes(client, auth_headers, db_session, sample_comunidade):
+    """Testa fechamento de mês com totais por tipo e forma de pagamento."""
+    comunidade_id = sample_comunidade.id
+    _contribuicao(db_session, comunidade_id, "100.00", date(2025, 3, 5), forma_pagamento="PIX")
+    _contribuicao(db_session, comunidade_id, "50.00", date(2025, 3, 20), forma_pagamento="PIX")
+    _contribuicao(db_session, comunidade_id, "30.00", date(2025, 3, 31), forma_pagamento="Dinheiro")
+
+    response = client.post(
+        "/api/fechamentos",
+        headers=auth_headers,
+        json={"comunidade_id": comunidade_id, "mes": "2025-03"}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert data["mes"] == "2025-03"
+    assert Decimal(data["total"]) == Decimal("180.00")
+    assert data["quantidade"] == 3
+    por_forma = {t["forma_pagamento"]: Decimal(t["total"]) for t in data["totais"]}
+    assert por_forma == {"PIX": Decimal("150.00"), "Dinheiro": Decimal("30.00")}
+
+    # Mesmo mês novamente
+    response = client.post(
+        "/api/fechamentos",
+        headers=auth_headers,
+        json={"comunidade_id": comunidade_id, "mes": "2025-03"}
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    # Mês corrente ainda não terminou
+    response = client.post(
+        "/api/fechamentos",
+        headers=auth_headers,
+        json={"comunidade_id": comunidade_id, "mes": date.today().strftime("%Y-%m")}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_mes_fechado_bloqueia_escritas(client, auth_headers, db_session, sample_comunidade):
+    """Testa que contribuições de mês fechado não podem ser criadas, alteradas ou removidas."""
+    comunidade_id = sample_comunidade.id
+    contrib_id = _contribuicao(db_session, comunidade_id, "100.00", date(2025, 3, 5)).id
+    aberta_id = _contribuicao(db_session, comunidade_id, "100.00", date(2025, 4, 5)).id
+
+    fechamento = client.post(
+        "/api/fechamentos",
+        headers=auth_headers,
+        json={"comunidade_id": comunidade_id, "mes": "2025-03"}
+    ).json()
+
+    response = client.post(
+        "/api/contribuicoes",
+        headers=auth_headers,
+        json={
+            "comunidade_id": comunidade_id,
+            "tipo": "OFERTA",
+            "valor": "10.00",
+            "data_contribuicao": "2025-03-15"
+        }
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = client.patch(f"/api/contribuicoes/{contrib_id}", headers=auth_headers, json={"valor": "1.00"})
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    # Mover uma contribuição aberta para o mês fechado também é recusado
+    response = client.patch(
+        f"/api/contribuicoes/{aberta_id}",
+        headers=auth_headers,
+        json={"data_contribuicao": "2025-03-10"}
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = client.delete(f"/api/contribuicoes/{contrib_id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    # Após reabrir, a alteração é aceita
+    response = client.delete(f"/api/fechamentos/{fechamento['id']}", headers=auth_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = client.patch(f"/api/contribuicoes/{contrib_id}", headers=auth_headers, json={"valor": "1.00"})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_relatorios_leem_meses_fechados(client, auth_headers, db_session, sample_comunidade):
+    """Testa que relatórios usam os totais congelados dos meses fechados."""
+    from app.models.contribuicao import TipoContribuicaoEnum
+
+    comunidade_id = sample_comunidade.id
+    _contribuicao(db_session, comunidade_id, "100.00", date(2025, 3, 5))
+    _contribuicao(db_session, comunidade_id, "40.00", date(2025, 3, 6), tipo=TipoContribuicaoEnum.OFERTA)
+    _contribuicao(db_session, comunidade_id, "70.00", date(2025, 4, 5))
+
+    client.post(
+        "/api/fechamentos",
+        headers=auth_headers,
+        json={"comunidade_id": comunidade_id, "mes": "2025-03"}
+    )
+
+    # Escrita feita por fora do serviço não altera o mês fechado nos relatórios
+    _contribuicao(db_session, comunidade_id, "999.00", date(2025, 3, 7))
+
+    periodo = "start_date=2025-03-01&end_date=2025-04-30"
+    data = client.get(f"/api/reports/total-periodo?{periodo}", headers=auth_headers).json()
+    assert Decimal(data["total"]) == Decimal("210.00")
+    assert data["quantidade"] == 3
+
+    data = client.get(f"/api/reports/total-tipo?{periodo}", headers=auth_headers).json()
+    totais = {t["tipo"]: Decimal(t["total"]) for t in data["totais"]}
+    assert totais == {"DIZIMO": Decimal("170.00"), "OFERTA": Decimal("40.00")}
+
+    data = client.get(f"/api/reports/total-comunidade?{periodo}", headers=auth_headers).json()
+    assert Decimal(data["total"]) == Decimal("210.00")
+    assert Decimal(data["comunidades"][0]["total"]) == Decimal("210.00")
+
+    data = client.get(f"/api/reports/serie-mensal?{periodo}", headers=auth_headers).json()
+    dizimo = next(s for s in data["series"] if s["tipo"] == "DIZIMO")
+    assert [Decimal(p["total"]) for p in dizimo["pontos"]] == [Decimal("100.00"), Decimal("70.00")]
+
+    # Mês fechado parcialmente no período é agregado a partir das contribuições
+    data = client.get(
+        "/api/reports/total-periodo?start_date=2025-03-06&end_date=2025-03-31",
+        headers=auth_headers
+    ).json()
+    assert Decimal(data["total"]) == Decimal("1039.00")
@@ -0,0 +1,124 @@
+"""
+Testes para Idempotency-Key nos endpoints de criação.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import status
+
+
+def test_reenvio_com_idempotency_key(client, auth_headers, db_session, sample_comunidade):
+    """Testa que o reenvio devolve a resposta original sem criar de novo."""
+    from app.models.contribuicao import Contribuicao
+
+    comunidade_id = sample_comunidade.id
+    corpo = {
+        "comunidade_id": comunidade_id,
+        "tipo": "OFERTA",
+        "valor": "50.00",
+        "data_contribuicao": str(date.today())
+    }
+    headers = {**auth_headers, "Idempotency-Key": "envelope-42"}
+
+    primeira = client.post("/api/contribuicoes", headers=headers, json=corpo)
+    assert primeira.status_code == status.HTTP_201_CREATED
+    assert "Idempotent-Replayed" not in primeira.headers
+
+    segunda = client.post("/api/contribuicoes", headers=headers, json=corpo)
+    assert segunda.status_code == status.HTTP_201_CREATED
+    assert segunda.headers["Idempotent-Replayed"] == "true"
+    assert segunda.json() == primeira.json()
+    assert db_session.query(Contribuicao).count() == 1
+
+    # Mesma chave com outro corpo
+    response = client.post("/api/contribuicoes", headers=headers, json={**corpo, "valor": "60.00"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    # Sem a chave, cada requisição cria uma contribuição
+    client.post("/api/contribuicoes", headers=auth_headers, json=corpo)
+    client.post("/api/contribuicoes", headers=auth_headers, json=corpo)
+    assert db_session.query(Contribuicao).count() == 3
+
+
+def test_idempotency_key_erro_e_multipart(client, auth_headers, db_session, sample_comunidade):
+    """Testa repetição de respostas de erro e de requisições multipart."""
+    from app.models.dizimista import Dizimista
+
+    comunidade_id = sample_comunidade.id
+    headers = {**auth_headers, "Idempotency-Key": "fechamento-futuro"}
+    corpo = {"comunidade_id": comunidade_id, "mes": "2999-01"}
+    primeira = client.post("/api/fechamentos", headers=headers, json=corpo)
+    assert primeira.status_code == status.HTTP_400_BAD_REQUEST
+    segunda = client.post("/api/fechamentos", headers=headers, json=corpo)
+    assert segunda.status_code == status.HTTP_400_BAD_REQUEST
+    assert segunda.headers["Idempotent-Replayed"] == "true"
+
+    csv = f"nome,comunidade_id\nMaria,{comunidade_id}\n".encode()
+    headers = {**auth_headers, "Idempotency-Key": "importacao-1"}
+    for _ in range(2):
+        response = client.post(
+            "/api/dizimistas/import", headers=headers, files={"arquivo": ("d.csv", csv, "text/csv")}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["importados"] == 1
+    assert response.headers["Idempotent-Replayed"] == "true"
+    assert db_session.query(Dizimista).count() == 1
+
+    response = client.post(
+        "/api/dizimistas/import", headers=headers, files={"arquivo": ("d.csv", csv + b"Ana,1\n", "text/csv")}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_purgar_chaves_expiradas(client, auth_headers, db_session, sample_comunidade):
+    """Testa que chaves expiradas são apagadas e deixam de ser repetidas."""
+    from app.models.idempotencia import ChaveIdempotencia
+    from app.services.idempotency_service import purgar_expiradas
+
+    headers = {**auth_headers, "Idempotency-Key": "paroquia-1"}
+    corpo = {"nome": "Paróquia Nova"}
+    primeira = client.post("/api/paroquias", headers=headers, json=corpo)
+    assert primeira.status_code == status.HTTP_201_CREATED
+
+    db_session.query(ChaveIdempotencia).update(
+        {ChaveIdempotencia.expira_em: datetime.now(timezone.utc) - timedelta(minutes=1)}
+    )
+    db_session.commit()
+    assert purgar_expiradas(db_session) == 1
+
+    segunda = client.post("/api/paroquias", headers=headers, json=corpo)
+    assert segunda.status_code == status.HTTP_201_CREATED
+    assert "Idempotent-Replayed" not in segunda.headers
+    assert segunda.json()["id"] != primeira.json()["id"]
+
+
+def test_reenvio_repete_cabecalhos(client, auth_headers):
+    """Testa que o reenvio repete os cabeçalhos originais, inclusive os repetidos."""
+    from fastapi import Depends, Response
+
+    from app.idempotency import idempotencia
+    from app.main import app
+
+    def criar_com_cabecalhos():
+        response = Response(content=b'{"id": 1}', status_code=201, media_type="application/json")
+        response.headers["Location"] = "/api/recursos/1"
+        response.set_cookie("a", "1")
+        response.set_cookie("b", "2")
+        return response
+
+    app.router.add_api_route(
+        "/api/_teste_idempotencia", criar_com_cabecalhos, methods=["POST"],
+        dependencies=[Depends(idempotencia)]
+    )
+    try:
+        headers = {**auth_headers, "Idempotency-Key": "cabecalhos-1"}
+        primeira = client.post("/api/_teste_idempotencia", headers=headers, json={})
+        segunda = client.post("/api/_teste_idempotencia", headers=headers, json={})
+    finally:
+        app.router.routes.pop()
+
+    assert segunda.status_code == status.HTTP_201_CREATED
+    assert segunda.headers["Idempotent-Replayed"] == "true"
+    assert segunda.headers["Location"] == "/api/recursos/1"
+    assert segunda.headers.get_list("set-cookie") == primeira.headers.get_list("set-cookie")
+    assert len(segunda.headers.get_list("set-cookie")) == 2
+    assert segunda.content == primeira.content
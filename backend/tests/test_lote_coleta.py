@@ -0,0 +1,129 @@
+"""
+Testes para lotes de coleta.
+"""
+from datetime import datetime, timezone
+
+from fastapi import status
+
+from app.models.lote_coleta import LoteColeta
+from app.services import lote_coleta_service
+
+
+def _abrir_lote(client, auth_headers, comunidade_id):
+    """Abre um lote de coleta pela API."""
+    response = client.post(
+        "/api/lotes-coleta",
+        headers=auth_headers,
+        json={"comunidade_id": comunidade_id, "data_coleta": "2026-10-18", "descricao": "Missa das 10h"}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+
+def test_incluir_itens_lote(client, auth_headers, sample_dizimista, sample_comunidade):
+    """Testa inclusão de itens com erros por item e reenvio sem duplicar."""
+    comunidade_id = sample_comunidade.id
+    dizimista_id = sample_dizimista.id
+    lote = _abrir_lote(client, auth_headers, comunidade_id)
+    assert float(lote["total"]) == 0
+    assert lote["quantidade"] == 0
+
+    itens = [
+        {"client_id": "env-1", "dizimista_id": dizimista_id, "tipo": "DIZIMO", "valor": "150.00"},
+        {"client_id": "env-2", "tipo": "OFERTA", "valor": "20.00", "forma_pagamento": "Dinheiro"},
+        {"client_id": "env-2", "tipo": "OFERTA", "valor": "20.00"},
+        {"client_id": "env-3", "tipo": "OFERTA", "valor": "-5"},
+        {"tipo": "OFERTA", "valor": "5.00"},
+        {"client_id": "env-4", "dizimista_id": 99999, "tipo": "DIZIMO", "valor": "10.00"},
+    ]
+    response = client.post(f"/api/lotes-coleta/{lote['id']}/itens", headers=auth_headers, json={"itens": itens})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["recebidos"] == 6
+    assert data["criados"] == 2
+    assert data["duplicados"] == 1
+    assert [(e["indice"], e["client_id"], e["campo"]) for e in data["erros"]] == [
+        (3, "env-3", "valor"), (4, None, "client_id"), (5, "env-4", "dizimista_id")
+    ]
+    assert float(data["lote"]["total"]) == 170.00
+    assert data["lote"]["quantidade"] == 2
+
+    # Reenvio da mesma leva: nada é gravado de novo
+    response = client.post(f"/api/lotes-coleta/{lote['id']}/itens", headers=auth_headers, json={"itens": itens})
+    data = response.json()
+    assert data["criados"] == 0
+    assert data["duplicados"] == 3
+    assert float(data["lote"]["total"]) == 170.00
+
+    contribuicoes = client.get(
+        "/api/contribuicoes", headers=auth_headers, params={"comunidade_id": comunidade_id}
+    ).json()["items"]
+    assert len(contribuicoes) == 2
+    assert {c["data_contribuicao"] for c in contribuicoes} == {"2026-10-18"}
+    assert {c["client_id"] for c in contribuicoes} == {"env-1", "env-2"}
+    assert {c["lote_id"] for c in contribuicoes} == {lote["id"]}
+
+    # Alterações e remoções pelo CRUD de contribuições ajustam os totais
+    por_client = {c["client_id"]: c["id"] for c in contribuicoes}
+    client.patch(f"/api/contribuicoes/{por_client['env-1']}", headers=auth_headers, json={"valor": "100.00"})
+    client.delete(f"/api/contribuicoes/{por_client['env-2']}", headers=auth_headers)
+    lote_atual = client.get(f"/api/lotes-coleta/{lote['id']}", headers=auth_headers).json()
+    assert float(lote_atual["total"]) == 100.00
+    assert lote_atual["quantidade"] == 1
+
+
+def test_encerrar_lote(client, auth_headers, sample_comunidade):
+    """Testa encerramento do lote e recusa de novas inclusões."""
+    comunidade_id = sample_comunidade.id
+    lote = _abrir_lote(client, auth_headers, comunidade_id)
+    client.post(
+        f"/api/lotes-coleta/{lote['id']}/itens",
+        headers=auth_headers,
+        json={"itens": [{"client_id": "a", "tipo": "OFERTA", "valor": "12.50"}]}
+    )
+
+    response = client.post(f"/api/lotes-coleta/{lote['id']}/encerrar", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["encerrado_em"] is not None
+    assert float(data["total"]) == 12.50
+    assert data["quantidade"] == 1
+
+    response = client.post(
+        f"/api/lotes-coleta/{lote['id']}/itens",
+        headers=auth_headers,
+        json={"itens": [{"client_id": "b", "tipo": "OFERTA", "valor": "1.00"}]}
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    abertos = client.get("/api/lotes-coleta", headers=auth_headers, params={"abertos": True}).json()
+    assert abertos == []
+
+    response = client.post("/api/lotes-coleta/99999/encerrar", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_incluir_itens_lote_encerrado_entre_blocos(client, auth_headers, db_session, sample_comunidade, monkeypatch):
+    """Testa que um lote encerrado durante a inclusão não recebe os blocos seguintes."""
+    lote = _abrir_lote(client, auth_headers, sample_comunidade.id)
+    monkeypatch.setattr(lote_coleta_service, "LOTE_COMMIT_COLETA", 1)
+
+    # Encerramento concorrente, efetivado junto com o primeiro bloco
+    ajustar_totais_lote = lote_coleta_service.ajustar_totais_lote
+
+    def ajustar_e_encerrar(db, lote_id, total, quantidade):
+        ajustar_totais_lote(db, lote_id, total, quantidade)
+        db.query(LoteColeta).filter(LoteColeta.id == lote_id).update(
+            {LoteColeta.encerrado_em: datetime.now(timezone.utc)}, synchronize_session=False
+        )
+
+    monkeypatch.setattr(lote_coleta_service, "ajustar_totais_lote", ajustar_e_encerrar)
+
+    itens = [{"client_id": f"env-{i}", "tipo": "OFERTA", "valor": "10.00"} for i in range(3)]
+    response = client.post(f"/api/lotes-coleta/{lote['id']}/itens", headers=auth_headers, json={"itens": itens})
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    db_lote = db_session.get(LoteColeta, lote["id"])
+    db_session.refresh(db_lote)
+    assert db_lote.encerrado_em is not None
+    assert db_lote.quantidade == 1
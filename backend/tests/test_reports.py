@@ -1,11 +1,28 @@
 """
 Testes para relatórios e estatísticas.
 """
-import pytest
-from fastapi import status
-from datetime import date, timedelta
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 
+from fastapi import status
+from fastapi.testclient import TestClient
+from openpyxl import load_workbook
+
+from app.auth.utils import create_access_token
+from app.config import settings
+from app.main import app
+from app.models.comunidade import Comunidade
+from app.models.contribuicao import Contribuicao, TipoContribuicaoEnum
+from app.models.dizimista import Dizimista
+from app.models.relatorio_job import EtapaJobEnum, RelatorioJob, StatusJobEnum
+from app.services import parquet_store, report_job_service, report_service
+from app.services.analytics_engine import analytics_engine
+from app.services.report_cache import ReportCache, aniversariantes_cache, report_cache
+
 
 def test_get_aniversariantes_hoje(client, auth_headers, db_session, sample_comunidade):
     """Testa relatório de aniversariantes do dia."""
@@ -162,3 +179,891 @@ def test_get_dizimista_historico_not_found(client, auth_headers):
     """Testa histórico de dizimista inexistente."""
     response = client.get("/api/reports/dizimista/999999/historico", headers=auth_headers)
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_serie_mensal(client, auth_headers, db_session, sample_dizimista, criar_contribuicao):
+    """Testa série mensal com preenchimento de meses sem contribuições."""
+    criar_contribuicao("100.00", date(2025, 11, 10), dizimista_id=sample_dizimista.id)
+    criar_contribuicao("50.00", date(2025, 11, 20), dizimista_id=sample_dizimista.id)
+    criar_contribuicao("30.00", date(2026, 1, 5), TipoContribuicaoEnum.OFERTA)
+    db_session.commit()
+
+    response = client.get(
+        "/api/reports/serie-mensal?start_date=2025-10-01&end_date=2026-01-31",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    series = {s["tipo"]: s for s in response.json()["series"]}
+    assert set(series) == {"DIZIMO", "OFERTA"}
+
+    dizimo = series["DIZIMO"]["pontos"]
+    assert [p["mes"] for p in dizimo] == ["2025-10", "2025-11", "2025-12", "2026-01"]
+    assert [float(p["total"]) for p in dizimo] == [0.0, 150.0, 0.0, 0.0]
+    assert [p["quantidade"] for p in dizimo] == [0, 2, 0, 0]
+    assert [float(p["total"]) for p in series["OFERTA"]["pontos"]] == [0.0, 0.0, 0.0, 30.0]
+
+
+def test_get_serie_mensal_por_comunidade(client, auth_headers, db_session, sample_comunidade, criar_contribuicao):
+    """Testa série mensal separada por comunidade."""
+    comunidade_id = sample_comunidade.id
+    criar_contribuicao("20.00", date(2026, 3, 1), TipoContribuicaoEnum.OFERTA)
+    db_session.commit()
+
+    response = client.get(
+        "/api/reports/serie-mensal?start_date=2026-03-01&end_date=2026-04-30&por_comunidade=true",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    series = response.json()["series"]
+    assert len(series) == 2
+    assert all(s["comunidade_id"] == comunidade_id for s in series)
+
+
+def test_get_serie_mensal_periodo_longo(client, auth_headers):
+    """Testa limite de meses da série mensal."""
+    response = client.get(
+        "/api/reports/serie-mensal?start_date=2015-01-01&end_date=2026-01-31",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_total_comunidade(client, auth_headers, db_session, sample_paroquia, outra_comunidade, criar_contribuicao):
+    """Testa totais por comunidade com subtotais e total geral."""
+    db_session.add(Comunidade(nome="Comunidade Vazia", paroquia_id=sample_paroquia.id))
+    criar_contribuicao("100.00")
+    criar_contribuicao("40.00", tipo=TipoContribuicaoEnum.OFERTA)
+    criar_contribuicao("60.00", comunidade_id=outra_comunidade.id)
+    db_session.commit()
+
+    hoje = date.today()
+    response = client.get(
+        f"/api/reports/total-comunidade?start_date={hoje}&end_date={hoje}",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert float(data["total"]) == 200.00
+    assert data["quantidade"] == 3
+
+    totais_tipo = {t["tipo"]: float(t["total"]) for t in data["totais"]}
+    assert totais_tipo == {"DIZIMO": 160.00, "OFERTA": 40.00}
+
+    comunidades = {c["comunidade_nome"]: c for c in data["comunidades"]}
+    assert float(comunidades["Comunidade Teste"]["total"]) == 140.00
+    assert float(comunidades["Outra Comunidade"]["total"]) == 60.00
+    assert comunidades["Comunidade Vazia"]["quantidade"] == 0
+    assert len(comunidades["Comunidade Vazia"]["totais"]) == 2
+
+
+def test_report_cache_invalidado_por_nova_contribuicao(client, auth_headers, sample_comunidade):
+    """Testa que relatórios repetidos vêm do cache e novas contribuições os invalidam."""
+    comunidade_id = sample_comunidade.id
+    hoje = date.today()
+    url = f"/api/reports/total-periodo?start_date={hoje}&end_date={hoje}&comunidade_id={comunidade_id}"
+
+    def criar_contribuicao(valor):
+        response = client.post(
+            "/api/contribuicoes",
+            headers=auth_headers,
+            json={
+                "comunidade_id": comunidade_id,
+                "tipo": "OFERTA",
+                "valor": valor,
+                "data_contribuicao": str(hoje)
+            }
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    criar_contribuicao("10.00")
+    assert float(client.get(url, headers=auth_headers).json()["total"]) == 10.00
+    assert float(client.get(url, headers=auth_headers).json()["total"]) == 10.00
+    assert report_cache.stats()["acertos"] == 1
+
+    criar_contribuicao("5.00")
+    assert float(client.get(url, headers=auth_headers).json()["total"]) == 15.00
+
+
+def test_report_cache_versao_por_comunidade():
+    """Testa que escritas invalidam apenas a comunidade afetada e os relatórios globais."""
+    cache = ReportCache(max_entries=10, ttl_seconds=60)
+    cache.set("comunidade-1", cache.version(1), "a")
+    cache.set("comunidade-2", cache.version(2), "b")
+    cache.set("global", cache.version(None), "c")
+
+    cache.bump_version(1)
+
+    assert cache.get("comunidade-1", cache.version(1)) == ("ausente", None)
+    assert cache.get("comunidade-2", cache.version(2)) == ("atual", "b")
+    assert cache.get("global", cache.version(None)) == ("ausente", None)
+
+
+def test_report_cache_agrupa_calculos_concorrentes():
+    """Testa que chamadas idênticas simultâneas compartilham um único cálculo."""
+    cache = ReportCache(max_entries=10, ttl_seconds=60)
+    liberar = threading.Event()
+    chamadas = []
+
+    def calcular():
+        chamadas.append(1)
+        liberar.wait(timeout=5)
+        return {"total": 42}
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(cache.get_or_compute, "total-tipo", None, calcular) for _ in range(5)]
+        limite = time.monotonic() + 5
+        while cache.stats()["agrupadas"] < 4 and time.monotonic() < limite:
+            time.sleep(0.01)
+        liberar.set()
+        resultados = [f.result(timeout=5) for f in futures]
+
+    assert len(chamadas) == 1
+    assert all(r == {"total": 42} for r in resultados)
+    stats = cache.stats()
+    assert stats["calculos"] == 1
+    assert stats["agrupadas"] == 4
+    assert stats["em_andamento"] == 0
+
+
+def test_get_cache_metricas(client, auth_headers):
+    """Testa endpoint de métricas do cache de relatórios."""
+    response = client.get("/api/reports/cache/metricas", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert "agrupadas" in response.json()
+
+
+def test_report_cache_stale_while_revalidate():
+    """Testa que resultados defasados são servidos e recalculados em segundo plano."""
+    cache = ReportCache(max_entries=10, ttl_seconds=60, soft_ttl_seconds=60)
+    cache.set("dashboard", cache.version(1), {"total": 10})
+    cache.bump_version(1)
+
+    recalculado = threading.Event()
+
+    def recalcular():
+        recalculado.set()
+        return {"total": 15}
+
+    def calcular():
+        raise AssertionError("não deve calcular de forma síncrona")
+
+    resultado = cache.get_or_compute("dashboard", 1, calcular, stale_ok=True, refresh=recalcular)
+    assert resultado == {"total": 10}
+    assert recalculado.wait(timeout=5)
+
+    limite = time.monotonic() + 5
+    while cache.stats()["em_andamento"] and time.monotonic() < limite:
+        time.sleep(0.01)
+
+    assert cache.get_or_compute("dashboard", 1, calcular, stale_ok=True) == {"total": 15}
+    stats = cache.stats()
+    assert stats["acertos_defasados"] == 1
+    assert stats["atualizacoes_segundo_plano"] == 1
+
+
+def test_report_cache_sem_stale_ok_recalcula():
+    """Testa que chamadas sem stale_ok nunca recebem resultado de versão anterior."""
+    cache = ReportCache(max_entries=10, ttl_seconds=60, soft_ttl_seconds=0)
+    cache.set("total", cache.version(1), {"total": 10})
+    assert cache.get_or_compute("total", 1, lambda: {"total": 99}) == {"total": 10}
+
+    cache.bump_version(1)
+    assert cache.get_or_compute("total", 1, lambda: {"total": 15}) == {"total": 15}
+
+
+def test_get_dashboard(client, auth_headers, db_session, sample_dizimista, criar_contribuicao):
+    """Testa endpoint combinado do dashboard."""
+    criar_contribuicao("80.00", dizimista_id=sample_dizimista.id)
+    db_session.commit()
+
+    response = client.get("/api/reports/dashboard", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["dizimistas_ativos"] == 1
+    assert data["total_contribuicoes"] == 1
+    assert float(data["total_mes"]["total"]) == 80.00
+    assert len(data["totais_tipo_mes"]["totais"]) == 2
+    assert isinstance(data["aniversariantes_hoje"], list)
+
+
+def test_get_aniversariantes_intervalo_virada_de_ano(client, auth_headers, db_session, sample_comunidade):
+    """Testa janela de aniversários que atravessa a virada do ano."""
+    db_session.add_all([
+        Dizimista(nome="Janeiro", comunidade_id=sample_comunidade.id, data_nascimento=date(1980, 1, 2)),
+        Dizimista(nome="Dezembro", comunidade_id=sample_comunidade.id, data_nascimento=date(1985, 12, 30)),
+        Dizimista(nome="Fora", comunidade_id=sample_comunidade.id, data_nascimento=date(1990, 1, 5)),
+        Dizimista(
+            nome="Inativo", comunidade_id=sample_comunidade.id,
+            data_nascimento=date(1990, 12, 31), ativo=False
+        ),
+    ])
+    db_session.commit()
+
+    response = client.get(
+        "/api/reports/aniversariantes?periodo=intervalo&data_inicio=2026-12-28&data_fim=2027-01-03",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [a["nome"] for a in response.json()] == ["Dezembro", "Janeiro"]
+
+
+def test_get_aniversariantes_29_fevereiro(client, auth_headers, db_session, sample_comunidade):
+    """Testa que nascidos em 29/02 aparecem em 28/02 de anos não bissextos."""
+    db_session.add(Dizimista(
+        nome="Bissexto", comunidade_id=sample_comunidade.id, data_nascimento=date(2000, 2, 29)
+    ))
+    db_session.commit()
+
+    response = client.get(
+        "/api/reports/aniversariantes?periodo=intervalo&data_inicio=2027-02-28&data_fim=2027-02-28",
+        headers=auth_headers
+    )
+    assert [a["nome"] for a in response.json()] == ["Bissexto"]
+
+    response = client.get(
+        "/api/reports/aniversariantes?periodo=intervalo&data_inicio=2028-02-28&data_fim=2028-02-28",
+        headers=auth_headers
+    )
+    assert response.json() == []
+
+
+def test_get_aniversariantes_intervalo_sem_datas(client, auth_headers):
+    """Testa validação do período 'intervalo' sem datas."""
+    response = client.get("/api/reports/aniversariantes?periodo=intervalo", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_aniversariantes_lista_diaria_invalidada(client, auth_headers, sample_comunidade):
+    """Testa que a lista diária de aniversariantes é invalidada ao alterar um dizimista."""
+    hoje = date.today()
+    response = client.post(
+        "/api/dizimistas",
+        headers=auth_headers,
+        json={
+            "nome": "Aniversariante Cache",
+            "comunidade_id": sample_comunidade.id,
+            "data_nascimento": str(date(1990, hoje.month, hoje.day))
+        }
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    dizimista_id = response.json()["id"]
+
+    url = "/api/reports/aniversariantes?periodo=hoje"
+    assert len(client.get(url, headers=auth_headers).json()) == 1
+    assert len(client.get(url, headers=auth_headers).json()) == 1
+    assert aniversariantes_cache.stats()["acertos"] == 1
+
+    response = client.patch(
+        f"/api/dizimistas/{dizimista_id}",
+        headers=auth_headers,
+        json={"ativo": False}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert client.get(url, headers=auth_headers).json() == []
+
+
+def test_get_dizimista_historico_paginado(client, auth_headers, db_session, sample_dizimista, criar_contribuicao):
+    """Testa paginação por cursor e subtotais anuais do histórico."""
+    dizimista_id = sample_dizimista.id
+    for data in [date(2024, 12, 10), date(2025, 1, 10), date(2025, 1, 10), date(2025, 2, 10), date(2025, 3, 10)]:
+        criar_contribuicao("10.00", data, dizimista_id=dizimista_id)
+    db_session.commit()
+
+    url = f"/api/reports/dizimista/{dizimista_id}/historico?limit=2&por_ano=true"
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert float(data["total_geral"]) == 50.00
+    assert data["quantidade_total"] == 5
+    assert data["subtotais_ano"] == [
+        {"ano": 2025, "total": "40.00", "quantidade": 4},
+        {"ano": 2024, "total": "10.00", "quantidade": 1},
+    ]
+
+    vistos = []
+    while True:
+        vistos += [c["id"] for c in data["contribuicoes"]]
+        if data["proximo_cursor"] is None:
+            break
+        data = client.get(f"{url}&cursor={data['proximo_cursor']}", headers=auth_headers).json()
+
+    assert len(vistos) == 5
+    assert len(set(vistos)) == 5
+
+
+def test_get_dizimista_historico_cursor_invalido(client, auth_headers, sample_dizimista):
+    """Testa cursor inválido no histórico."""
+    response = client.get(
+        f"/api/reports/dizimista/{sample_dizimista.id}/historico?cursor=invalido",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_ranking(client, auth_headers, db_session, sample_comunidade, outra_comunidade, criar_contribuicao):
+    """Testa ranking de dizimistas por comunidade."""
+    valores = {
+        ("Ana", sample_comunidade.id): ["100.00", "50.00"],
+        ("Bruno", sample_comunidade.id): ["200.00"],
+        ("Carla", sample_comunidade.id): ["10.00"],
+        ("Davi", outra_comunidade.id): ["30.00"],
+    }
+    for (nome, comunidade_id), lista in valores.items():
+        dizimista = Dizimista(nome=nome, comunidade_id=comunidade_id)
+        db_session.add(dizimista)
+        db_session.flush()
+        for valor in lista:
+            criar_contribuicao(valor, dizimista_id=dizimista.id, comunidade_id=comunidade_id)
+    # Contribuições anônimas não entram no ranking
+    criar_contribuicao("999.00", tipo=TipoContribuicaoEnum.OFERTA)
+    db_session.commit()
+
+    hoje = date.today()
+    response = client.get(
+        f"/api/reports/ranking?start_date={hoje}&end_date={hoje}&limite=2",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    comunidades = {c["comunidade_nome"]: c["dizimistas"] for c in response.json()["comunidades"]}
+    assert [(d["posicao"], d["dizimista_nome"]) for d in comunidades["Comunidade Teste"]] == [
+        (1, "Bruno"), (2, "Ana")
+    ]
+    assert comunidades["Comunidade Teste"][1]["quantidade"] == 2
+    assert [d["dizimista_nome"] for d in comunidades["Outra Comunidade"]] == ["Davi"]
+
+
+def test_report_cache_invalidado_por_renomeacao(client, auth_headers, db_session, sample_comunidade, criar_contribuicao):
+    """Testa que renomear comunidade ou dizimista invalida os relatórios em cache."""
+    comunidade_id = sample_comunidade.id
+    dizimista = Dizimista(nome="Ana", comunidade_id=comunidade_id)
+    db_session.add(dizimista)
+    db_session.flush()
+    dizimista_id = dizimista.id
+    criar_contribuicao("50.00", dizimista_id=dizimista_id)
+    db_session.commit()
+
+    hoje = date.today()
+    url = f"/api/reports/ranking?start_date={hoje}&end_date={hoje}"
+
+    def ranking():
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return [
+            (c["comunidade_nome"], [d["dizimista_nome"] for d in c["dizimistas"]])
+            for c in response.json()["comunidades"]
+        ]
+
+    assert ranking() == [("Comunidade Teste", ["Ana"])]
+
+    response = client.patch(f"/api/dizimistas/{dizimista_id}", headers=auth_headers, json={"nome": "Ana Maria"})
+    assert response.status_code == status.HTTP_200_OK
+    assert ranking() == [("Comunidade Teste", ["Ana Maria"])]
+
+    response = client.patch(f"/api/comunidades/{comunidade_id}", headers=auth_headers, json={"nome": "Matriz"})
+    assert response.status_code == status.HTTP_200_OK
+    assert ranking() == [("Matriz", ["Ana Maria"])]
+
+
+def test_get_dizimistas_sem_dizimo(client, auth_headers, db_session, sample_comunidade, criar_contribuicao):
+    """Testa lista de dizimistas ativos sem dízimo recente, com paginação."""
+    hoje = date.today()
+    em_dia = Dizimista(nome="Em Dia", comunidade_id=sample_comunidade.id)
+    atrasado = Dizimista(nome="Atrasado", comunidade_id=sample_comunidade.id)
+    so_oferta = Dizimista(nome="Só Oferta", comunidade_id=sample_comunidade.id)
+    inativo = Dizimista(nome="Inativo", comunidade_id=sample_comunidade.id, ativo=False)
+    db_session.add_all([em_dia, atrasado, so_oferta, inativo])
+    db_session.flush()
+
+    criar_contribuicao("10.00", hoje, dizimista_id=em_dia.id)
+    criar_contribuicao("10.00", hoje - timedelta(days=200), dizimista_id=atrasado.id)
+    criar_contribuicao("10.00", hoje, TipoContribuicaoEnum.OFERTA, dizimista_id=so_oferta.id)
+    db_session.commit()
+
+    response = client.get("/api/reports/dizimistas-sem-dizimo?meses=3&limit=1", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert len(data["dizimistas"]) == 1
+    assert data["proximo_cursor"] is not None
+
+    pagina2 = client.get(
+        f"/api/reports/dizimistas-sem-dizimo?meses=3&limit=1&cursor={data['proximo_cursor']}",
+        headers=auth_headers
+    ).json()
+    assert pagina2["proximo_cursor"] is None
+
+    encontrados = {d["nome"]: d for d in data["dizimistas"] + pagina2["dizimistas"]}
+    assert set(encontrados) == {"Atrasado", "Só Oferta"}
+    assert encontrados["Atrasado"]["ultimo_dizimo"] == str(hoje - timedelta(days=200))
+    assert encontrados["Só Oferta"]["ultimo_dizimo"] is None
+
+
+def test_get_adimplencia(client, auth_headers, db_session, sample_comunidade, criar_contribuicao):
+    """Testa grade de adimplência com bitmap por dizimista."""
+    hoje = date.today()
+    mes_atual = hoje.strftime("%Y-%m")
+    mes_anterior = (hoje.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+    pagante = Dizimista(nome="Pagante", comunidade_id=sample_comunidade.id)
+    ausente = Dizimista(nome="Ausente", comunidade_id=sample_comunidade.id)
+    db_session.add_all([pagante, ausente])
+    db_session.flush()
+    pagante_id = pagante.id
+
+    for referencia, tipo in [
+        (mes_atual, TipoContribuicaoEnum.DIZIMO),
+        (mes_atual, TipoContribuicaoEnum.DIZIMO),
+        (mes_anterior, TipoContribuicaoEnum.OFERTA),
+        ("2000-01", TipoContribuicaoEnum.DIZIMO),
+    ]:
+        criar_contribuicao("10.00", hoje, tipo, dizimista_id=pagante_id, referencia_mes=referencia)
+    db_session.commit()
+
+    response = client.get("/api/reports/adimplencia?meses=12&limit=1", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert len(data["meses"]) == 12
+    assert data["meses"][-1] == mes_atual
+    assert data["meses"][-2] == mes_anterior
+
+    linha = data["dizimistas"][0]
+    assert linha["id"] == pagante_id
+    assert linha["bitmap"] == 1 << 11
+    assert linha["meses_pagos"] == 1
+
+    pagina2 = client.get(
+        f"/api/reports/adimplencia?meses=12&cursor={data['proximo_cursor']}",
+        headers=auth_headers
+    ).json()
+    assert [d["nome"] for d in pagina2["dizimistas"]] == ["Ausente"]
+    assert pagina2["dizimistas"][0]["bitmap"] == 0
+    assert pagina2["proximo_cursor"] is None
+
+
+def test_get_comparativo(client, auth_headers, db_session, sample_dizimista, sample_comunidade, criar_contribuicao):
+    """Testa comparativo entre mês atual, mês anterior e mesmo mês do ano anterior."""
+    for valor, data in [
+        ("150.00", date(2026, 2, 10)),
+        ("50.00", date(2026, 2, 28)),
+        ("100.00", date(2026, 1, 31)),
+        ("80.00", date(2025, 2, 1)),
+        ("999.00", date(2025, 12, 31)),
+    ]:
+        criar_contribuicao(valor, data, dizimista_id=sample_dizimista.id)
+    db_session.commit()
+    comunidade_id = sample_comunidade.id
+
+    response = client.get(
+        "/api/reports/comparativo?periodo=mes&data_referencia=2026-02-10",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["atual_inicio"] == "2026-02-01"
+    assert data["atual_fim"] == "2026-02-28"
+    assert data["anterior_inicio"] == "2026-01-01"
+    assert data["anterior_fim"] == "2026-01-31"
+
+    dizimo = next(i for i in data["itens"] if i["tipo"] == "DIZIMO")
+    assert Decimal(dizimo["total_atual"]) == Decimal("200.00")
+    assert Decimal(dizimo["total_anterior"]) == Decimal("100.00")
+    assert dizimo["quantidade_atual"] == 2
+    assert Decimal(dizimo["diferenca"]) == Decimal("100.00")
+    assert Decimal(dizimo["variacao_percentual"]) == Decimal("100.00")
+
+    oferta = next(i for i in data["itens"] if i["tipo"] == "OFERTA")
+    assert oferta["variacao_percentual"] is None
+
+    # Mesmo mês do ano anterior, por comunidade
+    response = client.get(
+        "/api/reports/comparativo?periodo=mes&comparacao=ano_anterior"
+        "&data_referencia=2026-02-10&por_comunidade=true",
+        headers=auth_headers
+    )
+    data = response.json()
+    assert data["anterior_inicio"] == "2025-02-01"
+    assert [i["comunidade_id"] for i in data["itens"]] == [comunidade_id]
+    assert Decimal(data["consolidado"]["total_anterior"]) == Decimal("80.00")
+    assert Decimal(data["consolidado"]["variacao_percentual"]) == Decimal("150.00")
+
+    # Ano contra ano
+    data = client.get(
+        "/api/reports/comparativo?periodo=ano&data_referencia=2026-02-10",
+        headers=auth_headers
+    ).json()
+    assert Decimal(data["consolidado"]["total_atual"]) == Decimal("300.00")
+    assert Decimal(data["consolidado"]["total_anterior"]) == Decimal("1079.00")
+
+
+def test_get_comparativo_virada_do_mes(client, auth_headers, monkeypatch):
+    """Testa que o comparativo sem data de referência acompanha a virada do mês."""
+    class Data(date):
+        hoje = date(2026, 1, 31)
+
+        @classmethod
+        def today(cls):
+            return cls.hoje
+
+    monkeypatch.setattr(report_service, "date", Data)
+    url = "/api/reports/comparativo?periodo=mes"
+    assert client.get(url, headers=auth_headers).json()["atual_inicio"] == "2026-01-01"
+
+    Data.hoje = date(2026, 2, 1)
+    assert client.get(url, headers=auth_headers).json()["atual_inicio"] == "2026-02-01"
+
+
+def test_get_distribuicao(client, auth_headers, db_session, sample_dizimista, criar_contribuicao):
+    """Testa percentis e histograma dos valores por tipo."""
+    for valor in range(10, 110, 10):
+        criar_contribuicao(valor, date(2026, 1, 15), dizimista_id=sample_dizimista.id)
+    criar_contribuicao("25.00", date(2026, 1, 15), TipoContribuicaoEnum.OFERTA)
+    db_session.commit()
+
+    response = client.get(
+        "/api/reports/distribuicao?start_date=2026-01-01&end_date=2026-01-31&faixas=3",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    dizimo, oferta = data["distribuicoes"]
+
+    assert dizimo["tipo"] == "DIZIMO"
+    assert dizimo["quantidade"] == 10
+    assert Decimal(dizimo["minimo"]) == Decimal("10.00")
+    assert Decimal(dizimo["maximo"]) == Decimal("100.00")
+    assert Decimal(dizimo["media"]) == Decimal("55.00")
+    assert Decimal(dizimo["p25"]) == Decimal("32.50")
+    assert Decimal(dizimo["p50"]) == Decimal("55.00")
+    assert Decimal(dizimo["p90"]) == Decimal("91.00")
+    assert [f["quantidade"] for f in dizimo["histograma"]] == [3, 3, 4]
+    assert Decimal(dizimo["histograma"][-1]["fim"]) == Decimal("100.00")
+
+    # Grupo com um único valor fica todo na primeira faixa
+    assert [f["quantidade"] for f in oferta["histograma"]] == [1, 0, 0]
+    assert Decimal(oferta["p90"]) == Decimal("25.00")
+
+
+def test_get_distribuicao_por_comunidade_em_blocos(client, auth_headers, db_session, sample_comunidade, outra_comunidade, criar_contribuicao, monkeypatch):
+    """Testa a distribuição por comunidade com o cursor lido em vários blocos."""
+    monkeypatch.setattr(report_service, "LOTE_DISTRIBUICAO", 2)
+    for valor in ["10.00", "20.00", "30.05"]:
+        criar_contribuicao(valor, date(2026, 1, 15))
+    criar_contribuicao("7.00", date(2026, 1, 15), comunidade_id=outra_comunidade.id)
+    criar_contribuicao("3.50", date(2026, 1, 15), TipoContribuicaoEnum.OFERTA, comunidade_id=outra_comunidade.id)
+    db_session.commit()
+    comunidade_id, outra_id = sample_comunidade.id, outra_comunidade.id
+
+    response = client.get(
+        "/api/reports/distribuicao?start_date=2026-01-01&end_date=2026-01-31&faixas=2&por_comunidade=true",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    grupos = [
+        (g["comunidade_id"], g["tipo"], g["quantidade"], Decimal(g["media"]), Decimal(g["maximo"]))
+        for g in response.json()["distribuicoes"]
+    ]
+    assert grupos == [
+        (comunidade_id, "DIZIMO", 3, Decimal("20.02"), Decimal("30.05")),
+        (outra_id, "DIZIMO", 1, Decimal("7.00"), Decimal("7.00")),
+        (outra_id, "OFERTA", 1, Decimal("3.50"), Decimal("3.50")),
+    ]
+
+
+def test_report_job(client, auth_headers, db_session, sample_dizimista, operador_user, criar_contribuicao):
+    """Testa submissão, acompanhamento e resultado de um job de relatório."""
+    criar_contribuicao("120.00", date(2026, 1, 10), dizimista_id=sample_dizimista.id)
+    db_session.commit()
+    operador_token = create_access_token(data={"sub": operador_user.email, "user_id": operador_user.id})
+
+    response = client.post(
+        "/api/reports/jobs",
+        headers=auth_headers,
+        json={"tipo": "total-tipo", "parametros": {"start_date": "2026-01-01", "end_date": "2026-01-31"}}
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["etapa"] == "FILA"
+    job_id = response.json()["id"]
+
+    deadline = time.monotonic() + 5
+    while True:
+        job = client.get(f"/api/reports/jobs/{job_id}", headers=auth_headers).json()
+        if job["status"] in ("CONCLUIDO", "ERRO") or time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+    assert job["status"] == "CONCLUIDO"
+    assert job["etapa"] == "FINALIZADO"
+    assert job["expira_em"] is not None
+
+    response = client.get(f"/api/reports/jobs/{job_id}/resultado", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    resultado = response.json()["resultado"]
+    dizimo = next(t for t in resultado["totais"] if t["tipo"] == "DIZIMO")
+    assert Decimal(dizimo["total"]) == Decimal("120.00")
+
+    # Jobs de outros usuários não são visíveis para operadores
+    response = client.get(
+        f"/api/reports/jobs/{job_id}",
+        headers={"Authorization": f"Bearer {operador_token}"}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # Parâmetros inválidos para o relatório
+    response = client.post(
+        "/api/reports/jobs",
+        headers=auth_headers,
+        json={"tipo": "ranking", "parametros": {"start_date": "2026-02-01", "end_date": "2026-01-01"}}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_report_job_erro(client, auth_headers, monkeypatch):
+    """Testa que a falha de um job é informada sem expor a exceção."""
+    etapas = []
+
+    def falhar(db, **params):
+        etapas.append(db.query(RelatorioJob.etapa).scalar())
+        raise RuntimeError("relation contribuicoes does not exist")
+
+    params_schema, _, response_schema = report_job_service.RELATORIOS["total-tipo"]
+    monkeypatch.setitem(report_job_service.RELATORIOS, "total-tipo", (params_schema, falhar, response_schema))
+
+    response = client.post(
+        "/api/reports/jobs",
+        headers=auth_headers,
+        json={"tipo": "total-tipo", "parametros": {"start_date": "2026-01-01", "end_date": "2026-01-31"}}
+    )
+    job_id = response.json()["id"]
+
+    deadline = time.monotonic() + 5
+    while True:
+        job = client.get(f"/api/reports/jobs/{job_id}", headers=auth_headers).json()
+        if job["status"] in ("CONCLUIDO", "ERRO") or time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+    assert job["status"] == "ERRO"
+    assert job["erro"] == "Falha ao gerar o relatório"
+    assert job["etapa"] == "FINALIZADO"
+    assert etapas == [EtapaJobEnum.CONSULTA]
+
+    response = client.get(f"/api/reports/jobs/{job_id}/resultado", headers=auth_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert "contribuicoes" not in response.json()["detail"]
+
+
+def test_report_job_interrompido_marcado_como_erro(client, auth_headers, db_session, admin_user):
+    """Testa que só jobs sem batimento recente viram erro na inicialização."""
+    sem_batimento = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.REPORT_JOB_HEARTBEAT_SECONDS * report_job_service.BATIMENTOS_PERDIDOS + 1
+    )
+    jobs = [
+        ("pendente", StatusJobEnum.PENDENTE, sem_batimento),
+        ("executando", StatusJobEnum.EXECUTANDO, sem_batimento),
+        ("outro-worker", StatusJobEnum.EXECUTANDO, datetime.now(timezone.utc)),
+    ]
+    for job_id, situacao, atualizado_em in jobs:
+        db_session.add(RelatorioJob(
+            id=job_id, usuario_id=admin_user.id, tipo="total-tipo", parametros={},
+            status=situacao, executor="outro-host:1:abcd1234", atualizado_em=atualizado_em
+        ))
+    db_session.commit()
+
+    # Nova inicialização da API
+    with TestClient(app):
+        pass
+
+    for job_id in ["pendente", "executando"]:
+        job = client.get(f"/api/reports/jobs/{job_id}", headers=auth_headers).json()
+        assert job["status"] == "ERRO"
+        assert job["concluido_em"] is not None
+        assert job["expira_em"] is not None
+
+    # O job de outro processo ativo segue em andamento
+    job = client.get("/api/reports/jobs/outro-worker", headers=auth_headers).json()
+    assert job["status"] == "EXECUTANDO"
+
+    # Um job que deixou de estar pendente não é executado nem muda de situação
+    report_job_service._run_job(db_session.get_bind(), "pendente")
+    db_session.expire_all()
+    job = db_session.get(RelatorioJob, "pendente")
+    assert job.status == StatusJobEnum.ERRO
+    assert job.resultado is None
+
+
+def test_get_analise(client, auth_headers, db_session, sample_paroquia, sample_dizimista, sample_comunidade, criar_contribuicao):
+    """Testa a análise livre nos dois motores, com carga incremental e invalidação."""
+    paroquia_id = sample_paroquia.id
+    comunidade_id = sample_comunidade.id
+    dizimista_id = sample_dizimista.id
+
+    for valor, forma, data in [
+        ("100.00", "PIX", date(2026, 1, 10)),
+        ("50.50", "Dinheiro", date(2026, 1, 20)),
+        ("30.00", None, date(2026, 2, 5)),
+    ]:
+        criar_contribuicao(valor, data, dizimista_id=dizimista_id, forma_pagamento=forma)
+    criar_contribuicao("20.00", date(2026, 1, 15), TipoContribuicaoEnum.OFERTA)
+    db_session.commit()
+
+    def analise(motor, *campos, **filtros):
+        params = {
+            "paroquia_id": paroquia_id,
+            "start_date": "2026-01-01",
+            "end_date": "2026-03-31",
+            "agrupar_por": list(campos),
+            "motor": motor,
+            **filtros,
+        }
+        response = client.get("/api/reports/analise", params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    for campos in [(), ("tipo",), ("tipo", "mes"), ("comunidade", "forma_pagamento")]:
+        sql = analise("sql", *campos)
+        numpy = analise("numpy", *campos)
+        assert numpy["motor"] == "numpy"
+        assert [
+            {**g, "total": Decimal(g["total"])} for g in sql["grupos"]
+        ] == [
+            {**g, "total": Decimal(g["total"])} for g in numpy["grupos"]
+        ]
+
+    grupos = analise("numpy", "tipo", "mes")["grupos"]
+    assert [(g["tipo"], g["mes"], Decimal(g["total"]), g["quantidade"]) for g in grupos] == [
+        ("DIZIMO", "2026-01", Decimal("150.50"), 2),
+        ("DIZIMO", "2026-02", Decimal("30.00"), 1),
+        ("OFERTA", "2026-01", Decimal("20.00"), 1),
+    ]
+    filtrado = analise("numpy", forma_pagamento="PIX")["grupos"]
+    assert [Decimal(g["total"]) for g in filtrado] == [Decimal("100.00")]
+
+    # Contribuição nova é acrescentada às colunas já carregadas
+    response = client.post("/api/contribuicoes", headers=auth_headers, json={
+        "dizimista_id": dizimista_id,
+        "comunidade_id": comunidade_id,
+        "tipo": "DIZIMO",
+        "valor": "10.00",
+        "data_contribuicao": "2026-03-01",
+        "forma_pagamento": "PIX",
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    contribuicao_id = response.json()["id"]
+    filtrado = analise("numpy", "mes", forma_pagamento="PIX")["grupos"]
+    assert [(g["mes"], Decimal(g["total"])) for g in filtrado] == [
+        ("2026-01", Decimal("100.00")),
+        ("2026-03", Decimal("10.00")),
+    ]
+
+    # Alteração invalida as colunas
+    response = client.patch(
+        f"/api/contribuicoes/{contribuicao_id}", headers=auth_headers, json={"valor": "15.00"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    total = analise("numpy", tipo="DIZIMO")["grupos"][0]
+    assert Decimal(total["total"]) == Decimal("195.50")
+    assert total["quantidade"] == 4
+
+    # Commit tardio com id abaixo do último carregado: a criação avisa o motor
+    for id_contribuicao in (1000, 900):
+        criar_contribuicao("1.00", date(2026, 3, 2), TipoContribuicaoEnum.OFERTA, id=id_contribuicao)
+        db_session.commit()
+        analise("numpy")
+    assert analise("numpy", tipo="OFERTA")["grupos"][0]["quantidade"] == 2
+    analytics_engine.registrar_criacao(db_session, [comunidade_id], 900)
+    assert analise("numpy", tipo="OFERTA")["grupos"][0]["quantidade"] == 3
+
+    response = client.get(
+        "/api/reports/analise",
+        params={"paroquia_id": paroquia_id, "start_date": "2026-02-01", "end_date": "2026-01-01"},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_relatorios_fonte_parquet(client, auth_headers, db_session, sample_paroquia, sample_dizimista, sample_comunidade, criar_contribuicao, tmp_path, monkeypatch):
+    """Testa a extração Parquet incremental e os relatórios lidos dela."""
+    monkeypatch.setattr(settings, "PARQUET_DIR", str(tmp_path))
+    params = "start_date=2026-01-01&end_date=2026-03-31&fonte=parquet"
+    paroquia_id = sample_paroquia.id
+    comunidade_id = sample_comunidade.id
+    dizimista_id = sample_dizimista.id
+
+    # Sem extração, a fonte parquet não está disponível
+    response = client.get(f"/api/reports/total-tipo?{params}", headers=auth_headers)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    criar_contribuicao("100.00", date(2026, 1, 10), dizimista_id=dizimista_id)
+    criar_contribuicao("40.00", date(2026, 2, 5), dizimista_id=dizimista_id)
+    criar_contribuicao("25.50", date(2026, 2, 8), TipoContribuicaoEnum.OFERTA)
+    db_session.commit()
+
+    assert parquet_store.extrair(db_session) == {
+        "meses_regravados": 2, "meses_removidos": 0, "meses_inalterados": 0, "linhas": 3
+    }
+    # Sem alterações, nada é regravado
+    assert parquet_store.extrair(db_session)["meses_regravados"] == 0
+
+    for relatorio in ["total-periodo", "total-tipo", "total-comunidade", "serie-mensal"]:
+        banco = client.get(f"/api/reports/{relatorio}?start_date=2026-01-01&end_date=2026-03-31", headers=auth_headers)
+        parquet = client.get(f"/api/reports/{relatorio}?{params}", headers=auth_headers)
+        assert parquet.status_code == status.HTTP_200_OK
+        assert parquet.json() == banco.json()
+
+    data = client.get(f"/api/reports/total-comunidade?{params}&paroquia_id={paroquia_id}", headers=auth_headers).json()
+    assert Decimal(data["total"]) == Decimal("165.50")
+    assert data["comunidades"][0]["comunidade_id"] == comunidade_id
+
+    # Só o mês alterado é regravado; o relatório reflete a nova extração
+    contribuicao = db_session.query(Contribuicao).filter(Contribuicao.valor == Decimal("40.00")).first()
+    db_session.delete(contribuicao)
+    db_session.commit()
+    assert parquet_store.extrair(db_session)["meses_regravados"] == 1
+
+    data = parquet_store.agregados(date(2026, 1, 1), date(2026, 3, 31))
+    assert data == {
+        (comunidade_id, TipoContribuicaoEnum.DIZIMO, 202601): [Decimal("100.00"), 1],
+        (comunidade_id, TipoContribuicaoEnum.OFERTA, 202602): [Decimal("25.50"), 1],
+    }
+
+
+def test_export_xlsx(client, auth_headers, db_session, sample_dizimista, sample_comunidade, criar_contribuicao):
+    """Testa exportações XLSX de dizimistas, contribuições e aniversariantes."""
+    hoje = date.today()
+    db_session.add(Dizimista(
+        nome="Aniversariante Planilha",
+        comunidade_id=sample_comunidade.id,
+        data_nascimento=date(1985, hoje.month, hoje.day),
+        ativo=True
+    ))
+    criar_contribuicao("150.00", date(2026, 1, 10), dizimista_id=sample_dizimista.id, forma_pagamento="PIX")
+    db_session.commit()
+
+    def planilha(url):
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith(
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+        assert int(response.headers["content-length"]) == len(response.content)
+        linhas = list(load_workbook(io.BytesIO(response.content), read_only=True).active.values)
+        assert int(response.headers["x-export-linhas"]) == len(linhas) - 1
+        return linhas
+
+    dizimistas = planilha("/api/dizimistas/export.xlsx?ativo=true")
+    assert dizimistas[0][:2] == ("id", "nome")
+    assert sorted(linha[1] for linha in dizimistas[1:]) == ["Aniversariante Planilha", "João Teste"]
+
+    contribuicoes = planilha("/api/contribuicoes/export.xlsx?tipo=DIZIMO")
+    assert len(contribuicoes) == 2
+    assert contribuicoes[1][2:4] == ("DIZIMO", 150)
+    assert contribuicoes[1][1].date() == date(2026, 1, 10)
+
+    aniversariantes = planilha("/api/reports/aniversariantes/export.xlsx?periodo=hoje")
+    assert [linha[1] for linha in aniversariantes[1:]] == ["Aniversariante Planilha"]
+
+    response = client.get("/api/reports/aniversariantes/export.xlsx?periodo=intervalo", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get("/api/reports/exportacoes/metricas", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    metricas = response.json()
+    assert metricas["exportacoes"] >= 3
+    assert metricas["linhas"] >= 4
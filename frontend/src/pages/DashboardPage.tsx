@@ -4,47 +4,23 @@ import { useQuery } from '@tanstack/react-query'
 import { Card } from '../components/ui/Card'
 import { Button } from '../components/ui/Button'
 import { LoadingSpinner } from '../components/ui/LoadingSpinner'
-import { dizimistaService } from '../services/dizimista.service'
-import { contribuicaoService } from '../services/contribuicao.service'
 import { reportService } from '../services/report.service'
-import { formatCurrency, formatDateForInput } from '../utils/format'
+import { formatCurrency } from '../utils/format'
 
 export const DashboardPage: React.FC = () => {
   const navigate = useNavigate()
 
-  // Get current month start and end
-  const now = new Date()
-  const startOfMonth = new Date(now.getFullYear(), now.getMonth(), 1)
-  const endOfMonth = new Date(now.getFullYear(), now.getMonth() + 1, 0)
-
-  const { data: dizimistasData, isLoading: loadingDizimistas } = useQuery({
-    queryKey: ['dizimistas', { ativo: true }],
-    queryFn: () => dizimistaService.list({ ativo: true, page: 1, page_size: 1 }),
-  })
-
-  const { data: contribuicoesData, isLoading: loadingContribuicoes } = useQuery({
-    queryKey: ['contribuicoes-count'],
-    queryFn: () => contribuicaoService.list({ page: 1, page_size: 1 }),
-  })
-
-  const { data: totalMes, isLoading: loadingTotal } = useQuery({
-    queryKey: ['total-mes'],
-    queryFn: () =>
-      reportService.getTotalPeriodo({
-        start_date: formatDateForInput(startOfMonth),
-        end_date: formatDateForInput(endOfMonth),
-      }),
-  })
-
-  const { data: aniversariantes, isLoading: loadingAniversariantes } = useQuery({
-    queryKey: ['aniversariantes-hoje'],
-    queryFn: () => reportService.getAniversariantes({ periodo: 'hoje' }),
+  const { data: dashboard, isLoading } = useQuery({
+    queryKey: ['dashboard'],
+    queryFn: () => reportService.getDashboard(),
   })
 
-  if (loadingDizimistas || loadingContribuicoes || loadingTotal || loadingAniversariantes) {
+  if (isLoading) {
     return <LoadingSpinner text="Carregando dashboard..." />
   }
 
+  const aniversariantes = dashboard?.aniversariantes_hoje
+
   return (
     <div className="space-y-8">
       <div>
@@ -58,7 +34,7 @@ export const DashboardPage: React.FC = () => {
             <div>
               <p className="text-sm font-medium text-gray-600">Dizimistas Ativos</p>
               <p className="text-3xl font-bold text-primary-600 mt-2">
-                {dizimistasData?.total || 0}
+                {dashboard?.dizimistas_ativos || 0}
               </p>
             </div>
             <div className="bg-primary-100 rounded-full p-3">
@@ -84,7 +60,7 @@ export const DashboardPage: React.FC = () => {
             <div>
               <p className="text-sm font-medium text-gray-600">Total Contribuições</p>
               <p className="text-3xl font-bold text-primary-600 mt-2">
-                {contribuicoesData?.total || 0}
+                {dashboard?.total_contribuicoes || 0}
               </p>
             </div>
             <div className="bg-green-100 rounded-full p-3">
@@ -110,7 +86,7 @@ export const DashboardPage: React.FC = () => {
             <div>
               <p className="text-sm font-medium text-gray-600">Total do Mês</p>
               <p className="text-2xl font-bold text-primary-600 mt-2">
-                {totalMes ? formatCurrency(totalMes.total) : 'R$ 0,00'}
+                {dashboard ? formatCurrency(dashboard.total_mes.total) : 'R$ 0,00'}
               </p>
             </div>
             <div className="bg-blue-100 rounded-full p-3">
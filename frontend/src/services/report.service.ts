@@ -6,6 +6,7 @@ import {
   TotalTipoResponse,
   ReportFilters,
   Contribuicao,
+  DashboardResponse,
 } from '../types'
 
 export const reportService = {
@@ -18,6 +19,8 @@ export const reportService = {
     }
 
     if (filters?.comunidade_id) params.comunidade_id = filters.comunidade_id
+    if (filters?.data_inicio) params.data_inicio = filters.data_inicio
+    if (filters?.data_fim) params.data_fim = filters.data_fim
 
     const { data } = await api.get<Aniversariante[]>('/api/reports/aniversariantes', {
       params,
@@ -35,6 +38,7 @@ export const reportService = {
     }
 
     if (filters.comunidade_id) params.comunidade_id = filters.comunidade_id
+    if (filters.stale_ok) params.stale_ok = true
 
     const { data } = await api.get<TotalPeriodoResponse>('/api/reports/total-periodo', {
       params,
@@ -52,6 +56,7 @@ export const reportService = {
     }
 
     if (filters.comunidade_id) params.comunidade_id = filters.comunidade_id
+    if (filters.stale_ok) params.stale_ok = true
 
     const { data } = await api.get<TotalTipoResponse>('/api/reports/total-tipo', {
       params,
@@ -59,6 +64,18 @@ export const reportService = {
     return data
   },
 
+  /**
+   * Obtém todos os indicadores do dashboard em uma única requisição
+   */
+  getDashboard: async (comunidadeId?: number): Promise<DashboardResponse> => {
+    const params: Record<string, any> = {}
+
+    if (comunidadeId) params.comunidade_id = comunidadeId
+
+    const { data } = await api.get<DashboardResponse>('/api/reports/dashboard', { params })
+    return data
+  },
+
   /**
    * Obtém histórico de contribuições de um dizimista
    */
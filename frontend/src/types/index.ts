@@ -169,6 +169,14 @@ export interface TotalTipoResponse {
   comunidade_id?: number
 }
 
+export interface DashboardResponse {
+  dizimistas_ativos: number
+  total_contribuicoes: number
+  total_mes: TotalPeriodoResponse
+  totais_tipo_mes: TotalTipoResponse
+  aniversariantes_hoje: Aniversariante[]
+}
+
 // Pagination Types
 export interface PaginatedResponse<T> {
   items: T[]
@@ -196,15 +204,20 @@ export interface ContribuicaoFilters extends PaginationParams {
   tipo?: TipoContribuicao
   start_date?: string
   end_date?: string
+  referencia_inicio?: string
+  referencia_fim?: string
 }
 
 export interface AniversariantesFilters {
-  periodo?: 'hoje' | '7dias' | 'mes'
+  periodo?: 'hoje' | '7dias' | 'mes' | 'intervalo'
   comunidade_id?: number
+  data_inicio?: string
+  data_fim?: string
 }
 
 export interface ReportFilters {
   start_date: string
   end_date: string
   comunidade_id?: number
+  stale_ok?: boolean
 }